@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+from .ui_dispatcher import ui_dispatcher
+
+_loop = None
+_runs_on_glib = False
+_main_thread = threading.main_thread()
+
+
+def install_event_loop():
+    """Sets up the asyncio loop used for background fetches. Call once before `app.run()`.
+
+    With PyGObject 3.50+ asyncio runs on the GLib main loop itself, so coroutines
+    execute on the GTK thread between frames. Older PyGObject versions get a single
+    dedicated loop thread instead.
+    """
+    global _loop, _runs_on_glib
+    if _loop is not None:
+        return
+    try:
+        from gi.events import GLibEventLoopPolicy
+    except ImportError:
+        GLibEventLoopPolicy = None
+
+    if GLibEventLoopPolicy is not None:
+        policy = GLibEventLoopPolicy()
+        asyncio.set_event_loop_policy(policy)
+        _loop = policy.get_event_loop()
+        _runs_on_glib = True
+    else:
+        _loop = asyncio.new_event_loop()
+        threading.Thread(target=_loop.run_forever, name="archdex-asyncio", daemon=True).start()
+    print(f"asyncio loop running {'on the GLib main loop' if _runs_on_glib else 'in a dedicated thread'}")
+
+
+def _deliver(callback, future):
+    try:
+        result = future.result()
+    except asyncio.CancelledError:
+        return
+    except Exception as e:
+        print(f"Error in background task: {e}")
+        return
+    if callback:
+        callback(result)
+
+
+def run_async(coro, callback=None):
+    """Schedules `coro` and calls `callback(result)` on the GTK main thread when it finishes.
+
+    Returns a future that can be cancelled. When the loop runs on GLib the callback
+    is invoked inline; otherwise it is posted to the UI dispatcher.
+    """
+    if _loop is None:
+        install_event_loop()
+
+    if _runs_on_glib and threading.current_thread() is _main_thread:
+        future = _loop.create_task(coro)
+        future.add_done_callback(lambda done: _deliver(callback, done))
+        return future
+
+    # Called off the GTK thread, or the loop has its own thread: hop back with the next UI batch
+    future = asyncio.run_coroutine_threadsafe(coro, _loop)
+    future.add_done_callback(lambda done: ui_dispatcher.post(_deliver, callback, done))
+    return future
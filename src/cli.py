@@ -0,0 +1,121 @@
+"""Headless entry point (`archdex-cli`) for syncing and maintaining the database.
+
+Needs neither GTK nor notify2, so it can run from cron or a systemd timer:
+
+    archdex-cli sync --stages catalog,species,deep,images --workers 8 --json
+    archdex-cli maintain --vacuum
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+from .data.database import SYNC_STAGES, init_db, sync_database, engine
+from .image_cache import image_cache, thumbnail_cache
+
+
+class ProgressReporter:
+    """Prints progress as text, or with `as_json` as one JSON object per line on stdout."""
+
+    def __init__(self, as_json, stream=None):
+        self.as_json = as_json
+        self.stream = stream or sys.stdout
+        self.stage = None
+
+    def emit(self, event, **fields):
+        if self.as_json:
+            self.stream.write(json.dumps({"event": event, "stage": self.stage, "time": round(time.time(), 3), **fields}) + "\n")
+            self.stream.flush()
+        elif event == "progress":
+            self.stream.write(f"[{self.stage}] {fields['current']}/{fields['total']}\n")
+        else:
+            details = " ".join(f"{key}={value}" for key, value in fields.items())
+            self.stream.write(f"[{self.stage or 'archdex'}] {event} {details}".rstrip() + "\n")
+
+    def progress(self, current, total):
+        self.emit("progress", current=current, total=total)
+
+
+def _parse_stages(value):
+    stages = [stage.strip() for stage in value.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in SYNC_STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(SYNC_STAGES)})")
+    # Always run in pipeline order, whatever order they were given in
+    return [stage for stage in SYNC_STAGES if stage in stages]
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def run_sync(args, reporter):
+    init_db()
+    ok = True
+    for stage in args.stages:
+        reporter.stage = stage
+        reporter.emit("stage-started")
+        started = time.perf_counter()
+        ok = sync_database(progress_callback=reporter.progress, stages=[stage], workers=args.workers)
+        reporter.emit("stage-finished", ok=ok, seconds=round(time.perf_counter() - started, 1))
+        if not ok:
+            break
+    reporter.stage = None
+    return ok
+
+
+def run_maintain(args, reporter):
+    init_db()
+    reporter.stage = "maintain"
+    for cache in (image_cache, thumbnail_cache):
+        removed = cache.repair()
+        reporter.emit("cache-repaired", path=str(cache.root), removed=removed)
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA optimize")
+        if args.vacuum:
+            connection.exec_driver_sql("VACUUM")
+    reporter.emit("database-optimized", vacuum=args.vacuum)
+    reporter.stage = None
+    return True
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="archdex-cli", description="Sync and maintain the ArchDex database without a desktop session.")
+    parser.add_argument("--json", action="store_true", help="print progress as JSON lines on stdout (logs go to stderr)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync", help="fetch data from PokeAPI")
+    sync.add_argument("--stages", type=_parse_stages, default=["catalog", "species", "deep"],
+                      help=f"comma-separated stages to run, from {','.join(SYNC_STAGES)} (default: catalog,species,deep)")
+    sync.add_argument("--workers", type=_positive_int, default=None,
+                      help="parallel fetches in the species, deep and images stages")
+    sync.set_defaults(run=run_sync)
+
+    maintain = commands.add_parser("maintain", help="repair the image caches and optimize the database")
+    maintain.add_argument("--vacuum", action="store_true", help="also rebuild the database file to reclaim space")
+    maintain.set_defaults(run=run_maintain)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    reporter = ProgressReporter(args.json)
+    started = time.perf_counter()
+    # In JSON mode stdout carries only the progress lines; the sync's own logging goes to stderr
+    log_target = sys.stderr if args.json else sys.stdout
+    with contextlib.redirect_stdout(log_target):
+        try:
+            ok = args.run(args, reporter)
+        except Exception as e:
+            reporter.emit("error", message=str(e))
+            ok = False
+    reporter.emit("finished", ok=ok, seconds=round(time.perf_counter() - started, 1))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,8 +18,22 @@ def get_data_dir() -> Path:
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir
 
+def get_cache_dir() -> Path:
+    """Returns the platform-specific directory for cached (re-downloadable) data."""
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        base_dir = Path(xdg_cache_home)
+    else:
+        base_dir = Path.home() / ".cache"
+    
+    cache_dir = base_dir / APP_NAME
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
 DATA_DIR = get_data_dir()
 DATABASE_PATH = DATA_DIR / "pokedex.db"
+STARTUP_METRICS_PATH = DATA_DIR / "startup_metrics.jsonl"  # One line per launch
+CACHE_DIR = get_cache_dir()
 
 # Window Settings
 WINDOW_DEFAULT_WIDTH = 1200
@@ -28,12 +42,65 @@ WINDOW_TITLE = "Pokedex"
 APP_ID = "com.archdex.pokedex"
 
 # Search Settings
-SEARCH_TIMEOUT_MS = 300
+SEARCH_TIMEOUT_MS = 300  # Debounce for database searches, used only until the name index is built
+SEARCH_CACHE_MAX_ENTRIES = 64  # Result pages of recent database searches kept in memory
+
+# Image Loading Settings
+IMAGE_LOADER_WORKERS = 4
+PIXBUF_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Memory budget for decoded images
+THUMBNAIL_SIZES = (48, 64, 80, 234)  # Square sizes kept pre-scaled on disk (list, evolutions, artwork)
+IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Original downloads; images prefetched for offline use don't count
+THUMBNAIL_CACHE_MAX_BYTES = 128 * 1024 * 1024  # Pre-scaled copies
+IMAGE_PREFETCH_WORKERS = 8
+
+# HTTP Settings
+# Keep-alive connections kept per host, sized to the threads that use each host
+HTTP_POOL_SIZES = {
+    "pokeapi.co": 8,  # Sync plus the detail view's background loads
+    "raw.githubusercontent.com": IMAGE_LOADER_WORKERS + IMAGE_PREFETCH_WORKERS,
+}
+HTTP_DEFAULT_POOL_SIZE = 4
+# Concurrent requests issued by the asyncio API client
+ASYNC_API_CONCURRENCY = 8
+
+# Background Task Settings
+# Threads per priority class; each pool also takes work from the classes above it
+SCHEDULER_INTERACTIVE_WORKERS = 4
+SCHEDULER_PREFETCH_WORKERS = 2
+SCHEDULER_SYNC_WORKERS = 1
+
+# UI Update Batching
+UI_DISPATCH_MAX_PER_FRAME = 64  # Widget updates applied per frame at most
+UI_DISPATCH_FRAME_BUDGET_MS = 8  # Leave the rest of a 16 ms frame for layout and drawing
+
+# Main Loop Watchdog Settings (opt-in, e.g. ARCHDEX_WATCHDOG=1 archdex)
+WATCHDOG_ENV_VAR = "ARCHDEX_WATCHDOG"
+WATCHDOG_FRAME_BUDGET_MS = 16  # Callbacks running longer than one 60 Hz frame are reported
+WATCHDOG_HISTOGRAM_BUCKETS_MS = (16, 33, 50, 100, 250, 500, 1000)
+WATCHDOG_STACK_DEPTH = 12  # Innermost frames printed per stall
+
+# Sync Settings
+SYNC_PREFETCH_IMAGES = True  # "Check for Updates" also downloads every sprite and artwork
+# Startup sync policy; the manual "Check for Updates" always syncs
+SYNC_FRESH_HOURS = 24  # No network at all at startup within this long of the last successful sync
+SYNC_MAX_AGE_DAYS = 30  # Older than this the catalog is re-synced even if the species count matches
+SYNC_CHECK_TIMEOUT_S = 3  # Species count check; short so offline launches give up quickly
+
+# Query Cache Settings
+QUERY_CACHE_MAX_ENTRIES = 256  # Small query results kept until the next write to the catalog
+
+# Detail View Settings
+DETAIL_CACHE_MAX_ENTRIES = 32  # Fully loaded Pokemon kept in memory
+DETAIL_PREFETCH_NEIGHBOURS = 2  # List rows above and below the selection loaded ahead
 
-# Pagination Settings
-ITEMS_PER_PAGE = 50
+# List Loading Settings
+ITEMS_PER_PAGE = 50  # Rows loaded from the database per window
+POKEMON_LIST_MAX_WINDOWS = 3  # Windows kept in the list model; older ones are dropped while scrolling
+POKEMON_LIST_LOAD_THRESHOLD_PX = 400  # Distance from either end of the list that loads the next window
+POKEMON_LIST_FILTER_MAX_VALUE = 10000  # Top of the sidebar's range filter; at this value the range is open-ended
 
 # UI Settings
 POKEMON_LIST_ICON_WIDTH = 48
 POKEMON_LIST_ICON_HEIGHT = 48
+POKEMON_LIST_ROW_HEIGHT = 58  # Icon plus row padding, used to estimate the rows in view
 SIDEBAR_WIDTH_REQUEST = 250
@@ -1,22 +1,33 @@
 import requests
 import json
-from functools import lru_cache
+
+from .http import transport
+from ..cache import LRUCache
+from ..config import SYNC_CHECK_TIMEOUT_S
 
 POKEAPI_BASE_URL = "https://pokeapi.co/api/v2"
+SPRITE_URL_TEMPLATE = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{}.png"
 
-# Use a session for connection pooling
-session = requests.Session()
+# Parsed JSON responses by URL, shared with the asyncio client in async_api.py
+response_cache = LRUCache(max_entries=1024)
 
-@lru_cache(maxsize=1024)
 def _fetch_data(url):
+    data = response_cache.get(url)
+    if data is not None:
+        return data
     try:
-        response = session.get(url, timeout=5)
+        response = transport.get(url, timeout=5)
         response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-        return response.json()
+        data = response.json()
+        response_cache.put(url, data)
+        return data
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data from {url}: {e}")
         return None
 
+def get_type_url(name_or_id):
+    return f"{POKEAPI_BASE_URL}/type/{name_or_id}/"
+
 def get_regions():
     url = f"{POKEAPI_BASE_URL}/region?limit=100"  # A reasonably high limit to get all regions
     data = _fetch_data(url)
@@ -32,12 +43,26 @@ def get_all_pokemon_species_names():
     data = _fetch_data(url)
     return data["results"] if data else []
 
+def get_species_count(timeout=SYNC_CHECK_TIMEOUT_S):
+    """Number of species upstream, always fetched fresh. None if PokeAPI can't be reached."""
+    url = f"{POKEAPI_BASE_URL}/pokemon-species?limit=1"
+    try:
+        response = transport.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()["count"]
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+        print(f"Error checking species count at {url}: {e}")
+        return None
+
 def get_species_varieties(species_url):
     species_data = _fetch_data(species_url)
     if species_data and "varieties" in species_data:
         return species_data["varieties"]
     return []
 
+def get_sprite_url(pokemon_id):
+    return SPRITE_URL_TEMPLATE.format(pokemon_id)
+
 def get_pokemon_list_by_region(region_url):
     # This function is no longer actively used in sync_database but kept for completeness
     region_data = _fetch_data(region_url)
@@ -86,6 +111,7 @@ def get_pokemon_details(name_or_id=None, pokemon_url=None):
         pokemon_data["is_mythical"] = species_data.get("is_mythical", False)
         pokemon_data["species_url"] = species_url
         pokemon_data["evolution_chain_url"] = species_data.get("evolution_chain", {}).get("url")
+        pokemon_data["varieties"] = species_data.get("varieties", [])
         # Extract region from species data
         if "generation" in species_data and species_data["generation"]:
             gen_data = _fetch_data(species_data["generation"]["url"])
@@ -101,6 +127,7 @@ def get_pokemon_details(name_or_id=None, pokemon_url=None):
         pokemon_data["is_mythical"] = False
         pokemon_data["species_url"] = species_url
         pokemon_data["region_name"] = None
+        pokemon_data["varieties"] = []
 
     # Fetch moves details - only storing move names for now, full details can be fetched on demand
     moves_data = []
@@ -144,22 +171,17 @@ def get_pokemon_details(name_or_id=None, pokemon_url=None):
 
     return pokemon_data
 
-@lru_cache(maxsize=64)
 def get_type_details(name_or_id):
-    url = f"{POKEAPI_BASE_URL}/type/{name_or_id}/"
-    return _fetch_data(url)
+    return _fetch_data(get_type_url(name_or_id))
 
-@lru_cache(maxsize=128)
 def get_ability_details(name_or_id):
     url = f"{POKEAPI_BASE_URL}/ability/{name_or_id}/"
     return _fetch_data(url)
 
-@lru_cache(maxsize=256)
 def get_move_details(name_or_id):
     url = f"{POKEAPI_BASE_URL}/move/{name_or_id}/"
     return _fetch_data(url)
 
-@lru_cache(maxsize=128)
 def get_species_details(name_or_id):
     url = f"{POKEAPI_BASE_URL}/pokemon-species/{name_or_id}/"
     return _fetch_data(url)
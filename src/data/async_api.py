@@ -0,0 +1,101 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:  # Optional: without it requests run on the pooled transport in a small executor
+    aiohttp = None
+
+from .api import response_cache, get_type_url
+from .http import transport
+from ..config import ASYNC_API_CONCURRENCY
+
+
+class AsyncPokeAPIClient:
+    """asyncio client for the PokeAPI endpoints used by background UI work.
+
+    With aiohttp installed every request runs on the event loop itself; otherwise
+    requests go through the shared HTTP transport on a fixed executor of
+    ASYNC_API_CONCURRENCY threads. Parsed responses share `api.response_cache` with
+    the synchronous functions in api.py, and concurrent requests for the same URL
+    are coalesced into one.
+    """
+
+    def __init__(self, max_concurrency=ASYNC_API_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+        self._executor = None
+        self._inflight = {}
+
+    def _ensure_resources(self):
+        # Created lazily so they bind to the loop the client is first used on
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if aiohttp is not None and self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=5))
+        if aiohttp is None and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="archdex-api")
+
+    async def fetch_json(self, url):
+        data = response_cache.get(url)
+        if data is not None:
+            return data
+        pending = self._inflight.get(url)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_uncached(url))
+            self._inflight[url] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(pending)
+
+    async def _fetch_uncached(self, url):
+        self._ensure_resources()
+        async with self._semaphore:
+            try:
+                if self._session is not None:
+                    async with self._session.get(url) as response:
+                        response.raise_for_status()
+                        data = await response.json()
+                else:
+                    loop = asyncio.get_event_loop()
+                    data = await loop.run_in_executor(self._executor, self._fetch_blocking, url)
+            except (requests.exceptions.RequestException, asyncio.TimeoutError) as e:
+                print(f"Error fetching data from {url}: {e}")
+                return None
+            except Exception as e:
+                if aiohttp is not None and isinstance(e, aiohttp.ClientError):
+                    print(f"Error fetching data from {url}: {e}")
+                    return None
+                raise
+        response_cache.put(url, data)
+        return data
+
+    @staticmethod
+    def _fetch_blocking(url):
+        response = transport.get(url, timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_type_details(self, name_or_id):
+        return await self.fetch_json(get_type_url(name_or_id))
+
+    async def get_types_details(self, names):
+        """Fetches several types concurrently, in the order given."""
+        return await asyncio.gather(*(self.get_type_details(name) for name in names))
+
+    async def get_evolution_chain(self, evolution_chain_url):
+        return await self.fetch_json(evolution_chain_url)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+client = AsyncPokeAPIClient()
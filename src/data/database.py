@@ -1,14 +1,17 @@
-from sqlalchemy import create_engine, Column, Integer, DateTime, String
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, Column, Integer, DateTime, String, func, distinct, select, true
+from sqlalchemy.orm import sessionmaker, joinedload, undefer
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 import time
 
-from .models import Base, Pokemon, Type, PokemonType, Ability, PokemonAbility, Region, Move, PokemonMove
-from .api import get_regions, get_all_pokemon_species_names, get_pokemon_details, get_type_details, get_ability_details, get_move_details, get_species_details, get_species_varieties
-from ..config import DATABASE_PATH
+from .models import Base, Pokemon, Type, PokemonType, Ability, PokemonAbility, Region, Move, PokemonMove, PokemonVariety, PokemonSnapshot, STAT_COLUMNS, SORTABLE_COLUMNS
+from .api import get_regions, get_all_pokemon_species_names, get_pokemon_details, get_type_details, get_ability_details, get_move_details, get_species_details, get_species_varieties, get_sprite_url, get_species_count
+from .query_cache import bump_data_epoch
+from .snapshots import PokemonDetail, store_pokemon_snapshot, get_pokemon_snapshot, SNAPSHOT_FORMAT_VERSION
+from ..config import DATABASE_PATH, SYNC_FRESH_HOURS, SYNC_MAX_AGE_DAYS, IMAGE_PREFETCH_WORKERS
 
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
@@ -39,12 +42,62 @@ class SyncInfo(Base):
     def __repr__(self):
         return f"<SyncInfo(last_sync=\'{self.last_sync}\', status=\'{self.status}\')>"
 
+# Columns added to existing tables after their first release: (table, column, SQL type, backfill)
+COLUMN_MIGRATIONS = [
+    ("pokemon", "base_stat_total", "INTEGER",
+     "UPDATE pokemon SET base_stat_total = hp + attack + defense + special_attack + special_defense + speed"),
+]
+
 def init_db():
-    """Initializes the database by creating all tables and performs initial sync if needed."""
+    """Creates any missing tables. Syncing is left to the caller, so startup needs no network."""
     os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
     Base.metadata.create_all(bind=engine)
+    migrate_schema()
     print(f"Database initialized at {DATABASE_PATH}")
-    sync_database()
+
+def migrate_schema(bind=None):
+    """Adds columns and indexes missing from a database created by an older version."""
+    bind = bind or engine
+    with bind.begin() as connection:
+        for table, column, sql_type, backfill in COLUMN_MIGRATIONS:
+            existing = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}")
+                connection.exec_driver_sql(backfill)
+                print(f"Added column {table}.{column}")
+    # create_all only creates indexes together with their table
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+def needs_startup_sync(session, now=None, fetch_species_count=get_species_count):
+    """Decides whether launching the app should sync the species catalog.
+
+    Within SYNC_FRESH_HOURS of the last successful sync nothing is fetched. After that
+    a one-item species request is the only network call: the catalog is synced when
+    the upstream count differs from ours, it is empty, or it is older than
+    SYNC_MAX_AGE_DAYS. If PokeAPI can't be reached the sync is skipped.
+    """
+    now = now or datetime.now()
+    sync_info = session.query(SyncInfo).first()
+    has_catalog = session.query(Pokemon.id).first() is not None
+    last_sync = sync_info.last_sync if sync_info else None
+    if has_catalog and last_sync and now - last_sync < timedelta(hours=SYNC_FRESH_HOURS):
+        print(f"Last sync {last_sync} is fresh, skipping startup sync.")
+        return False
+
+    upstream_count = fetch_species_count()
+    if upstream_count is None:
+        print("PokeAPI unreachable, skipping startup sync.")
+        return False
+    if not has_catalog or not last_sync or now - last_sync > timedelta(days=SYNC_MAX_AGE_DAYS):
+        return True
+    local_count = session.query(func.count(distinct(Pokemon.species_url))).scalar()
+    if local_count != upstream_count:
+        print(f"Species count changed ({local_count} local, {upstream_count} upstream), syncing.")
+        return True
+    print(f"Species count unchanged ({local_count}), skipping startup sync.")
+    return False
 
 def get_db():
     """Dependency for getting a database session."""
@@ -126,10 +179,14 @@ def is_pokemon_data_complete(pokemon):
         
     return True
 
-def update_pokemon_data(session, pokemon_id, pokemon_url=None, name=None):
-    """Fetches and updates data for a specific Pokemon by ID."""
+def update_pokemon_data(session, pokemon_id, pokemon_url=None, name=None, pokemon_details=None):
+    """Fetches and updates data for a specific Pokemon by ID.
+
+    Pass `pokemon_details` if they were already fetched with get_pokemon_details.
+    Callers bump the data epoch once they are done writing.
+    """
     
-    pokemon = session.query(Pokemon).filter_by(id=pokemon_id).first()
+    pokemon = session.query(Pokemon).options(undefer(Pokemon.description)).filter_by(id=pokemon_id).first()
     
     # If we already have the basic info and we are just "synching", we can skip the deep fetch
     # unless we explicitly want to force update.
@@ -142,7 +199,8 @@ def update_pokemon_data(session, pokemon_id, pokemon_url=None, name=None):
     
     # If pokemon_url is not provided, we might need to derive it or use name if we had it
     # But get_pokemon_details can take name_or_id
-    pokemon_details = get_pokemon_details(name_or_id=pokemon_id, pokemon_url=pokemon_url)
+    if pokemon_details is None:
+        pokemon_details = get_pokemon_details(name_or_id=pokemon_id, pokemon_url=pokemon_url)
     if not pokemon_details:
         print(f"Failed to fetch details for Pokemon ID {pokemon_id}")
         return None
@@ -182,6 +240,8 @@ def update_pokemon_data(session, pokemon_id, pokemon_url=None, name=None):
     pokemon.special_attack = pokemon_details.get("sp_attack")
     pokemon.special_defense = pokemon_details.get("sp_defense")
     pokemon.speed = pokemon_details.get("speed")
+    stats = [getattr(pokemon, column) for column in STAT_COLUMNS]
+    pokemon.base_stat_total = sum(stats) if None not in stats else None
     pokemon.region = pokemon_region
 
     # Update types
@@ -254,13 +314,315 @@ def update_pokemon_data(session, pokemon_id, pokemon_url=None, name=None):
                 level_learned_at=move_entry.get("level_learned_at", 0),
                 version_group=move_entry.get("version_group", "unknown")
             ))
+
+    # Update varieties (forms) of the species, creating stubs for forms we haven't seen yet
+    if pokemon.species_url and pokemon_details.get("varieties"):
+        store_species_varieties(session, pokemon.species_url, pokemon_details["varieties"], commit=False)
     
     session.commit()
     session.refresh(pokemon)
+    # Precompute what the detail view renders so opening this Pokemon needs no joins
+    if is_pokemon_data_complete(pokemon):
+        store_pokemon_snapshot(session, pokemon)
     return pokemon
 
-def sync_database(background=False, progress_callback=None):
-    print("Starting database synchronization...")
+def query_pokemon_detail(session, pokemon_id, on_fetch=None):
+    """Returns the PokemonDetail the detail view renders, completing the Pokemon from the API if needed.
+
+    When a snapshot exists this is a single primary-key read. Otherwise the Pokemon is
+    loaded with its relations and the snapshot is written. `on_fetch` is called before
+    a network fetch. If the fetch fails, the incomplete detail is returned unstored
+    (`complete` is False), so the next open tries the network again.
+    """
+    detail = get_pokemon_snapshot(session, pokemon_id)
+    if detail is not None:
+        return detail
+
+    query = session.query(Pokemon).options(
+        undefer(Pokemon.description),
+        joinedload(Pokemon.region),
+        joinedload(Pokemon.types).joinedload(PokemonType.type),
+        joinedload(Pokemon.abilities).joinedload(PokemonAbility.ability),
+        joinedload(Pokemon.moves).joinedload(PokemonMove.move).joinedload(Move.type)
+    )
+    pokemon = query.filter_by(id=pokemon_id).first()
+
+    if not pokemon or not is_pokemon_data_complete(pokemon):
+        if on_fetch:
+            on_fetch()
+        # Writes the snapshot along with the fetched data
+        if update_pokemon_data(session, pokemon_id):
+            bump_data_epoch()
+        detail = get_pokemon_snapshot(session, pokemon_id)
+        if detail is not None:
+            return detail
+        pokemon = query.filter_by(id=pokemon_id).first()
+
+    if not pokemon:
+        return None
+    if is_pokemon_data_complete(pokemon):
+        return store_pokemon_snapshot(session, pokemon)
+    detail = PokemonDetail.from_pokemon(pokemon)
+    detail.complete = False
+    return detail
+
+def _species_id_from_url(species_url):
+    return int(species_url.split("/")[-2])
+
+def store_species_varieties(session, species_url, varieties, commit=True):
+    """Stores the varieties of a species and creates stub Pokemon entries for unseen forms."""
+    species_id = _species_id_from_url(species_url)
+    # Make pending objects (e.g. a freshly created Pokemon) visible to the queries below
+    session.flush()
+
+    variety_ids = [int(v["pokemon"]["url"].split("/")[-2]) for v in varieties]
+    existing_ids = {row[0] for row in session.query(Pokemon.id).filter(Pokemon.id.in_(variety_ids)).all()}
+
+    session.query(PokemonVariety).filter_by(species_id=species_id).delete()
+    for variety, variety_id in zip(varieties, variety_ids):
+        variety_name = variety["pokemon"]["name"]
+        if variety_id not in existing_ids:
+            session.add(Pokemon(
+                id=variety_id,
+                name=variety_name,
+                species_url=species_url,
+                sprite_url=get_sprite_url(variety_id)
+            ))
+            existing_ids.add(variety_id)
+        session.add(PokemonVariety(
+            species_id=species_id,
+            pokemon_id=variety_id,
+            name=variety_name,
+            is_default=variety.get("is_default", False)
+        ))
+
+    if commit:
+        session.commit()
+
+def get_stored_varieties(session, species_url):
+    """Returns the varieties of a species from the local DB as (pokemon_id, name) tuples.
+
+    Species synced before varieties were stored are fetched once and persisted.
+    """
+    species_id = _species_id_from_url(species_url)
+    query = session.query(PokemonVariety.pokemon_id, PokemonVariety.name).filter_by(species_id=species_id).order_by(PokemonVariety.pokemon_id)
+    rows = query.all()
+    if not rows:
+        varieties = get_species_varieties(species_url)
+        if varieties:
+            store_species_varieties(session, species_url, varieties)
+            bump_data_epoch()
+            rows = query.all()
+    return [(row.pokemon_id, row.name) for row in rows]
+
+# What a list row shows; read with Core so pages are plain tuples, not ORM objects
+LIST_COLUMNS = (Pokemon.__table__.c.id, Pokemon.__table__.c.name, Pokemon.__table__.c.sprite_url, Pokemon.__table__.c.species_url)
+
+def query_list_rows(bind=None):
+    """Returns (id, name, sprite_url, species_url) rows of every Pokemon, ordered by ID."""
+    with (bind or engine).connect() as connection:
+        return connection.execute(select(*LIST_COLUMNS).order_by(Pokemon.__table__.c.id)).all()
+
+def query_pokemon_page(search_term, offset, limit, sort="id", filters=(), bind=None):
+    """One window of the Pokemon list as list rows, the total match count and the next window's sprite URLs.
+
+    `sort` is "id" or one of SORTABLE_COLUMNS (highest first, served by its covering index).
+    `filters` holds (column, minimum, maximum) ranges over SORTABLE_COLUMNS, inclusive;
+    a None bound is open. Pokemon whose value isn't known yet never match a range.
+    """
+    table = Pokemon.__table__
+    condition = table.c.name.ilike(f"%{search_term}%") if search_term else true()
+    for column, minimum, maximum in filters:
+        if column not in SORTABLE_COLUMNS:
+            raise ValueError(f"Unknown filter column: {column}")
+        condition = condition & table.c[column].isnot(None)
+        if minimum is not None:
+            condition = condition & (table.c[column] >= minimum)
+        if maximum is not None:
+            condition = condition & (table.c[column] <= maximum)
+    if sort == "id":
+        order = (table.c.id,)
+    elif sort in SORTABLE_COLUMNS:
+        order = (table.c[sort].desc(), table.c.id)
+    else:
+        raise ValueError(f"Unknown sort key: {sort}")
+    with (bind or engine).connect() as connection:
+        total_count = connection.execute(select(func.count()).select_from(table).where(condition)).scalar()
+        rows = connection.execute(
+            select(*LIST_COLUMNS).where(condition).order_by(*order).offset(offset).limit(limit)
+        ).all()
+        next_page_urls = connection.execute(
+            select(table.c.sprite_url).where(condition).order_by(*order).offset(offset + limit).limit(limit)
+        ).scalars().all()
+    return rows, total_count, next_page_urls
+
+def get_sprite_urls(session):
+    """Returns (pokemon_id, sprite_url) for every Pokemon with a sprite, ordered by ID."""
+    return session.query(Pokemon.id, Pokemon.sprite_url).filter(Pokemon.sprite_url.isnot(None)).order_by(Pokemon.id).all()
+
+def get_image_urls(session):
+    """Returns every distinct sprite and official artwork URL stored in the DB."""
+    urls = []
+    for sprite_url, artwork_url in session.query(Pokemon.sprite_url, Pokemon.artwork_url).order_by(Pokemon.id):
+        urls.extend(url for url in (sprite_url, artwork_url) if url)
+    return list(dict.fromkeys(urls))
+
+SYNC_STAGES = ("catalog", "species", "deep", "images")
+
+def _sync_catalog(session, progress_callback=None):
+    """Stores all regions and a stub for every species. Returns False if PokeAPI couldn't be reached."""
+    # Step 1: Fetch and store all regions
+    regions_data = get_regions()
+    regions_to_add = []
+    for region_entry in regions_data:
+        region_name = region_entry["name"]
+        existing_region = session.query(Region).filter_by(name=region_name).first()
+        if not existing_region:
+            regions_to_add.append(Region(name=region_name))
+            print(f"Added region: {region_name}")
+    if regions_to_add:
+        add_all_to_db(session, regions_to_add)
+        bump_data_epoch()
+
+    # Step 2: Fetch all Pokemon species names (this is just one request for ~1000 names)
+    all_pokemon_species = get_all_pokemon_species_names()
+    if not all_pokemon_species:
+        # Offline or PokeAPI is down: keep last_sync so the next launch tries again
+        print("Could not fetch the species list, synchronization skipped.")
+        return False
+    
+    # Check if we already have these species in our DB as basic entries
+    # For a truly fast startup, we only want to ensure the list is populated.
+    # Deep data (stats, moves, varieties like Mega/G-Max) should be fetched on demand.
+    print(f"Syncing {len(all_pokemon_species)} species...")
+
+    # Pre-fetch existing IDs to avoid repeated queries
+    existing_ids = {row[0] for row in session.query(Pokemon.id).all()}
+    
+    new_pokemon_stubs = []
+    total_species = len(all_pokemon_species)
+    for i, species_entry in enumerate(all_pokemon_species):
+        if progress_callback and i % 100 == 0:
+            progress_callback(i, total_species)
+        species_url = species_entry["url"]
+        try:
+            species_id = int(species_url.split("/")[-2])
+            if species_id not in existing_ids:
+                new_pokemon_stubs.append(Pokemon(
+                    id=species_id,
+                    name=species_entry["name"],
+                    species_url=species_url,
+                    sprite_url=get_sprite_url(species_id)
+                ))
+        except (ValueError, IndexError):
+            continue
+
+    if new_pokemon_stubs:
+        # Batch add for performance
+        for i in range(0, len(new_pokemon_stubs), 500):
+            batch = new_pokemon_stubs[i:i+500]
+            session.add_all(batch)
+            session.commit()
+        bump_data_epoch()
+    return True
+
+def _fetch_then_write(fetch, write, items, workers, progress_callback=None):
+    """Calls `fetch(item)` on `workers` threads and `write(session, item, fetched)` on this one.
+
+    Only the requests run in parallel. The writes get-or-create rows shared between
+    Pokemon (types, abilities, moves), which concurrent sessions would race on, so they
+    run one at a time, in order, each in its own session. Items whose fetch returned
+    nothing are skipped. The data epoch is bumped once at the end if anything was
+    written, not per item. Returns the number of items that failed.
+    """
+    total = len(items)
+    failed = 0
+    written = 0
+
+    def fetch_item(item):
+        try:
+            return fetch(item)
+        except Exception as e:
+            print(f"Error fetching {item}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for done, (item, fetched) in enumerate(zip(items, executor.map(fetch_item, items)), 1):
+            if fetched:
+                session = get_session()
+                try:
+                    write(session, item, fetched)
+                    written += 1
+                except Exception as e:
+                    session.rollback()
+                    print(f"Error syncing {item}: {e}")
+                    failed += 1
+                finally:
+                    session.close()
+            else:
+                print(f"Failed to fetch {item}")
+                failed += 1
+            if progress_callback and (done % 10 == 0 or done == total):
+                progress_callback(done, total)
+    if written:
+        bump_data_epoch()
+    return failed
+
+def _sync_species(progress_callback=None, workers=1):
+    """Stores the varieties (Mega, regional and other forms) of every species not seen yet.
+
+    Returns the number of species that failed.
+    """
+    session = get_session()
+    try:
+        known = {row[0] for row in session.query(distinct(PokemonVariety.species_id))}
+        species_urls = [url for (url,) in session.query(distinct(Pokemon.species_url)).filter(Pokemon.species_url.isnot(None))
+                        if _species_id_from_url(url) not in known]
+    finally:
+        session.close()
+    print(f"Fetching varieties of {len(species_urls)} species...")
+    return _fetch_then_write(get_species_varieties,
+                             lambda session, species_url, varieties: store_species_varieties(session, species_url, varieties),
+                             species_urls, workers, progress_callback)
+
+def _sync_deep(session, progress_callback=None, workers=1):
+    """Fetches full data for every incomplete Pokemon and backfills missing snapshots.
+
+    Returns the number of Pokemon that failed.
+    """
+    print("Performing deep synchronization for all Pokémon...")
+    all_pokemon = session.query(Pokemon).options(undefer(Pokemon.description)).all()
+    snapshot_ids = {row[0] for row in session.query(PokemonSnapshot.pokemon_id).filter_by(format_version=SNAPSHOT_FORMAT_VERSION)}
+    
+    incomplete = []
+    for i, pokemon in enumerate(all_pokemon):
+        if not is_pokemon_data_complete(pokemon):
+            incomplete.append((pokemon.id, pokemon.name))
+        elif pokemon.id not in snapshot_ids:
+            # Complete from an earlier sync, before snapshots existed (or in an older format)
+            store_pokemon_snapshot(session, pokemon, commit=False)
+            if i % 100 == 0:
+                session.commit()
+    session.commit()
+
+    # update_pokemon_data handles its own session.commit() and writes the snapshot
+    print(f"Fetching full data for {len(incomplete)} Pokémon...")
+    return _fetch_then_write(lambda item: get_pokemon_details(name_or_id=item[0]),
+                             lambda write_session, item, details: update_pokemon_data(write_session, item[0], name=item[1], pokemon_details=details),
+                             incomplete, workers, progress_callback)
+
+def sync_database(background=False, progress_callback=None, prefetch_images=False, stages=None, workers=None):
+    """Runs the sync stages and records the result. Returns True if nothing failed.
+
+    By default the catalog is synced, plus the species and deep stages for `background`
+    syncs (so every form has its stub up front) and the image stage with `prefetch_images`. `stages` picks any of SYNC_STAGES instead,
+    and `workers` threads fetch in parallel in the species, deep and image stages
+    (by default the first two fetch one at a time, images use IMAGE_PREFETCH_WORKERS).
+    `last_sync` is only moved forward when the catalog stage ran.
+    """
+    if stages is None:
+        stages = ["catalog"] + (["species", "deep"] if background else []) + (["images"] if prefetch_images else [])
+    print(f"Starting database synchronization ({', '.join(stages)})...")
     session = get_session()
     try:
         sync_info = session.query(SyncInfo).first()
@@ -273,84 +635,38 @@ def sync_database(background=False, progress_callback=None):
         else:
             print(f"Last sync: {sync_info.last_sync}. Checking for updates...")
 
-        # Optimization: Check if we have any pokemon at all
-        pokemon_count = session.query(Pokemon).count()
-        if pokemon_count == 0:
-            print("Database is empty, performing full synchronization.")
-        
-        print("Performing database synchronization.")
-
-        # Step 1: Fetch and store all regions
-        regions_data = get_regions()
-        regions_to_add = []
-        for region_entry in regions_data:
-            region_name = region_entry["name"]
-            existing_region = session.query(Region).filter_by(name=region_name).first()
-            if not existing_region:
-                regions_to_add.append(Region(name=region_name))
-                print(f"Added region: {region_name}")
-        if regions_to_add:
-            add_all_to_db(session, regions_to_add)
-
-        # Step 2: Fetch all Pokemon species names (this is just one request for ~1000 names)
-        all_pokemon_species = get_all_pokemon_species_names()
-        
-        # Check if we already have these species in our DB as basic entries
-        # For a truly fast startup, we only want to ensure the list is populated.
-        # Deep data (stats, moves, varieties like Mega/G-Max) should be fetched on demand.
-        
-        print(f"Syncing {len(all_pokemon_species)} species...")
+        if "catalog" in stages and not _sync_catalog(session, progress_callback):
+            sync_info.status = "failed: species list unavailable"
+            session.commit()
+            return False
 
-        # Pre-fetch existing IDs to avoid repeated queries
-        existing_ids = {row[0] for row in session.query(Pokemon.id).all()}
-        
-        new_pokemon_stubs = []
-        total_species = len(all_pokemon_species)
-        for i, species_entry in enumerate(all_pokemon_species):
-            if background and progress_callback:
-                if i % 100 == 0:
-                    progress_callback(i, total_species)
-            species_url = species_entry["url"]
-            try:
-                species_id = int(species_url.split("/")[-2])
-                if species_id not in existing_ids:
-                    new_pokemon_stubs.append(Pokemon(
-                        id=species_id,
-                        name=species_entry["name"],
-                        species_url=species_url,
-                        sprite_url=f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{species_id}.png"
-                    ))
-            except (ValueError, IndexError):
-                continue
-
-        if new_pokemon_stubs:
-            # Batch add for performance
-            for i in range(0, len(new_pokemon_stubs), 500):
-                batch = new_pokemon_stubs[i:i+500]
-                session.add_all(batch)
-                session.commit()
+        failed = 0
+        # Varieties of every species; otherwise they are fetched when a species is first opened
+        if "species" in stages:
+            failed += _sync_species(progress_callback, workers or 1)
+
+        # Deep sync - Fetch full data for all pokemon that are incomplete
+        if "deep" in stages:
+            failed += _sync_deep(session, progress_callback, workers or 1)
 
-        # Step 3: Deep sync - Fetch full data for all pokemon that are incomplete
-        if background:
-            print("Performing deep synchronization for all Pokémon...")
-            # Re-fetch all pokemon to check completeness
-            # We do this in batches to avoid keeping too many objects in memory
-            all_pokemon = session.query(Pokemon).all()
-            total_to_deep_sync = len(all_pokemon)
-            
-            for i, pokemon in enumerate(all_pokemon):
-                if not is_pokemon_data_complete(pokemon):
-                    # update_pokemon_data handles its own session.commit()
-                    update_pokemon_data(session, pokemon.id, name=pokemon.name)
-                
-                if progress_callback and i % 10 == 0:
-                    progress_callback(i, total_to_deep_sync)
-
-        sync_info.last_sync = datetime.now()
-        sync_info.status = "success"
+        # Download every sprite and artwork so the app works fully offline
+        if "images" in stages:
+            print("Prefetching sprites and artwork...")
+            from .prefetch import prefetch_images as run_image_prefetch
+            _, images_failed = run_image_prefetch(get_image_urls(session), workers=workers or IMAGE_PREFETCH_WORKERS, progress_callback=progress_callback)
+            failed += images_failed
+
+        # The startup check only looks at the catalog, so only a catalog run makes it fresh
+        if "catalog" in stages:
+            sync_info.last_sync = datetime.now()
+        sync_info.status = f"failed: {failed} item(s) could not be synced" if failed else "success"
         session.add(sync_info)
         session.commit()
+        if failed:
+            print(f"Database synchronization finished, but {failed} item(s) could not be synced.")
+            return False
         print("Database synchronization completed successfully.")
+        return True
 
     except SQLAlchemyError as e:
         session.rollback()
@@ -358,6 +674,7 @@ def sync_database(background=False, progress_callback=None):
         session.add(sync_info)
         session.commit()
         print(f"Database synchronization failed: {e}")
+        return False
     finally:
         session.close()
 
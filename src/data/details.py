@@ -0,0 +1,46 @@
+from ..config import DETAIL_CACHE_MAX_ENTRIES
+from ..scheduler import scheduler, PRIORITY_PREFETCH
+from .database import get_session, query_pokemon_detail, _species_id_from_url
+from .query_cache import EpochCache, data_epoch
+
+# PokemonDetail snapshots by Pokemon id, dropped once the catalog is written to
+detail_cache = EpochCache(max_entries=DETAIL_CACHE_MAX_ENTRIES)
+
+
+def load_pokemon_detail(pokemon_id, on_fetch=None):
+    """Returns the PokemonDetail for `pokemon_id` from the detail cache, or loads and caches it."""
+    pokemon = detail_cache.get(pokemon_id)
+    if pokemon is not None:
+        return pokemon
+    # Read first, so a detail loaded while a sync writes is cached under the older epoch
+    epoch = data_epoch()
+    session = get_session()
+    try:
+        pokemon = query_pokemon_detail(session, pokemon_id, on_fetch)
+    except Exception as e:
+        print(f"Error loading details of Pokemon {pokemon_id}: {e}")
+        return None
+    finally:
+        session.close()
+    if pokemon is not None and pokemon.complete:
+        detail_cache.put(pokemon_id, pokemon, epoch)
+    return pokemon
+
+
+def prefetch_details(pokemon_ids, token=None):
+    """Loads Pokemon that are likely to be opened next into the cache at prefetch priority."""
+    for pokemon_id in dict.fromkeys(pokemon_ids):
+        if pokemon_id is None or pokemon_id in detail_cache:
+            continue
+        scheduler.submit(load_pokemon_detail, pokemon_id, priority=PRIORITY_PREFETCH, token=token)
+
+
+def evolution_species_ids(evolution_chain):
+    """Returns the species ids of every member of an evolution chain response."""
+    ids = []
+    stages = [evolution_chain["chain"]] if evolution_chain else []
+    while stages:
+        stage = stages.pop(0)
+        ids.append(_species_id_from_url(stage["species"]["url"]))
+        stages.extend(stage.get("evolves_to", []))
+    return ids
@@ -0,0 +1,64 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import HTTP_POOL_SIZES, HTTP_DEFAULT_POOL_SIZE
+
+
+class _RoutingSession(requests.Session):
+    """Session that picks its adapter by host name (prefix mounts can't match any port)."""
+
+    def __init__(self, adapter_for):
+        super().__init__()
+        self._adapter_for = adapter_for
+
+    def get_adapter(self, url):
+        return self._adapter_for(url)
+
+
+class HTTPTransport:
+    """Thread-safe HTTP transport with keep-alive connection pools sized per host.
+
+    `requests.Session` objects are not safe to share between threads, so every
+    thread gets its own lightweight session. They all route to the same adapters, and
+    urllib3's connection pools behind them are thread-safe, so keep-alive connections
+    (and the TLS sessions already negotiated on them) are reused across threads.
+    """
+
+    def __init__(self, pool_sizes=None, default_pool_size=HTTP_DEFAULT_POOL_SIZE, verify=True):
+        self.verify = verify
+        self._local = threading.local()
+        self._default_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=default_pool_size)
+        self._host_adapters = {
+            host: HTTPAdapter(pool_connections=2, pool_maxsize=size)
+            for host, size in (pool_sizes or {}).items()
+        }
+
+    def _adapter_for(self, url):
+        return self._host_adapters.get(urlsplit(url).hostname, self._default_adapter)
+
+    def _session(self):
+        http_session = getattr(self._local, "session", None)
+        if http_session is None:
+            http_session = _RoutingSession(self._adapter_for)
+            self._local.session = http_session
+        return http_session
+
+    def get(self, url, timeout=10, **kwargs):
+        # Passed per request: requests lets REQUESTS_CA_BUNDLE override a session-level bundle
+        kwargs.setdefault("verify", self.verify)
+        return self._session().get(url, timeout=timeout, **kwargs)
+
+    def pool_size_for(self, url):
+        return self._adapter_for(url)._pool_maxsize
+
+    def close(self):
+        self._default_adapter.close()
+        for adapter in self._host_adapters.values():
+            adapter.close()
+
+
+# Shared by the JSON API, the image loaders and the image prefetch stage
+transport = HTTPTransport(HTTP_POOL_SIZES)
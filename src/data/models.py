@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, LargeBinary, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.schema import Table
 
 Base = declarative_base()
 
+STAT_COLUMNS = ("hp", "attack", "defense", "special_attack", "special_defense", "speed")
+
 class Region(Base):
     __tablename__ = "regions"
 
@@ -22,7 +24,7 @@ class Pokemon(Base):
     id = Column(Integer, primary_key=True, index=True)
     evolution_chain_url = Column(String)
     name = Column(String, index=True)
-    description = Column(String)
+    description = deferred(Column(String))  # Only the detail snapshot needs it
     form_name = Column(String, default="") # To distinguish between different forms
     height = Column(Float)
     weight = Column(Float)
@@ -39,6 +41,7 @@ class Pokemon(Base):
     special_attack = Column(Integer)
     special_defense = Column(Integer)
     speed = Column(Integer)
+    base_stat_total = Column(Integer)  # Sum of the six stats, maintained by the sync
 
     region_id = Column(Integer, ForeignKey("regions.id"))
     region = relationship("Region", back_populates="pokemon")
@@ -50,6 +53,13 @@ class Pokemon(Base):
     def __repr__(self):
         return f"<Pokemon(name='{self.name}', id={self.id})>"
 
+# Columns the Pokemon list can be sorted by, highest first. Each index also holds the
+# columns a list row shows, so a sorted page (name-filtered or not) is read from it alone
+SORTABLE_COLUMNS = ("base_stat_total",) + STAT_COLUMNS + ("height", "weight")
+for _column_name in SORTABLE_COLUMNS:
+    Index(f"ix_pokemon_{_column_name}_desc", Pokemon.__table__.c[_column_name].desc(), Pokemon.__table__.c.id,
+          Pokemon.__table__.c.name, Pokemon.__table__.c.sprite_url, Pokemon.__table__.c.species_url)
+
 class Type(Base):
     __tablename__ = "types"
 
@@ -105,7 +115,7 @@ class Move(Base):
     accuracy = Column(Integer)
     damage_class = Column(String)
     effect_chance = Column(Integer)
-    description = Column(String)
+    description = deferred(Column(String))  # Never shown in move tables
 
     type_id = Column(Integer, ForeignKey("types.id"))
     type = relationship("Type", back_populates="moves")
@@ -126,3 +136,27 @@ class PokemonMove(Base):
 
     pokemon = relationship("Pokemon", back_populates="moves")
     move = relationship("Move", back_populates="pokemon")
+
+class PokemonVariety(Base):
+    __tablename__ = "pokemon_varieties"
+
+    species_id = Column(Integer, primary_key=True, index=True)
+    pokemon_id = Column(Integer, ForeignKey("pokemon.id"), primary_key=True)
+    name = Column(String)
+    is_default = Column(Boolean, default=False)
+
+    pokemon = relationship("Pokemon")
+
+    def __repr__(self):
+        return f"<PokemonVariety(name='{self.name}', species_id={self.species_id})>"
+
+class PokemonSnapshot(Base):
+    __tablename__ = "pokemon_snapshots"
+
+    # Everything the detail view shows for one Pokemon, serialized by data/snapshots.py
+    pokemon_id = Column(Integer, ForeignKey("pokemon.id"), primary_key=True)
+    format_version = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<PokemonSnapshot(pokemon_id={self.pokemon_id})>"
@@ -0,0 +1,76 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from .database import query_list_rows
+
+# The fields a list row needs; same attribute names as Pokemon
+NameIndexEntry = namedtuple("NameIndexEntry", ["id", "name", "sprite_url", "species_url"])
+
+
+class NameIndex:
+    """In-memory name index answering prefix and substring searches without the database.
+
+    All names are joined into one newline-separated string, so a substring search is a
+    few `str.find` calls mapped back to entries with bisect. Prefix searches bisect a
+    name-sorted copy. Results are in id order, like the list queried from SQLite.
+    """
+
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda entry: entry.id)
+        names = [entry.name.lower() for entry in self.entries]
+        self._text = "\n".join(names)
+        self._starts = []
+        position = 0
+        for name in names:
+            self._starts.append(position)
+            position += len(name) + 1
+        self._by_name = sorted(range(len(names)), key=names.__getitem__)
+        self._sorted_names = [names[i] for i in self._by_name]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, term):
+        """Entries whose name contains `term`; every entry for an empty term."""
+        term = term.lower()
+        if not term:
+            return list(self.entries)
+        if "\n" in term:
+            return []
+        matches = []
+        last = -1
+        text, starts = self._text, self._starts
+        position = text.find(term)
+        while position != -1:
+            i = bisect_right(starts, position) - 1
+            if i != last:
+                matches.append(self.entries[i])
+                last = i
+            # Continue after this name: one match per entry is enough
+            position = text.find(term, starts[i + 1] if i + 1 < len(starts) else len(text))
+        return matches
+
+    def prefix(self, term):
+        """Entries whose name starts with `term`, in id order."""
+        term = term.lower()
+        low = bisect_left(self._sorted_names, term)
+        high = bisect_left(self._sorted_names, term + "\uffff", low)
+        return [self.entries[i] for i in sorted(self._by_name[low:high])]
+
+
+_index = None
+
+
+def get_name_index():
+    """The current index, or None until `rebuild_name_index` has run."""
+    return _index
+
+
+def rebuild_name_index():
+    """Builds the index from the database; call at startup and after every sync."""
+    global _index
+    index = NameIndex(NameIndexEntry(*row) for row in query_list_rows() if row.name)
+    # Swapped in whole, so searches on the main thread never see a half-built index
+    _index = index
+    print(f"Name index built with {len(index)} Pokémon")
+    return index
@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from ..config import IMAGE_PREFETCH_WORKERS
+from ..image_cache import image_cache
+from .http import transport
+
+
+def prefetch_images(urls, workers=IMAGE_PREFETCH_WORKERS, progress_callback=None, cache=image_cache):
+    """Downloads every image URL that is not in the image cache yet.
+
+    URLs already cached are skipped, so an interrupted run resumes where it left off.
+    Every image of the set is pinned in the cache, so eviction never undoes the prefetch.
+    Returns a (fetched, failed) tuple.
+    """
+    cache.pin(urls)
+    pending = [url for url in dict.fromkeys(urls) if url and url not in cache]
+    total = len(pending)
+    print(f"Prefetching {total} images ({len(urls) - total} already cached)...")
+    if not pending:
+        return 0, 0
+
+    lock = threading.Lock()
+    counts = {"done": 0, "fetched": 0, "failed": 0}
+
+    def fetch(url):
+        try:
+            response = transport.get(url, timeout=10)
+            response.raise_for_status()
+            cache.put(url, response.content, pinned=True)
+            outcome = "fetched"
+        except (requests.exceptions.RequestException, OSError) as e:
+            print(f"Error prefetching image {url}: {e}")
+            outcome = "failed"
+        with lock:
+            counts[outcome] += 1
+            counts["done"] += 1
+            done = counts["done"]
+            # Reported under the lock so progress never goes backwards
+            if progress_callback and (done % 25 == 0 or done == total):
+                progress_callback(done, total)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Consume the iterator so worker exceptions surface here
+        list(executor.map(fetch, pending))
+
+    print(f"Image prefetch finished: {counts['fetched']} fetched, {counts['failed']} failed.")
+    return counts["fetched"], counts["failed"]
@@ -0,0 +1,59 @@
+import threading
+
+from ..cache import LRUCache
+from ..config import QUERY_CACHE_MAX_ENTRIES
+
+# Bumped after every committed write to the catalog; cached results of older epochs are never served
+_data_epoch = 0
+_epoch_lock = threading.Lock()
+
+
+def data_epoch():
+    return _data_epoch
+
+
+def bump_data_epoch():
+    global _data_epoch
+    with _epoch_lock:
+        _data_epoch += 1
+
+
+class EpochCache:
+    """LRU cache whose entries are only valid in the data epoch they were read in.
+
+    After a sync or any other write the old entries simply stop matching and age out,
+    so nothing has to be cleared by hand.
+    """
+
+    def __init__(self, max_entries):
+        self._cache = LRUCache(max_entries=max_entries)
+
+    def get(self, key, default=None):
+        return self._cache.get((data_epoch(), key), default)
+
+    def put(self, key, value, epoch=None):
+        """Stores `value`; pass the epoch read before the query if it may have changed since."""
+        self._cache.put((data_epoch() if epoch is None else epoch, key), value)
+
+    def get_or_compute(self, key, compute):
+        """Read-through: returns the cached value or stores and returns `compute()` (unless None)."""
+        epoch = data_epoch()
+        value = self._cache.get((epoch, key))
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value, epoch)
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+    def __contains__(self, key):
+        return (data_epoch(), key) in self._cache
+
+    def __len__(self):
+        return len(self._cache)
+
+
+# Small query results shared by the views (counts, the Pokemon of the day, ...)
+query_cache = EpochCache(QUERY_CACHE_MAX_ENTRIES)
@@ -0,0 +1,121 @@
+import json
+import zlib
+
+from .models import PokemonSnapshot
+
+# Bump when the serialized layout changes; older snapshots are then rebuilt
+SNAPSHOT_FORMAT_VERSION = 1
+
+VERSION_GROUPS = {
+    "red-blue": "Gen 1", "yellow": "Gen 1",
+    "gold-silver": "Gen 2", "crystal": "Gen 2",
+    "ruby-sapphire": "Gen 3", "emerald": "Gen 3", "firered-leafgreen": "Gen 3",
+    "diamond-pearl": "Gen 4", "platinum": "Gen 4", "heartgold-soulsilver": "Gen 4",
+    "black-white": "Gen 5", "black-2-white-2": "Gen 5",
+    "x-y": "Gen 6", "omega-ruby-alpha-sapphire": "Gen 6",
+    "sun-moon": "Gen 7", "ultra-sun-ultra-moon": "Gen 7", "lets-go-pikachu-lets-go-eevee": "Gen 7",
+    "sword-shield": "Gen 8", "brilliant-diamond-shining-pearl": "Gen 8", "legends-arceus": "Gen 8",
+    "scarlet-violet": "Gen 9"
+}
+
+
+class PokemonDetail:
+    """Everything the detail view renders for one Pokémon, independent of the database.
+
+    `moves` maps a generation name ("Gen 1") to learn method to rows of
+    [level, name, type, damage class, power, accuracy, pp], already de-duplicated.
+    `abilities` holds [name, is_hidden, description] rows. `complete` is False for a
+    detail built from a Pokemon still missing data; those are never stored or cached.
+    """
+
+    FIELDS = (
+        "id", "name", "form_name", "description", "height", "weight", "base_experience",
+        "sprite_url", "artwork_url", "species_url", "evolution_chain_url", "region_name",
+        "hp", "attack", "defense", "special_attack", "special_defense", "speed",
+        "types", "abilities", "moves", "first_generation",
+    )
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+        self.complete = True
+
+    @classmethod
+    def from_pokemon(cls, pokemon):
+        """Builds a detail from a Pokemon whose relations can still be loaded."""
+        moves = {}
+        seen_moves = set()
+        first_generation = 10
+        for pm in pokemon.moves:
+            generation = VERSION_GROUPS.get(pm.version_group)
+            if not generation:
+                continue
+            first_generation = min(first_generation, int(generation.split(" ")[1]))
+            if not pm.move:
+                continue
+            move_key = (generation, pm.move.name, pm.learn_method, pm.level_learned_at)
+            if move_key in seen_moves:
+                continue
+            seen_moves.add(move_key)
+            move = pm.move
+            moves.setdefault(generation, {}).setdefault(pm.learn_method, []).append([
+                pm.level_learned_at, move.name, move.type.name if move.type else "unknown",
+                move.damage_class, move.power, move.accuracy, move.pp,
+            ])
+
+        return cls(
+            id=pokemon.id,
+            name=pokemon.name,
+            form_name=pokemon.form_name,
+            description=pokemon.description,
+            height=pokemon.height,
+            weight=pokemon.weight,
+            base_experience=pokemon.base_experience,
+            sprite_url=pokemon.sprite_url,
+            artwork_url=pokemon.artwork_url,
+            species_url=pokemon.species_url,
+            evolution_chain_url=pokemon.evolution_chain_url,
+            region_name=pokemon.region.name if pokemon.region else None,
+            hp=pokemon.hp,
+            attack=pokemon.attack,
+            defense=pokemon.defense,
+            special_attack=pokemon.special_attack,
+            special_defense=pokemon.special_defense,
+            speed=pokemon.speed,
+            types=[pt.type.name for pt in pokemon.types if pt.type],
+            abilities=[
+                [pa.ability.name, bool(pa.is_hidden), pa.ability.short_description or pa.ability.description]
+                for pa in pokemon.abilities if pa.ability
+            ],
+            moves=moves,
+            first_generation=first_generation,
+        )
+
+    def to_blob(self):
+        fields = {name: getattr(self, name) for name in self.FIELDS}
+        return zlib.compress(json.dumps(fields, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_blob(cls, blob):
+        return cls(**json.loads(zlib.decompress(blob)))
+
+
+def store_pokemon_snapshot(session, pokemon, commit=True):
+    """Serializes `pokemon` into its snapshot row and returns the PokemonDetail."""
+    detail = PokemonDetail.from_pokemon(pokemon)
+    session.merge(PokemonSnapshot(
+        pokemon_id=pokemon.id,
+        format_version=SNAPSHOT_FORMAT_VERSION,
+        data=detail.to_blob(),
+    ))
+    if commit:
+        session.commit()
+    return detail
+
+
+def get_pokemon_snapshot(session, pokemon_id):
+    """Returns the PokemonDetail stored for `pokemon_id`, or None if missing or outdated."""
+    row = session.query(PokemonSnapshot.format_version, PokemonSnapshot.data).filter_by(pokemon_id=pokemon_id).first()
+    if row is None or row.format_version != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return PokemonDetail.from_blob(row.data)
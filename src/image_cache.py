@@ -0,0 +1,297 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from .config import CACHE_DIR, IMAGE_CACHE_MAX_BYTES, THUMBNAIL_CACHE_MAX_BYTES
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_TRAILER = b"IEND\xaeB`\x82"
+JPEG_SIGNATURE = b"\xff\xd8"
+JPEG_TRAILER = b"\xff\xd9"
+
+INDEX_FILENAME = "index.db"
+TEMP_SUFFIX = ".tmp"
+STALE_TEMP_SECONDS = 60
+# Cache hits only touch memory; their access times reach the index in batches
+ACCESS_FLUSH_ENTRIES = 64
+ACCESS_FLUSH_SECONDS = 30
+
+
+def is_complete_image(data):
+    """Cheap truncation check for cached PNG/JPEG files, without decoding them."""
+    if data.startswith(PNG_SIGNATURE):
+        return data.endswith(PNG_TRAILER)
+    if data.startswith(JPEG_SIGNATURE):
+        return data.rstrip(b"\x00").endswith(JPEG_TRAILER)
+    # Unknown formats (e.g. SVG sprites) can't be checked this way
+    return len(data) > 0
+
+
+class DiskCache:
+    """Size-capped, sharded on-disk cache with atomic writes and LRU eviction.
+
+    Files live at `<root>/<first two hex digits>/<md5 of key>` and are written to a
+    temporary file that is renamed into place, so readers never see partial data.
+    A small SQLite index tracks the size and last access of every entry, which makes
+    size accounting and eviction independent of the number of files on disk. Access
+    times of hits are kept in memory and written in batches, and always before evicting.
+
+    Pinned entries (the images downloaded for offline use) are never evicted and don't
+    count towards `max_bytes`, which only bounds what is cached on demand.
+    """
+
+    def __init__(self, root, max_bytes, low_watermark=0.9):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.low_watermark = low_watermark
+        self._lock = threading.Lock()
+        self._pending_access = {}
+        self._last_access_flush = time.monotonic()
+        os.makedirs(root, exist_ok=True)
+        self._index = sqlite3.connect(os.path.join(root, INDEX_FILENAME), check_same_thread=False)
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("PRAGMA synchronous=NORMAL")
+        self._index.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "digest TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL, "
+            "pinned INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._index.execute("PRAGMA table_info(entries)")}
+        if "pinned" not in columns:
+            # Index written before entries could be pinned
+            self._index.execute("ALTER TABLE entries ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0")
+        self._index.execute("CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access)")
+        self._index.commit()
+        self.total_bytes = self._index.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self.pinned_bytes = self._index.execute("SELECT COALESCE(SUM(size), 0) FROM entries WHERE pinned").fetchone()[0]
+
+    @staticmethod
+    def digest(key):
+        return hashlib.md5(key.encode()).hexdigest()
+
+    def _path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def get_path(self, key):
+        """Returns the path of a cached entry and marks it as recently used, or None."""
+        digest = self.digest(key)
+        path = self._path(digest)
+        if not os.path.exists(path):
+            # Drops the index row of a file deleted behind our back
+            self._forget(digest)
+            return None
+        with self._lock:
+            self._pending_access[digest] = time.time()
+            if (len(self._pending_access) >= ACCESS_FLUSH_ENTRIES
+                    or time.monotonic() - self._last_access_flush > ACCESS_FLUSH_SECONDS):
+                self._flush_access()
+                self._index.commit()
+        return path
+
+    def _flush_access(self):
+        # Called with the lock held; the caller commits
+        if self._pending_access:
+            self._index.executemany(
+                "UPDATE entries SET last_access = ? WHERE digest = ?",
+                [(accessed, digest) for digest, accessed in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+        self._last_access_flush = time.monotonic()
+
+    def __contains__(self, key):
+        """Checks for an entry without marking it as used."""
+        with self._lock:
+            row = self._index.execute("SELECT 1 FROM entries WHERE digest = ?", (self.digest(key),)).fetchone()
+        return row is not None
+
+    def get(self, key):
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            self._forget(self.digest(key))
+            return None
+
+    def put(self, key, data, pinned=False):
+        """Stores `data` under `key`; a pinned entry stays pinned when it is stored again."""
+        digest = self.digest(key)
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique per writer, so two threads storing the same key never share a temp file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{TEMP_SUFFIX}"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        # The file and its index row change together under the lock, so a concurrent
+        # _forget of the same key can never leave a row without its file
+        with self._lock:
+            try:
+                os.replace(temp_path, path)
+            except OSError:
+                os.remove(temp_path)
+                raise
+            self._pending_access.pop(digest, None)
+            row = self._index.execute("SELECT size, pinned FROM entries WHERE digest = ?", (digest,)).fetchone()
+            if row:
+                self._uncount(*row)
+                pinned = pinned or bool(row[1])
+            self._index.execute(
+                "INSERT OR REPLACE INTO entries (digest, size, last_access, pinned) VALUES (?, ?, ?, ?)",
+                (digest, len(data), time.time(), int(pinned)),
+            )
+            self.total_bytes += len(data)
+            if pinned:
+                self.pinned_bytes += len(data)
+            if self._over_budget():
+                self._evict()
+            self._index.commit()
+        return path
+
+    def pin(self, keys):
+        """Pins the entries of `keys` that are cached. Returns how many were newly pinned."""
+        digests = [self.digest(key) for key in keys if key]
+        pinned = 0
+        with self._lock:
+            for digest in digests:
+                row = self._index.execute("SELECT size FROM entries WHERE digest = ? AND NOT pinned", (digest,)).fetchone()
+                if row:
+                    self._index.execute("UPDATE entries SET pinned = 1 WHERE digest = ?", (digest,))
+                    self.pinned_bytes += row[0]
+                    pinned += 1
+            self._index.commit()
+        return pinned
+
+    def _uncount(self, size, pinned):
+        # Called with the lock held, for an entry leaving the index or about to be replaced
+        self.total_bytes -= size
+        if pinned:
+            self.pinned_bytes -= size
+
+    def _over_budget(self):
+        return self.total_bytes - self.pinned_bytes > self.max_bytes
+
+    def discard(self, key):
+        self._forget(self.digest(key))
+
+    def _forget(self, digest):
+        with self._lock:
+            self._pending_access.pop(digest, None)
+            row = self._index.execute("SELECT size, pinned FROM entries WHERE digest = ?", (digest,)).fetchone()
+            if row:
+                self._uncount(*row)
+                self._index.execute("DELETE FROM entries WHERE digest = ?", (digest,))
+                self._index.commit()
+            # Still under the lock: put() renames its file into place under it too
+            try:
+                os.remove(self._path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        # Called with the lock held; drops least recently used unpinned entries down to the low watermark
+        self._flush_access()
+        target = self.max_bytes * self.low_watermark + self.pinned_bytes
+        rows = self._index.execute("SELECT digest, size FROM entries WHERE NOT pinned ORDER BY last_access").fetchall()
+        evicted = []
+        for digest, size in rows:
+            if self.total_bytes <= target:
+                break
+            evicted.append((digest,))
+            self.total_bytes -= size
+            try:
+                os.remove(self._path(digest))
+            except FileNotFoundError:
+                pass
+        self._index.executemany("DELETE FROM entries WHERE digest = ?", evicted)
+
+    def repair(self, validator=is_complete_image):
+        """Reconciles the index with the files on disk and drops corrupt entries.
+
+        Removes stale temp files and index rows without a file, validates every indexed
+        file, and adopts files missing from the index (including entries from the old flat
+        layout) when they pass validation. Returns the number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            indexed = dict(self._index.execute("SELECT digest, size FROM entries").fetchall())
+
+        on_disk = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if filename.endswith(TEMP_SUFFIX):
+                    # Left behind by a crash mid-write; recent ones may belong to a live writer
+                    if time.time() - os.path.getmtime(path) > STALE_TEMP_SECONDS:
+                        os.remove(path)
+                elif dirpath == self.root and len(filename) == 32:
+                    # Flat layout used before sharding: move into its shard
+                    shard_path = self._path(filename)
+                    os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+                    os.replace(path, shard_path)
+                    on_disk[filename] = shard_path
+                elif path == self._path(filename):
+                    on_disk[filename] = path
+                elif dirpath != self.root:
+                    # Not produced by this cache layout
+                    os.remove(path)
+
+        for digest in indexed.keys() - on_disk.keys():
+            self._forget(digest)
+            removed += 1
+
+        for digest, path in on_disk.items():
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            if digest in indexed and indexed[digest] == len(data) and validator(data):
+                continue
+            if validator(data):
+                with self._lock:
+                    # Re-read the row: a writer may have indexed this entry since the snapshot
+                    row = self._index.execute("SELECT size, pinned FROM entries WHERE digest = ?", (digest,)).fetchone()
+                    pinned = bool(row and row[1])
+                    if row:
+                        self._uncount(*row)
+                    self.total_bytes += len(data)
+                    if pinned:
+                        self.pinned_bytes += len(data)
+                    self._index.execute(
+                        "INSERT OR REPLACE INTO entries (digest, size, last_access, pinned) VALUES (?, ?, ?, ?)",
+                        (digest, len(data), os.path.getmtime(path), int(pinned)),
+                    )
+                    self._index.commit()
+            else:
+                print(f"Removing corrupt cache entry {path}")
+                self._forget(digest)
+                removed += 1
+
+        with self._lock:
+            if self._over_budget():
+                self._evict()
+                self._index.commit()
+        return removed
+
+    def stats(self):
+        with self._lock:
+            entries = self._index.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {"entries": entries, "bytes": self.total_bytes, "pinned_bytes": self.pinned_bytes, "max_bytes": self.max_bytes}
+
+
+IMAGES_DIR = os.path.join(CACHE_DIR, "images")
+# Derived tier: originals pre-scaled to the sizes the UI displays
+THUMBNAILS_DIR = os.path.join(CACHE_DIR, "thumbnails")
+
+image_cache = DiskCache(IMAGES_DIR, IMAGE_CACHE_MAX_BYTES)
+thumbnail_cache = DiskCache(THUMBNAILS_DIR, THUMBNAIL_CACHE_MAX_BYTES)
@@ -1,26 +1,35 @@
+from . import startup_metrics  # First, so startup times are measured from here
+
 import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, GLib, Gio
+import os
 import sys
-import threading
-from typing import Optional, List, Callable, Any
+from typing import Optional, Any, Callable, TYPE_CHECKING
 
-from .ui.main_window import MainWindow
+# Only what the home page needs is imported up front. The main window, SQLAlchemy,
+# requests and notify2 are imported when first used, after the window is on screen
 from .ui.home_page import HomePage
-from .data.database import init_db, get_session
-from .data.models import Pokemon
 from .hyprland.theme import load_css
-from .hyprland.notifications import send_notification
+from .async_loop import install_event_loop
+from .ui_dispatcher import ui_dispatcher
+from .scheduler import scheduler, PRIORITY_INTERACTIVE, PRIORITY_SYNC
+from .search import SearchPipeline
 from .config import (
     WINDOW_DEFAULT_WIDTH,
     WINDOW_DEFAULT_HEIGHT,
     WINDOW_TITLE,
     APP_ID,
     SEARCH_TIMEOUT_MS,
-    ITEMS_PER_PAGE
+    ITEMS_PER_PAGE,
+    SYNC_PREFETCH_IMAGES,
+    STARTUP_METRICS_PATH,
+    WATCHDOG_ENV_VAR
 )
 
-from sqlalchemy.orm import joinedload
+if TYPE_CHECKING:
+    from .ui.main_window import MainWindow
+    from .data.name_index import NameIndex
 
 
 class PokedexApplication(Gtk.Application):
@@ -29,21 +38,78 @@ class PokedexApplication(Gtk.Application):
                          flags=Gio.ApplicationFlags.FLAGS_NONE)
         self.window: Optional[Gtk.ApplicationWindow] = None
         self.is_syncing: bool = False
-        self.main_window_content: Optional[MainWindow] = None # This will be the Gtk.Box from MainWindow
+        self.main_window_content: Optional["MainWindow"] = None # This will be the Gtk.Box from MainWindow
         self.home_page: Optional[HomePage] = None
         self.header_bar: Optional[Gtk.HeaderBar] = None
         self.search_timeout_id: Optional[int] = None
+        # Database searches run in order on one worker; only the latest search reaches the list
+        self.search_pipeline: SearchPipeline = SearchPipeline(self._get_pokemon_from_db_in_thread)
+        self.search_term: str = ""
+        self.database_ready: bool = False
+        # Answers searches on the main thread once built; None until then
+        self.name_index: Optional["NameIndex"] = None
+        self.search_results: Optional[list] = None
+        self.sort_key: str = "id"
+        # (column, minimum, maximum) ranges the list is narrowed to; hashable for the search cache
+        self.filters: tuple = ()
 
     def do_startup(self) -> None:
         Gtk.Application.do_startup(self)
-        # Initialize database in a background thread to avoid blocking UI startup
-        threading.Thread(target=init_db, daemon=True).start()
+        # Database and cache setup run in the background so the window can be shown first
+        scheduler.submit(self._initialize_in_background, priority=PRIORITY_INTERACTIVE, callback=self._on_database_ready)
         load_css() # Apply system GTK theme
 
+    def _initialize_in_background(self) -> "NameIndex":
+        from .data.database import init_db, get_session, needs_startup_sync, sync_database
+        from .data.name_index import rebuild_name_index
+        from .data.query_cache import data_epoch
+        from .utils import start_cache_maintenance, SPRITE_ATLAS_PATH
+        init_db()
+        start_cache_maintenance()
+        session = get_session()
+        try:
+            sync_needed = needs_startup_sync(session)
+        finally:
+            session.close()
+        epoch = data_epoch()
+        if sync_needed:
+            sync_database()
+        if data_epoch() != epoch or not os.path.exists(SPRITE_ATLAS_PATH):
+            # New species (or no atlas yet): repack after the window is usable
+            scheduler.submit(self._rebuild_sprite_atlas, priority=PRIORITY_SYNC)
+        return rebuild_name_index()
+
+    @staticmethod
+    def _rebuild_sprite_atlas(progress_callback: Optional[Callable[[int, int], None]] = None) -> None:
+        """Packs the list sprites so the sidebar never decodes them individually."""
+        from .data.database import get_sprite_urls, get_session
+        from .utils import rebuild_sprite_atlas
+        session = get_session()
+        try:
+            sprites = get_sprite_urls(session)
+        finally:
+            session.close()
+        rebuild_sprite_atlas(sprites, progress_callback=progress_callback)
+
+    def _on_database_ready(self, name_index: "NameIndex") -> None:
+        self.database_ready = True
+        self.name_index = name_index
+        startup_metrics.mark("database-ready", STARTUP_METRICS_PATH)
+        if self.home_page:
+            self.home_page.load_pokemon_of_the_day()
+        if self.main_window_content and self.window.get_child() == self.main_window_content:
+            self.on_search_changed(self.main_window_content.search_entry)
+
+    def _on_first_frame(self, frame_clock: Any) -> None:
+        frame_clock.disconnect(self._first_frame_handler)
+        startup_metrics.mark("first-frame", STARTUP_METRICS_PATH)
+
     def do_activate(self) -> None:
         if not self.window:
             self.window = Gtk.ApplicationWindow(application=self, title=WINDOW_TITLE)
             self.window.set_default_size(WINDOW_DEFAULT_WIDTH, WINDOW_DEFAULT_HEIGHT)
+            # Background results are applied in per-frame batches on this window's clock
+            ui_dispatcher.attach(self.window)
 
             # Header Bar for the main application window
             self.header_bar = Gtk.HeaderBar()
@@ -53,13 +119,20 @@ class PokedexApplication(Gtk.Application):
 
         if not self.home_page:
             self.home_page = HomePage(app_instance=self)
+            if self.database_ready:
+                self.home_page.load_pokemon_of_the_day()
             
         self.window.add(self.home_page)
         self.home_page.show_all()
         self.window.present()
 
+        frame_clock = self.window.get_frame_clock()
+        if frame_clock and not hasattr(self, "_first_frame_handler"):
+            self._first_frame_handler = frame_clock.connect("after-paint", self._on_first_frame)
+
     def show_main_window(self) -> None:
         if not self.main_window_content:
+            from .ui.main_window import MainWindow
             self.main_window_content = MainWindow(app_instance=self) # MainWindow is now a Gtk.Box
             
             # Add a toggle button for the sidebar to the header bar
@@ -96,31 +169,28 @@ class PokedexApplication(Gtk.Application):
         self.window.present()
         self.on_search_changed(self.main_window_content.search_entry) # Trigger initial load for main window
 
-    def _get_pokemon_from_db_in_thread(self, search_term: str, offset: int, limit: int, callback: Callable[[List[Pokemon], int], None]) -> None:
-        try:
-            session = get_session()
-            query = session.query(Pokemon)
-            
-            if search_term:
-                query = query.filter(Pokemon.name.ilike(f"%{search_term}%"))
-            
-            total_count = query.count()
-            pokemon_list = query.order_by(Pokemon.id).offset(offset).limit(limit).all()
-            
-            session.close()
-            GLib.idle_add(callback, pokemon_list, total_count)
-        except Exception as e:
-            print(f"Error fetching pokemon: {e}", file=sys.stderr)
-            # Ensure callback is called to stop spinner, even on error
-            GLib.idle_add(callback, [], 0)
+    @staticmethod
+    def _get_pokemon_from_db_in_thread(search_term: str, sort: str, filters: tuple, offset: int, limit: int) -> tuple:
+        from .data.database import query_pokemon_page
+        return query_pokemon_page(search_term, offset, limit, sort=sort, filters=filters)
+
+    def _uses_name_index(self) -> bool:
+        # The index only knows names, in id order
+        return self.name_index is not None and self.sort_key == "id" and not self.filters
 
     def on_search_changed(self, search_entry: Gtk.SearchEntry) -> None:
         if self.search_timeout_id:
             GLib.source_remove(self.search_timeout_id)
-        
+            self.search_timeout_id = None
+
+        if self._uses_name_index():
+            # Answered from memory, so every keystroke updates the list right away
+            self._perform_search(search_entry)
+            return
         self.search_timeout_id = GLib.timeout_add(SEARCH_TIMEOUT_MS, self._perform_search, search_entry)
 
     def start_background_sync(self) -> None:
+        from .hyprland.notifications import send_notification
         if self.is_syncing:
             send_notification("Sync in Progress", "The database is already being updated.")
             return
@@ -130,13 +200,21 @@ class PokedexApplication(Gtk.Application):
 
         def run_sync() -> None:
             from .data.database import sync_database
+            from .data.name_index import rebuild_name_index
+            from .data.query_cache import data_epoch
             
             def progress(current: int, total: int) -> None:
                 # We could update a progress bar here if we had one
                 print(f"Sync progress: {current}/{total}")
             
             try:
-                sync_database(background=True, progress_callback=progress)
+                epoch = data_epoch()
+                sync_database(background=True, progress_callback=progress, prefetch_images=SYNC_PREFETCH_IMAGES)
+                name_index = rebuild_name_index()
+                GLib.idle_add(setattr, self, "name_index", name_index)
+                if data_epoch() != epoch:
+                    # Sprites are already in the image cache when the images stage ran
+                    self._rebuild_sprite_atlas(progress)
                 GLib.idle_add(send_notification, "Update Complete", "Pokémon database has been updated.")
             except Exception as e:
                 GLib.idle_add(send_notification, "Update Failed", f"Error during sync: {str(e)}")
@@ -146,25 +224,72 @@ class PokedexApplication(Gtk.Application):
                 if self.main_window_content and self.window.get_child() == self.main_window_content:
                     GLib.idle_add(self.on_search_changed, self.main_window_content.search_entry)
 
-        threading.Thread(target=run_sync, daemon=True).start()
+        scheduler.submit(run_sync, priority=PRIORITY_SYNC)
+
+    def load_pokemon_window(self, offset: int, limit: int, prepend: bool = False) -> None:
+        """Loads `limit` results of the current search starting at `offset` into the list."""
+        if not self.main_window_content:
+            return
+        on_loaded = self.main_window_content.add_pokemon_window
+        if self.search_results is not None:
+            rows = self.search_results[offset:offset + limit]
+            next_window_urls = [row.sprite_url for row in self.search_results[offset + limit:offset + 2 * limit]]
+            on_loaded(offset, prepend, rows, len(self.search_results), next_window_urls)
+            return
+
+        def on_result(result: Optional[tuple]) -> None:
+            if result is None:
+                print(f"Error fetching Pokémon for '{self.search_term}'", file=sys.stderr)
+                # Still called with an empty window so the spinner stops
+                result = ([], 0, None)
+            on_loaded(offset, prepend, *result)
+
+        self.search_pipeline.request(self.search_term, self.sort_key, self.filters, offset, limit, on_result)
+
+    def set_sort_key(self, sort_key: str) -> None:
+        """Orders the list by "id" or a stat column; stat orders are read from their index."""
+        self.sort_key = sort_key
+        if self.main_window_content:
+            self._perform_search(self.main_window_content.search_entry)
+
+    def replace_filter(self, old_column: Optional[str], column: Optional[str],
+                       minimum: Optional[float], maximum: Optional[float]) -> None:
+        """Replaces the range on `old_column` with `column` in [minimum, maximum], with a single search.
+
+        Pass the same column twice to change its bounds; two None bounds remove it.
+        """
+        filters = [entry for entry in self.filters if entry[0] not in (old_column, column)]
+        if column and (minimum is not None or maximum is not None):
+            filters.append((column, minimum, maximum))
+        self.filters = tuple(sorted(filters))
+        if self.main_window_content:
+            # Debounced like typing, since spin buttons change one step at a time
+            self.on_search_changed(self.main_window_content.search_entry)
 
     def _perform_search(self, search_entry: Gtk.SearchEntry) -> bool:
         self.search_timeout_id = None
-        search_term = search_entry.get_text().lower()
+        self.search_term = search_entry.get_text().lower()
         
-        # Show spinner before starting search
         if self.main_window_content:
-            self.main_window_content.spinner.show()
-            self.main_window_content.spinner.start()
-            
-            offset = (self.main_window_content.current_page - 1) * self.main_window_content.items_per_page
-            limit = self.main_window_content.items_per_page
-            thread = threading.Thread(target=self._get_pokemon_from_db_in_thread, args=(search_term, offset, limit, self.main_window_content.update_pokemon_list))
-            thread.daemon = True
-            thread.start()
+            if self._uses_name_index():
+                self.search_results = self.name_index.search(self.search_term)
+            else:
+                self.search_results = None
+                # Show spinner while the database is queried
+                self.main_window_content.spinner.show()
+                self.main_window_content.spinner.start()
+            # Windows still loading for the previous search are dropped
+            self.search_pipeline.start()
+            self.main_window_content.reset_pokemon_list()
+            self.load_pokemon_window(0, ITEMS_PER_PAGE)
         return False # Don't repeat timeout
 
 def main() -> int:
+    if os.environ.get(WATCHDOG_ENV_VAR, "0") not in ("", "0"):
+        from .watchdog import install_watchdog
+        install_watchdog()
+    # Must happen before app.run() so asyncio can attach to the GLib main loop
+    install_event_loop()
     app = PokedexApplication()
     return app.run(sys.argv)
 
@@ -0,0 +1,166 @@
+import threading
+from collections import deque
+
+from .config import SCHEDULER_INTERACTIVE_WORKERS, SCHEDULER_PREFETCH_WORKERS, SCHEDULER_SYNC_WORKERS
+
+PRIORITY_INTERACTIVE = 0  # Work the user is waiting on (detail loads, search results)
+PRIORITY_PREFETCH = 1     # Speculative work that may never be shown
+PRIORITY_SYNC = 2         # Long-running database sync
+
+
+class CancelToken:
+    """Marks one generation of a view's background work; cancelled when the view moves on."""
+
+    def __init__(self):
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._cancel_callbacks = []
+
+    def cancel(self):
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancel callback: {e}")
+
+    def add_cancel_callback(self, callback):
+        """Calls `callback()` on cancellation, or right away if already cancelled."""
+        with self._lock:
+            if not self.cancelled:
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
+
+    def guard(self, callback):
+        """Wraps `callback` so it does nothing once this token is cancelled."""
+        def guarded(*args):
+            if self.cancelled:
+                return False
+            return callback(*args)
+        return guarded
+
+
+class Generation:
+    """Hands out a fresh CancelToken per update of a view, cancelling the previous one."""
+
+    def __init__(self):
+        self.token = CancelToken()
+
+    def advance(self):
+        self.token.cancel()
+        self.token = CancelToken()
+        return self.token
+
+
+class Task:
+    def __init__(self, func, args, kwargs, priority, token, callback):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.token = token
+        self.callback = callback
+        self.cancelled = False
+        self.done = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def stale(self):
+        return self.cancelled or (self.token is not None and self.token.cancelled)
+
+
+def _post_to_ui(func, *args):
+    from .ui_dispatcher import ui_dispatcher
+    ui_dispatcher.post(func, *args)
+
+
+class TaskScheduler:
+    """Runs background work on bounded thread pools, one per priority class.
+
+    A pool also serves the more important classes, so interactive work can use every
+    thread while a sync or prefetch backlog never takes the interactive threads.
+    Tasks whose token was cancelled are skipped if still queued, and their results
+    are dropped if they finish late. Callbacks run on the GTK main thread.
+    """
+
+    def __init__(self, pool_sizes=None, dispatch=None):
+        if pool_sizes is None:
+            pool_sizes = {
+                PRIORITY_INTERACTIVE: SCHEDULER_INTERACTIVE_WORKERS,
+                PRIORITY_PREFETCH: SCHEDULER_PREFETCH_WORKERS,
+                PRIORITY_SYNC: SCHEDULER_SYNC_WORKERS,
+            }
+        self._pool_sizes = pool_sizes
+        self._dispatch = dispatch or _post_to_ui
+        self._queues = {priority: deque() for priority in pool_sizes}
+        self._condition = threading.Condition()
+        self._workers = {priority: [] for priority in pool_sizes}
+
+    def submit(self, func, *args, priority=PRIORITY_INTERACTIVE, token=None, callback=None, **kwargs):
+        """Queues `func(*args, **kwargs)`; `callback(result)` is called on the main thread."""
+        task = Task(func, args, kwargs, priority, token, callback)
+        with self._condition:
+            self._queues[priority].append(task)
+            self._ensure_workers(priority)
+            self._condition.notify_all()
+        return task
+
+    def pending(self, priority=None):
+        with self._condition:
+            if priority is not None:
+                return len(self._queues[priority])
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _ensure_workers(self, priority):
+        # Called with the condition held; only this class's own pool grows
+        workers = self._workers[priority]
+        if len(workers) < self._pool_sizes[priority]:
+            worker = threading.Thread(target=self._worker_loop, args=(priority,), daemon=True)
+            workers.append(worker)
+            worker.start()
+
+    def _next_task(self, level):
+        # Called with the condition held
+        for priority in sorted(self._queues):
+            if priority > level:
+                break
+            queue = self._queues[priority]
+            while queue:
+                task = queue.popleft()
+                if not task.stale:
+                    return task
+        return None
+
+    def _worker_loop(self, level):
+        while True:
+            with self._condition:
+                task = self._next_task(level)
+                while task is None:
+                    self._condition.wait()
+                    task = self._next_task(level)
+            try:
+                result = task.func(*task.args, **task.kwargs)
+            except Exception as e:
+                print(f"Error in background task {getattr(task.func, '__name__', task.func)}: {e}")
+                continue
+            finally:
+                task.done = True
+            if task.callback is not None and not task.stale:
+                self._dispatch(self._deliver, task, result)
+
+    @staticmethod
+    def _deliver(task, result):
+        # The token may have been cancelled while this was waiting in the main loop
+        if not task.stale:
+            task.callback(result)
+        return False
+
+
+scheduler = TaskScheduler()
@@ -0,0 +1,95 @@
+import threading
+from collections import deque
+
+from .data.query_cache import EpochCache
+from .config import SEARCH_CACHE_MAX_ENTRIES
+
+
+def _post_to_ui(func, *args):
+    from .ui_dispatcher import ui_dispatcher
+    ui_dispatcher.post(func, *args)
+
+
+class SearchPipeline:
+    """Runs the list queries of the search box on one worker thread, in order.
+
+    Every search gets a sequence number. Starting a new search drops the requests
+    still queued for older ones, and results that finish after a newer search started
+    are discarded, so the list only ever shows results for the current text. Results
+    are cached per (term, sort, filters, offset, limit) until the next write to the catalog,
+    and the page after each one served is prefetched into that cache.
+    """
+
+    def __init__(self, query, cache_size=SEARCH_CACHE_MAX_ENTRIES, dispatch=None):
+        self._query = query
+        self._cache = EpochCache(max_entries=cache_size)
+        self._dispatch = dispatch or _post_to_ui
+        self._condition = threading.Condition()
+        self._requests = deque()
+        self._prefetches = deque()
+        self._worker = None
+        self.seq = 0
+
+    def start(self):
+        """Begins a new search and returns its sequence number."""
+        with self._condition:
+            self.seq += 1
+            self._requests.clear()
+            self._prefetches.clear()
+            return self.seq
+
+    def request(self, term, sort, filters, offset, limit, callback):
+        """Calls `callback(result)` on the main thread, or `callback(None)` if the query failed.
+
+        `filters` must be hashable (a tuple of tuples). Cached pages are delivered right away.
+        """
+        key = (term, sort, filters, offset, limit)
+        result = self._cache.get(key)
+        with self._condition:
+            if result is None:
+                self._requests.append((self.seq, key, callback))
+            else:
+                self._queue_next_page(key)
+            self._ensure_worker()
+            self._condition.notify()
+        if result is not None:
+            callback(result)
+
+    def _queue_next_page(self, key):
+        # Called with the condition held
+        term, sort, filters, offset, limit = key
+        next_key = (term, sort, filters, offset + limit, limit)
+        if next_key not in self._cache:
+            self._prefetches.append((self.seq, next_key, None))
+
+    def _ensure_worker(self):
+        # Called with the condition held
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._worker_loop, name="archdex-search", daemon=True)
+            self._worker.start()
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                while not self._requests and not self._prefetches:
+                    self._condition.wait()
+                seq, key, callback = (self._requests or self._prefetches).popleft()
+                if seq != self.seq:
+                    continue
+            try:
+                result = self._cache.get_or_compute(key, lambda: self._query(*key))
+            except Exception as e:
+                print(f"Error searching for {key}: {e}")
+                result = None
+            if callback is None:
+                continue
+            with self._condition:
+                if seq == self.seq and result is not None:
+                    self._queue_next_page(key)
+            self._dispatch(self._deliver, seq, callback, result)
+
+    def _deliver(self, seq, callback, result):
+        # A newer search may have started while this waited for the main loop
+        if seq == self.seq:
+            callback(result)
+        return False
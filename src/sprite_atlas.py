@@ -0,0 +1,96 @@
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+ATLAS_MAGIC = b"ADXATLS1"
+# magic, sprite width, sprite height, sprite count
+HEADER = struct.Struct("<8sIII")
+# pokemon id, byte offset of its RGBA data from the start of the file
+INDEX_ENTRY = struct.Struct("<IQ")
+BYTES_PER_PIXEL = 4
+
+
+def write_atlas(path, width, height, sprites):
+    """Packs `(pokemon_id, rgba_bytes)` pairs into an atlas file at `path`.
+
+    Every sprite must be exactly width x height RGBA without row padding. The data
+    section is streamed to a temporary file first so the whole atlas never has to
+    be held in memory, and the finished file is renamed into place atomically.
+    Returns the number of sprites written.
+    """
+    sprite_size = width * height * BYTES_PER_PIXEL
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    ids = []
+    with tempfile.TemporaryFile(dir=directory) as data_file:
+        for pokemon_id, rgba in sprites:
+            if len(rgba) != sprite_size:
+                print(f"Skipping atlas sprite {pokemon_id}: expected {sprite_size} bytes, got {len(rgba)}")
+                continue
+            data_file.write(rgba)
+            ids.append(pokemon_id)
+
+        data_start = HEADER.size + INDEX_ENTRY.size * len(ids)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as atlas_file:
+                atlas_file.write(HEADER.pack(ATLAS_MAGIC, width, height, len(ids)))
+                for i, pokemon_id in enumerate(ids):
+                    atlas_file.write(INDEX_ENTRY.pack(pokemon_id, data_start + i * sprite_size))
+                data_file.seek(0)
+                shutil.copyfileobj(data_file, atlas_file)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    return len(ids)
+
+
+class SpriteAtlas:
+    """Read-only, memory-mapped view of an atlas written by `write_atlas`."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            self._file.close()
+            raise
+        magic, self.width, self.height, count = HEADER.unpack_from(self._map, 0)
+        if magic != ATLAS_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a sprite atlas")
+
+        self.sprite_size = self.width * self.height * BYTES_PER_PIXEL
+        self.rowstride = self.width * BYTES_PER_PIXEL
+        index_end = HEADER.size + INDEX_ENTRY.size * count
+        self._offsets = dict(INDEX_ENTRY.iter_unpack(self._map[HEADER.size:index_end]))
+        if self._offsets and max(self._offsets.values()) + self.sprite_size > len(self._map):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        self._view = memoryview(self._map)
+
+    def __contains__(self, pokemon_id):
+        return pokemon_id in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get(self, pokemon_id):
+        """Returns a memoryview into the mapping for a sprite's RGBA data, or None."""
+        offset = self._offsets.get(pokemon_id)
+        if offset is None:
+            return None
+        return self._view[offset:offset + self.sprite_size]
+
+    def close(self):
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        self._map.close()
+        self._file.close()
@@ -0,0 +1,43 @@
+import json
+import time
+from datetime import datetime
+
+# Imported first by src/main.py, so this approximates the process start
+_START = time.perf_counter()
+_marks = {}
+
+# Marks that together make the app interactive: a painted window and a usable database
+INTERACTIVE_MARKS = ("first-frame", "database-ready")
+MAX_RECORDS = 200
+
+
+def mark(name, path=None):
+    """Records the first time startup milestone `name` is reached, in ms since start.
+
+    Once every interactive mark is in, the run is appended to `path` (JSON lines).
+    """
+    if name in _marks:
+        return
+    _marks[name] = (time.perf_counter() - _START) * 1000
+    print(f"Startup: {name} after {_marks[name]:.0f} ms")
+    if all(m in _marks for m in INTERACTIVE_MARKS):
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "first_frame_ms": round(_marks["first-frame"]),
+            "interactive_ms": round(max(_marks[m] for m in INTERACTIVE_MARKS)),
+            "marks": {m: round(ms) for m, ms in _marks.items()},
+        }
+        print(f"Startup: time to first frame {record['first_frame_ms']} ms, time to interactive {record['interactive_ms']} ms")
+        if path:
+            _append_record(path, record)
+
+
+def _append_record(path, record):
+    try:
+        lines = []
+        if path.exists():
+            lines = path.read_text().splitlines()[-(MAX_RECORDS - 1):]
+        lines.append(json.dumps(record))
+        path.write_text("\n".join(lines) + "\n")
+    except OSError as e:
+        print(f"Error writing startup metrics to {path}: {e}")
@@ -2,14 +2,18 @@ import gi
 import os
 from collections import defaultdict
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GdkPixbuf, GLib, Gio, Gdk, Pango
-import threading
+from gi.repository import Gtk, GdkPixbuf, Gio, Gdk, Pango
 
 # Import the image loading function from utils.py
-from ..utils import _load_image_in_thread
+from ..utils import load_image, image_queue
 from ..data.models import Pokemon, Ability, Move, Type, Region
-from ..data.api import _fetch_data, get_species_varieties
-from sqlalchemy.orm import joinedload
+from ..data.api import get_sprite_url
+from ..data.async_api import client
+from ..async_loop import run_async
+from ..ui_dispatcher import ui_dispatcher
+from ..scheduler import scheduler, Generation, PRIORITY_INTERACTIVE
+from ..data.snapshots import PokemonDetail
+from ..data.details import detail_cache, load_pokemon_detail, prefetch_details, evolution_species_ids
 
 import math
 
@@ -80,17 +84,30 @@ CATEGORY_ICONS = {
     "status": get_asset_path("assets/icons/status.png"),
 }
 
-VERSION_GROUPS = {
-    "red-blue": "Gen 1", "yellow": "Gen 1",
-    "gold-silver": "Gen 2", "crystal": "Gen 2",
-    "ruby-sapphire": "Gen 3", "emerald": "Gen 3", "firered-leafgreen": "Gen 3",
-    "diamond-pearl": "Gen 4", "platinum": "Gen 4", "heartgold-soulsilver": "Gen 4",
-    "black-white": "Gen 5", "black-2-white-2": "Gen 5",
-    "x-y": "Gen 6", "omega-ruby-alpha-sapphire": "Gen 6",
-    "sun-moon": "Gen 7", "ultra-sun-ultra-moon": "Gen 7", "lets-go-pikachu-lets-go-eevee": "Gen 7",
-    "sword-shield": "Gen 8", "brilliant-diamond-shining-pearl": "Gen 8", "legends-arceus": "Gen 8",
-    "scarlet-violet": "Gen 9"
-}
+_category_pixbufs = {}
+
+def _get_category_pixbuf(damage_class):
+    """Loads each move category icon from disk once."""
+    damage_class = (damage_class or "").lower()
+    if damage_class not in _category_pixbufs:
+        pixbuf = None
+        cat_path = CATEGORY_ICONS.get(damage_class)
+        if cat_path and os.path.exists(cat_path):
+            try:
+                pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(cat_path, 32, 14, True)
+            except Exception as e:
+                print(f"Error loading local icon {cat_path}: {e}")
+        if pixbuf is None:
+            try:
+                pixbuf = Gtk.IconTheme.get_default().load_icon("image-missing", 16, 0)
+            except Exception:
+                pass
+        _category_pixbufs[damage_class] = pixbuf
+    return _category_pixbufs[damage_class]
+
+# Columns of the move tables' Gtk.ListStore
+MOVE_COL_LEVEL, MOVE_COL_NAME, MOVE_COL_TYPE_MARKUP, MOVE_COL_TYPE, MOVE_COL_CATEGORY, MOVE_COL_POWER, MOVE_COL_ACCURACY, MOVE_COL_PP = range(8)
+MOVE_METHODS = [("level-up", "Level Up"), ("egg", "Egg Moves"), ("machine", "TM/HM")]
 
 ALL_GENERATIONS = ["Gen 1", "Gen 2", "Gen 3", "Gen 4", "Gen 5", "Gen 6", "Gen 7", "Gen 8", "Gen 9"]
 
@@ -107,14 +124,29 @@ GEN_MAX_ID = {
     "Gen 9": 2000
 }
 
+STATS_ORDER = ["hp", "attack", "defense", "special_attack", "special_defense", "speed"]
+STATS_DISPLAY_NAMES = {"hp": "HP", "attack": "Atk", "defense": "Def", "special_attack": "SpA", "special_defense": "SpD", "speed": "Spe"}
+MAX_STAT_VALUE = 255
+
 class DetailView(Gtk.ScrolledWindow):
     def __init__(self, pokemon_data: Pokemon = None):
         super().__init__()
         self.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         self.pokemon_data = None
         self.generation_combo = None
-        self._active_main_tab = 0
-        self._active_moves_tab = 0
+        self.selected_generation = None
+        self._pokemon_first_gen = 10
+        self._rendered_species_url = None
+        # Background work belongs to the Pokémon being shown; a new one cancels it
+        self._generation = Generation()
+        # Work that depends on the selected game generation is also cancelled when that changes
+        self._section_generation = Generation()
+        # Neighbour prefetches outlive the render of the selection they follow; only the next
+        # selection cancels them
+        self._prefetch_generation = Generation()
+        # Tab pages whose content is out of date, mapped to the function that fills them.
+        # A page is only filled when it is first shown
+        self._tab_renderers = {}
 
         self.viewport = Gtk.Viewport()
         self.add(self.viewport)
@@ -123,122 +155,80 @@ class DetailView(Gtk.ScrolledWindow):
         self.main_box.set_border_width(10)
         self.viewport.add(self.main_box)
 
+        # Holds the empty and loading states. The details skeleton is built once, on the
+        # first render, and then updated in place
+        self.state_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        self.main_box.pack_start(self.state_box, True, True, 0)
+        self.top_box = None
+
         if pokemon_data:
             self.update_data(pokemon_data)
         else:
             self._show_empty_state()
 
+    def _show_state(self, *children):
+        for child in self.state_box.get_children():
+            self.state_box.remove(child)
+        for child, expand in children:
+            self.state_box.pack_start(child, expand, expand, 0)
+        if self.top_box:
+            self.top_box.hide()
+        self.state_box.show_all()
+
     def _show_empty_state(self):
-        # Clear existing content
-        for child in self.main_box.get_children():
-            self.main_box.remove(child)
-        
         label = Gtk.Label(label="Select a Pokémon to see details")
         label.set_margin_top(50)
-        self.main_box.pack_start(label, True, True, 0)
-        self.show_all()
+        self._show_state((label, True))
 
     def update_data(self, pokemon_data: Pokemon):
-        # Reset tab indices for a new Pokemon (species change)
-        if self.pokemon_data and self.pokemon_data.species_url != pokemon_data.species_url:
-            self._active_main_tab = 0
-            self._active_moves_tab = 0
         self.pokemon_data = pokemon_data
+        self.load_pokemon(pokemon_data.id, pokemon_data.species_url)
+
+    def _advance(self, generation):
+        token = generation.advance()
+        # Pending artwork and sprites started under the old token are dropped too
+        token.add_cancel_callback(lambda: image_queue.cancel_group(token))
+        return token
+
+    def _new_generation(self):
+        self._section_generation.advance()
+        return self._advance(self._generation)
+
+    def load_pokemon(self, pokemon_id: int, species_url: str = None):
+        self._prefetch_generation.advance()
+        token = self._new_generation()
+        # Go back to the first tabs for a new Pokemon (species change)
+        if self.top_box and self.pokemon_data and self.pokemon_data.species_url != species_url:
+            self.right_notebook.set_current_page(0)
+            self.moves_notebook.set_current_page(0)
         
-        # Check if data is complete, if not, fetch it in a thread
-        from ..data.database import update_pokemon_data, get_session
-        from ..data.models import PokemonType, PokemonAbility, PokemonMove, Move
-        
-        # DetachedInstanceError prevention: re-fetch with all eager loads
-        def check_completeness_and_render():
-            from ..data.database import is_pokemon_data_complete
-            session = get_session()
-            try:
-                # Re-query with all necessary joinedloads for rendering
-                query = session.query(Pokemon).options(
-                    joinedload(Pokemon.region),
-                    joinedload(Pokemon.types).joinedload(PokemonType.type),
-                    joinedload(Pokemon.abilities).joinedload(PokemonAbility.ability),
-                    joinedload(Pokemon.moves).joinedload(PokemonMove.move).joinedload(Move.type)
-                )
-                attached_pokemon = query.filter_by(id=pokemon_data.id).first()
-
-                if not attached_pokemon or not is_pokemon_data_complete(attached_pokemon):
-                    GLib.idle_add(self._show_loading_state)
-                    # update_pokemon_data re-fetches internally but we need the eager loaded version after update
-                    update_pokemon_data(session, pokemon_data.id)
-                    # Re-fetch after update to get the new data with joinedloads
-                    attached_pokemon = query.filter_by(id=pokemon_data.id).first()
-                
-                if attached_pokemon:
-                    # Detach all related objects from session by accessing them
-                    # Or just pass the data we need. Actually, keeping session open
-                    # until render is done might be safest if we can't easily detach everything.
-                    # But GLib.idle_add runs later.
-                    
-                    # Force loading of attributes while session is open
-                    _ = attached_pokemon.region
-                    for pt in attached_pokemon.types: _ = pt.type
-                    for pa in attached_pokemon.abilities: _ = pa.ability
-                    for pm in attached_pokemon.moves:
-                        _ = pm.move
-                        if pm.move: _ = pm.move.type
-
-                    GLib.idle_add(self._render_details, attached_pokemon)
-            except Exception as e:
-                print(f"Error checking completeness: {e}")
-            finally:
-                session.close()
+        cached_pokemon = detail_cache.get(pokemon_id)
+        if cached_pokemon is not None:
+            # Prefetched or recently shown: render straight from memory
+            self._render_details(cached_pokemon)
+            return
 
-        threading.Thread(target=check_completeness_and_render, daemon=True).start()
-        return
+        # Load (and complete from the API if needed) off the main loop
+        def load():
+            return load_pokemon_detail(pokemon_id, on_fetch=lambda: ui_dispatcher.post(token.guard(self._show_loading_state)))
 
-        self._render_details(pokemon_data)
+        def render(pokemon):
+            if pokemon:
+                self._render_details(pokemon)
+
+        scheduler.submit(load, priority=PRIORITY_INTERACTIVE, token=token, callback=render)
+
+    def prefetch(self, pokemon_ids):
+        """Loads Pokémon likely to be opened next; dropped when another Pokémon is selected."""
+        prefetch_details(pokemon_ids, token=self._prefetch_generation.token)
 
     def _show_loading_state(self):
-        for child in self.main_box.get_children():
-            self.main_box.remove(child)
         spinner = Gtk.Spinner()
         spinner.start()
-        self.main_box.pack_start(spinner, True, True, 0)
-        self.main_box.pack_start(Gtk.Label(label="Fetching detailed data..."), False, False, 0)
-        self.show_all()
-
-    def _lazy_load_data(self, pokemon_id, species_url):
-        from ..data.database import update_pokemon_data, get_session
-        session = get_session()
-        updated_pokemon = update_pokemon_data(session, pokemon_id, pokemon_url=None) # update_pokemon_data now handles checks
-        session.close()
-        
-        if updated_pokemon:
-            GLib.idle_add(self._render_details, updated_pokemon)
-
-    def _render_details(self, pokemon_data: Pokemon, selected_generation: str = None):
-        # Freeze UI updates for performance
-        self.main_box.freeze_child_notify()
-        # Save current tab indices if notebooks exist
-        # We need to find them in the current main_box before clearing
-        for child in self.main_box.get_children():
-            if isinstance(child, Gtk.Box): # top_box
-                for subchild in child.get_children():
-                    if isinstance(subchild, Gtk.Box): # main_h_box
-                        # The notebook is the second child of main_h_box
-                        h_box_children = subchild.get_children()
-                        if len(h_box_children) >= 2:
-                            right_side = h_box_children[1]
-                            if isinstance(right_side, Gtk.Notebook):
-                                self._active_main_tab = right_side.get_current_page()
-                                # Try to find moves_notebook
-                                moves_page = right_side.get_nth_page(0)
-                                if isinstance(moves_page, Gtk.Box):
-                                    for moves_child in moves_page.get_children():
-                                        if isinstance(moves_child, Gtk.Notebook):
-                                            self._active_moves_tab = moves_child.get_current_page()
-
-        # Clear existing content
-        for child in self.main_box.get_children():
-            self.main_box.remove(child)
+        self._show_state((spinner, True), (Gtk.Label(label="Fetching detailed data..."), False))
 
+    def _build_skeleton(self):
+        """Creates every persistent widget of the details page; sections are filled in later."""
         # Container for the top part (Name, Image, Types, etc.)
         self.top_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
         self.main_box.pack_start(self.top_box, True, True, 0)
@@ -248,14 +238,9 @@ class DetailView(Gtk.ScrolledWindow):
         self.top_box.pack_start(top_bar, False, False, 0)
 
         # Pokémon Name and ID
-        name_text = pokemon_data.name.capitalize()
-        if pokemon_data.form_name:
-            name_text += f" ({pokemon_data.form_name.replace('-', ' ').capitalize()})"
-            
-        name_id_label = Gtk.Label()
-        name_id_label.set_markup(f"<span size='xx-large'><b>{name_text}</b></span> <span size='large' foreground='#888'>#{pokemon_data.id}</span>")
-        name_id_label.set_xalign(0)
-        top_bar.pack_start(name_id_label, True, True, 0)
+        self.name_id_label = Gtk.Label()
+        self.name_id_label.set_xalign(0)
+        top_bar.pack_start(self.name_id_label, True, True, 0)
 
         # Generation filter combobox
         gen_filter_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
@@ -266,50 +251,14 @@ class DetailView(Gtk.ScrolledWindow):
         self.generation_combo = Gtk.ComboBoxText()
         for gen in ALL_GENERATIONS:
             self.generation_combo.append_text(gen)
-        
-        # Check if Pokémon existed in selected generation
-        pokemon_first_gen = 10
-        for pm in pokemon_data.moves:
-            v_group = pm.version_group
-            if v_group and v_group != "unknown":
-                gen_name = VERSION_GROUPS.get(v_group, "")
-                if gen_name.startswith("Gen "):
-                    try:
-                        gen_num = int(gen_name.split(" ")[1])
-                        if gen_num < pokemon_first_gen:
-                            pokemon_first_gen = gen_num
-                    except: pass
-
-        if not selected_generation:
-            # Default to the generation the Pokémon was introduced in
-            pokemon_first_gen_str = f"Gen {pokemon_first_gen}" if pokemon_first_gen <= 9 else "Gen 9"
-            try:
-                idx = ALL_GENERATIONS.index(pokemon_first_gen_str)
-                self.generation_combo.set_active(idx)
-                selected_generation = pokemon_first_gen_str
-            except ValueError:
-                self.generation_combo.set_active(0)
-                selected_generation = "Gen 1"
-        else:
-            try:
-                idx = ALL_GENERATIONS.index(selected_generation)
-                self.generation_combo.set_active(idx)
-            except ValueError:
-                self.generation_combo.set_active(0)
-                selected_generation = ALL_GENERATIONS[0]
-        
-        self.generation_combo.connect("changed", self._on_generation_changed)
+        self._generation_changed_id = self.generation_combo.connect("changed", self._on_generation_changed)
         gen_filter_box.pack_start(self.generation_combo, False, False, 0)
         top_bar.pack_start(gen_filter_box, False, False, 0)
 
-        try:
-            selected_gen_num = int(selected_generation.split(" ")[1])
-            if selected_gen_num < pokemon_first_gen:
-                not_discovered_label = Gtk.Label()
-                not_discovered_label.set_markup(f"<span foreground='#f44336' size='large'><b>Note:</b> This Pokémon was not discovered until Gen {pokemon_first_gen}.</span>")
-                not_discovered_label.set_xalign(0)
-                self.top_box.pack_start(not_discovered_label, False, False, 0)
-        except: pass
+        self.not_discovered_label = Gtk.Label()
+        self.not_discovered_label.set_xalign(0)
+        self.not_discovered_label.set_no_show_all(True)
+        self.top_box.pack_start(self.not_discovered_label, False, False, 0)
 
         # Main horizontal box container (no longer a Paned to lock the ratio)
         main_h_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=0)
@@ -320,18 +269,14 @@ class DetailView(Gtk.ScrolledWindow):
         left_box.set_border_width(5)
         main_h_box.pack_start(left_box, True, True, 0)
 
-
         # Top Row: Image (Left) and General Info (Right)
         top_row_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=15)
         left_box.pack_start(top_row_box, False, False, 0)
 
         # Image - Official Artwork (increased by another 50% from 156x156 -> 234x234)
         self.artwork_image = Gtk.Image()
+        self.artwork_image.set_size_request(234, 234)
         top_row_box.pack_start(self.artwork_image, False, False, 0)
-        
-        thread = threading.Thread(target=_load_image_in_thread, args=(self.artwork_image, pokemon_data.artwork_url, 234, 234))
-        thread.daemon = True
-        thread.start()
 
         # Basic Info to the right of the image
         info_grid = Gtk.Grid()
@@ -339,36 +284,26 @@ class DetailView(Gtk.ScrolledWindow):
         info_grid.set_row_spacing(5)
         info_grid.set_valign(Gtk.Align.CENTER)
         top_row_box.pack_start(info_grid, True, True, 0)
-        
-        info_data = [
-            ("Height", f"{pokemon_data.height/10} m"),
-            ("Weight", f"{pokemon_data.weight/10} kg"),
-            ("Base XP", str(pokemon_data.base_experience or "N/A")),
-            ("Region", pokemon_data.region.name.capitalize() if pokemon_data.region else "Unknown")
-        ]
-        
-        for i, (label, val) in enumerate(info_data):
+
+        self.info_labels = {}
+        for i, label in enumerate(["Height", "Weight", "Base XP", "Region"]):
             info_grid.attach(Gtk.Label(label=f"<b>{label}:</b>", use_markup=True, xalign=0), 0, i, 1, 1)
-            info_grid.attach(Gtk.Label(label=val, xalign=0), 1, i, 1, 1)
+            self.info_labels[label] = Gtk.Label(xalign=0)
+            info_grid.attach(self.info_labels[label], 1, i, 1, 1)
 
         # Types
-        types_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
-        types_box.set_halign(Gtk.Align.START)
-        left_box.pack_start(types_box, False, False, 0)
-        for pt in pokemon_data.types:
-            type_label = Gtk.Label()
-            color = TYPE_COLORS.get(pt.type.name.lower(), "#444")
-            type_label.set_markup(f"<span background='{color}' foreground='white'>  {pt.type.name.capitalize()}  </span>")
-            types_box.pack_start(type_label, False, False, 0)
+        self.types_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        self.types_box.set_halign(Gtk.Align.START)
+        left_box.pack_start(self.types_box, False, False, 0)
 
         # Description
-        description_label = Gtk.Label(label=pokemon_data.description)
-        description_label.set_line_wrap(True)
-        description_label.set_max_width_chars(45)
-        description_label.set_margin_top(10)
-        description_label.set_margin_bottom(10)
-        description_label.set_xalign(0)
-        left_box.pack_start(description_label, False, False, 0)
+        self.description_label = Gtk.Label()
+        self.description_label.set_line_wrap(True)
+        self.description_label.set_max_width_chars(45)
+        self.description_label.set_margin_top(10)
+        self.description_label.set_margin_bottom(10)
+        self.description_label.set_xalign(0)
+        left_box.pack_start(self.description_label, False, False, 0)
 
         # Base Stats in an Expander
         base_stats_expander = Gtk.Expander(label="Base Stats")
@@ -381,160 +316,72 @@ class DetailView(Gtk.ScrolledWindow):
         stats_grid.set_border_width(10)
         base_stats_expander.add(stats_grid)
 
-        stats_order = ["hp", "attack", "defense", "special_attack", "special_defense", "speed"]
-        stats_display_names = {"hp": "HP", "attack": "Atk", "defense": "Def", "special_attack": "SpA", "special_defense": "SpD", "speed": "Spe"}
-        MAX_STAT_VALUE = 255
-
-        # Apply CSS for progress bar coloring
-        for i, stat_name in enumerate(stats_order):
-            value = getattr(pokemon_data, stat_name, 0)
-            name_label = Gtk.Label(label=f"<span size='large'><b>{stats_display_names[stat_name]}:</b></span>")
+        # stat name -> (value label, progress bar, the bar's own CSS provider for its color)
+        self.stat_rows = {}
+        for i, stat_name in enumerate(STATS_ORDER):
+            name_label = Gtk.Label(label=f"<span size='large'><b>{STATS_DISPLAY_NAMES[stat_name]}:</b></span>")
             name_label.set_use_markup(True)
             name_label.set_xalign(0)
             stats_grid.attach(name_label, 0, i, 1, 1)
 
-            value_label = Gtk.Label(label=f"<span size='large'>{value}</span>")
-            value_label.set_use_markup(True)
+            value_label = Gtk.Label()
             value_label.set_xalign(1)
             value_label.set_size_request(40, -1)
             stats_grid.attach(value_label, 1, i, 1, 1)
 
             progress_bar = Gtk.ProgressBar()
-            progress_bar.set_fraction(value / MAX_STAT_VALUE)
             progress_bar.set_hexpand(True)
             progress_bar.set_size_request(-1, 18)
-
-            # Set custom CSS for the progress bar
-            color_hex = _get_stat_color(value)
-            css = f"progressbar > trough > progress {{ background-color: {color_hex}; min-height: 15px; }}"
-            # Each progress bar needs its own CSS styling.
-            # Create a new CssProvider for each progress bar
-            # to avoid conflicts and ensure independent styling.
             bar_style_provider = Gtk.CssProvider()
-            bar_style_provider.load_from_data(css.encode('utf-8'))
-            context = progress_bar.get_style_context()
-            context.add_provider(bar_style_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
-
+            progress_bar.get_style_context().add_provider(bar_style_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
             stats_grid.attach(progress_bar, 2, i, 1, 1)
 
+            self.stat_rows[stat_name] = (value_label, progress_bar, bar_style_provider)
+
         # Right Column: Notebook for Moves, Abilities, Evolutions
-        right_notebook = Gtk.Notebook()
-        main_h_box.pack_start(right_notebook, True, True, 0)
+        self.right_notebook = Gtk.Notebook()
+        main_h_box.pack_start(self.right_notebook, True, True, 0)
 
         # Tab 1: Moves
         moves_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
         moves_box.set_border_width(5)
 
+        # Nested Notebook for Move Categories, each a sortable table over a list model
+        self.moves_notebook = Gtk.Notebook()
+        moves_box.pack_start(self.moves_notebook, True, True, 0)
 
-        # Nested Notebook for Move Categories
-        moves_notebook = Gtk.Notebook()
-        moves_box.pack_start(moves_notebook, True, True, 0)
-
-        def create_scrolled_box():
+        self.move_stores = {}
+        self.move_pages = {}
+        for method_id, tab_label in MOVE_METHODS:
             scrolled = Gtk.ScrolledWindow()
             scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-            box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-            box.set_border_width(5)
-            scrolled.add(box)
-            return scrolled, box
-
-        self.level_up_scroll, self.level_up_box = create_scrolled_box()
-        moves_notebook.append_page(self.level_up_scroll, Gtk.Label(label="Level Up"))
-
-        self.egg_scroll, self.egg_box = create_scrolled_box()
-        moves_notebook.append_page(self.egg_scroll, Gtk.Label(label="Egg Moves"))
-
-        self.machine_scroll, self.machine_box = create_scrolled_box()
-        moves_notebook.append_page(self.machine_scroll, Gtk.Label(label="TM/HM"))
-
-        # Custom sort for generations
-        def gen_sort_key_for_display(gen):
-            if gen.startswith("Gen "):
-                try:
-                    return int(gen.split(" ")[1])
-                except:
-                    return 99
-            return 100
-
-        # Group and filter moves by generation, then by method
-        filtered_gen_moves = defaultdict(lambda: defaultdict(list))
-        seen_moves_in_filtered_gen = set()
-        for pm in pokemon_data.moves:
-            v_group = pm.version_group
-            gen_name_for_move = "Other"
-            if v_group and v_group != "unknown":
-                gen_name_for_move = VERSION_GROUPS.get(v_group, v_group.replace("-", " ").capitalize())
-            
-            if gen_name_for_move == selected_generation:
-                move_gen_key = (gen_name_for_move, pm.move.name, pm.learn_method, pm.level_learned_at)
-                if move_gen_key not in seen_moves_in_filtered_gen:
-                    filtered_gen_moves[gen_name_for_move][pm.learn_method].append(pm)
-                    seen_moves_in_filtered_gen.add(move_gen_key)
-
-        # Render filtered moves into their respective category boxes
-        methods = [
-            ("level-up", "Level Up Moves", True, self.level_up_box),
-            ("egg", "Egg Moves", False, self.egg_box),
-            ("machine", "TM/HM Moves", False, self.machine_box)
-        ]
-
-        for method_id, method_label, is_level_up, target_box in methods:
-            # Group by generation within each category if "All Generations" is selected
-            for gen in sorted(filtered_gen_moves.keys(), key=gen_sort_key_for_display):
-                moves_list = filtered_gen_moves[gen].get(method_id, [])
-                if not moves_list:
-                    continue
-                
-                self._render_moves_section(target_box, moves_list, method_id, method_label, gen, is_level_up)
+            store, tree_view = self._create_moves_table(is_level_up=method_id == "level-up")
+            scrolled.add(tree_view)
+            self.move_stores[method_id] = store
+            self.move_pages[method_id] = scrolled
+            self.moves_notebook.append_page(scrolled, Gtk.Label(label=tab_label))
 
-        right_notebook.append_page(moves_box, Gtk.Label(label="Moves"))
+        self.moves_box = moves_box
+        self.right_notebook.append_page(moves_box, Gtk.Label(label="Moves"))
 
         # Tab 2: Abilities
-        abilities_scroll = Gtk.ScrolledWindow()
-        abilities_scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        self.abilities_scroll = Gtk.ScrolledWindow()
+        self.abilities_scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         abilities_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
         abilities_box.set_border_width(5)
-        abilities_scroll.add(abilities_box)
+        self.abilities_scroll.add(abilities_box)
 
         # Use a horizontal box to put abilities and effectiveness side-by-side
         # to avoid vertical scrolling and use blank space.
         side_by_side_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         abilities_box.pack_start(side_by_side_box, True, True, 0)
 
-        abilities_left_column = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-        side_by_side_box.pack_start(abilities_left_column, True, True, 0)
+        self.abilities_column = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        side_by_side_box.pack_start(self.abilities_column, True, True, 0)
 
         effectiveness_right_column = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
         side_by_side_box.pack_start(effectiveness_right_column, True, True, 0)
 
-        # Abilities section in left column
-        gen_num = int(selected_generation.split(" ")[1])
-        
-        if gen_num < 3:
-            abilities_left_column.pack_start(Gtk.Label(label="Abilities were introduced in Gen 3."), False, False, 10)
-        else:
-            for pa in pokemon_data.abilities:
-                # Hidden abilities were introduced in Gen 5
-                if pa.is_hidden and gen_num < 5:
-                    continue
-                    
-                ability_name = pa.ability.name.replace('-', ' ').capitalize()
-                hidden_tag = " (Hidden)" if pa.is_hidden else ""
-                
-                frame = Gtk.Frame()
-                frame.set_label(f"{ability_name}{hidden_tag}")
-                abilities_left_column.pack_start(frame, False, False, 2)
-
-                a_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
-                a_box.set_border_width(4)
-                frame.add(a_box)
-                
-                desc_lbl = Gtk.Label(label=pa.ability.short_description or pa.ability.description)
-                desc_lbl.set_line_wrap(True)
-                desc_lbl.set_xalign(0)
-                desc_lbl.set_max_width_chars(35) # Reduced to fit side-by-side
-                a_box.pack_start(desc_lbl, False, False, 0)
-
         # Type Effectiveness section in right column
         eff_frame = Gtk.Frame()
         eff_frame.set_label("Type Effectiveness")
@@ -544,13 +391,8 @@ class DetailView(Gtk.ScrolledWindow):
         self.effectiveness_box.set_border_width(5)
         eff_frame.add(self.effectiveness_box)
 
-        # Pass current types to avoid DetachedInstanceError in the background thread
-        current_types_list = list(pokemon_data.types)
-        threading.Thread(target=self._load_weaknesses, args=(selected_generation, current_types_list)).start()
-        
-        right_notebook.append_page(abilities_scroll, Gtk.Label(label="Abilities"))
+        self.right_notebook.append_page(self.abilities_scroll, Gtk.Label(label="Abilities"))
 
-        # Tab 3: Evolutions
         # Tab 3: Evolutions - Use a ScrolledWindow for better scaling handling
         self.evo_scroll = Gtk.ScrolledWindow()
         self.evo_scroll.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
@@ -559,40 +401,238 @@ class DetailView(Gtk.ScrolledWindow):
         self.evo_box.set_halign(Gtk.Align.CENTER)
         self.evo_box.set_valign(Gtk.Align.CENTER)
         self.evo_scroll.add(self.evo_box)
-        right_notebook.append_page(self.evo_scroll, Gtk.Label(label="Evolutions"))
+        self.right_notebook.append_page(self.evo_scroll, Gtk.Label(label="Evolutions"))
 
-        # Tab 4: Forms
+        # Tab 4: Forms, only shown for species with more than one form
         self.forms_scroll = Gtk.ScrolledWindow()
         self.forms_scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         self.varieties_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
         self.varieties_box.set_border_width(10)
         self.forms_scroll.add(self.varieties_box)
         self.forms_tab_label = Gtk.Label(label="Forms")
-        right_notebook.append_page(self.forms_scroll, self.forms_tab_label)
+        self.right_notebook.append_page(self.forms_scroll, self.forms_tab_label)
 
-        if pokemon_data.species_url:
-            threading.Thread(target=self._load_varieties, args=(pokemon_data.species_url,)).start()
-        
-        # Restore tab indices
-        right_notebook.set_current_page(self._active_main_tab)
-        moves_notebook.set_current_page(self._active_moves_tab)
+        self.right_notebook.connect("switch-page", self._on_tab_switched)
+        self.moves_notebook.connect("switch-page", self._on_tab_switched)
+
+        self.top_box.show_all()
+        for widget in (self.forms_scroll, self.forms_tab_label):
+            widget.set_no_show_all(True)
+            widget.hide()
+
+    def _render_details(self, pokemon_data: PokemonDetail, selected_generation: str = None):
+        new_species = self._rendered_species_url != pokemon_data.species_url
+        self._rendered_species_url = pokemon_data.species_url
+        self.pokemon_data = pokemon_data
+        # Loads started for the previously shown Pokémon are stale now
+        token = self._new_generation()
+        if self.top_box is None:
+            self._build_skeleton()
+
+        # Pokémon Name and ID
+        name_text = pokemon_data.name.capitalize()
+        if pokemon_data.form_name:
+            name_text += f" ({pokemon_data.form_name.replace('-', ' ').capitalize()})"
+        self.name_id_label.set_markup(f"<span size='xx-large'><b>{name_text}</b></span> <span size='large' foreground='#888'>#{pokemon_data.id}</span>")
+
+        self.artwork_image.clear()
+        load_image(self.artwork_image, pokemon_data.artwork_url, 234, 234, group=token)
+
+        self.info_labels["Height"].set_text(f"{pokemon_data.height/10} m")
+        self.info_labels["Weight"].set_text(f"{pokemon_data.weight/10} kg")
+        self.info_labels["Base XP"].set_text(str(pokemon_data.base_experience or "N/A"))
+        self.info_labels["Region"].set_text(pokemon_data.region_name.capitalize() if pokemon_data.region_name else "Unknown")
 
+        for child in self.types_box.get_children():
+            self.types_box.remove(child)
+        for type_name in pokemon_data.types:
+            type_label = Gtk.Label()
+            color = TYPE_COLORS.get(type_name.lower(), "#444")
+            type_label.set_markup(f"<span background='{color}' foreground='white'>  {type_name.capitalize()}  </span>")
+            self.types_box.pack_start(type_label, False, False, 0)
+        self.types_box.show_all()
+
+        self.description_label.set_text(pokemon_data.description or "")
+
+        for stat_name, (value_label, progress_bar, bar_style_provider) in self.stat_rows.items():
+            value = getattr(pokemon_data, stat_name, 0) or 0
+            value_label.set_markup(f"<span size='large'>{value}</span>")
+            progress_bar.set_fraction(min(value / MAX_STAT_VALUE, 1.0))
+            css = f"progressbar > trough > progress {{ background-color: {_get_stat_color(value)}; min-height: 15px; }}"
+            bar_style_provider.load_from_data(css.encode('utf-8'))
+
+        # Generation the Pokémon was introduced in, precomputed in its snapshot
+        pokemon_first_gen = pokemon_data.first_generation or 10
+        self._pokemon_first_gen = pokemon_first_gen
+
+        if not selected_generation:
+            # Default to the generation the Pokémon was introduced in
+            selected_generation = f"Gen {pokemon_first_gen}" if pokemon_first_gen <= 9 else "Gen 9"
+        if selected_generation not in ALL_GENERATIONS:
+            selected_generation = ALL_GENERATIONS[0]
+        with self.generation_combo.handler_block(self._generation_changed_id):
+            self.generation_combo.set_active(ALL_GENERATIONS.index(selected_generation))
+
+        # Nothing rendered for the previous Pokémon is valid any more
+        self._tab_renderers = {}
+
+        if new_species:
+            for child in self.varieties_box.get_children():
+                self.varieties_box.remove(child)
+            self.forms_scroll.hide()
+            self.forms_tab_label.hide()
+        if pokemon_data.species_url:
+            self._load_varieties(token, pokemon_data.species_url)
         if pokemon_data.evolution_chain_url:
-            threading.Thread(target=self._load_evolutions, args=(selected_generation,)).start()
+            self._prefetch_evolution_members(token, pokemon_data.evolution_chain_url)
+
+        self.selected_generation = None
+        self._update_generation_sections(selected_generation)
+
+        self.state_box.hide()
+        self.top_box.show()
+
+    def _update_generation_sections(self, selected_generation):
+        """Refreshes only the sections that depend on the selected game generation."""
+        if selected_generation == self.selected_generation:
+            return
+        self.selected_generation = selected_generation
+        token = self._advance(self._section_generation)
+        gen_num = int(selected_generation.split(" ")[1])
+
+        if gen_num < self._pokemon_first_gen:
+            self.not_discovered_label.set_markup(f"<span foreground='#f44336' size='large'><b>Note:</b> This Pokémon was not discovered until Gen {self._pokemon_first_gen}.</span>")
+            self.not_discovered_label.show()
         else:
+            self.not_discovered_label.hide()
+
+        current_types_list = list(self.pokemon_data.types)
+
+        def render_abilities():
+            self._show_abilities(gen_num)
+            self._load_weaknesses(token, selected_generation, current_types_list)
+
+        def render_evolutions():
+            if self.pokemon_data.evolution_chain_url:
+                self._load_evolutions(token, selected_generation)
+                return
+            for child in self.evo_box.get_children():
+                self.evo_box.remove(child)
             self.evo_box.pack_start(Gtk.Label(label="No evolution data."), True, True, 0)
+            self.evo_box.show_all()
 
-        self.show_all()
+        renderers = {
+            self.abilities_scroll: render_abilities,
+            self.evo_scroll: render_evolutions,
+        }
+        for method_id, page in self.move_pages.items():
+            renderers[page] = lambda method_id=method_id: self._fill_moves(method_id, selected_generation)
+        self._tab_renderers.update(renderers)
+        self._render_current_tabs()
+
+    def _render_current_tabs(self):
+        self._render_tab(self.right_notebook.get_nth_page(self.right_notebook.get_current_page()))
+
+    def _render_tab(self, page):
+        render = self._tab_renderers.pop(page, None)
+        if render:
+            render()
+        if page is self.moves_box:
+            self._render_tab(self.moves_notebook.get_nth_page(self.moves_notebook.get_current_page()))
+
+    def _on_tab_switched(self, notebook, page, page_num):
+        self._render_tab(page)
+
+    def _create_moves_table(self, is_level_up):
+        store = Gtk.ListStore(int, str, str, str, GdkPixbuf.Pixbuf, int, int, int)
+        tree_view = Gtk.TreeView(model=store)
+        tree_view.set_headers_clickable(True)
+        tree_view.get_selection().set_mode(Gtk.SelectionMode.NONE)
+
+        def numeric_cell(column, cell, model, tree_iter, model_column):
+            value = model.get_value(tree_iter, model_column)
+            cell.set_property("text", str(value) if value >= 0 else "-")
+
+        def add_column(title, renderer, sort_column, expand=False, **attributes):
+            column = Gtk.TreeViewColumn(title, renderer, **attributes)
+            column.set_sort_column_id(sort_column)
+            column.set_expand(expand)
+            tree_view.append_column(column)
+            return column
 
+        if is_level_up:
+            add_column("Lvl", Gtk.CellRendererText(), MOVE_COL_LEVEL, text=MOVE_COL_LEVEL)
+        add_column("Move", Gtk.CellRendererText(), MOVE_COL_NAME, expand=True, text=MOVE_COL_NAME)
+        add_column("Type", Gtk.CellRendererText(), MOVE_COL_TYPE, markup=MOVE_COL_TYPE_MARKUP)
+        add_column("Cat", Gtk.CellRendererPixbuf(), MOVE_COL_CATEGORY, pixbuf=MOVE_COL_CATEGORY).set_sort_column_id(-1)
+        for title, model_column in [("Pwr", MOVE_COL_POWER), ("Acc", MOVE_COL_ACCURACY), ("PP", MOVE_COL_PP)]:
+            renderer = Gtk.CellRendererText()
+            column = add_column(title, renderer, model_column)
+            column.set_cell_data_func(renderer, numeric_cell, model_column)
+
+        # Level-up moves are listed by level until the user sorts by another column
+        store.set_sort_column_id(MOVE_COL_LEVEL if is_level_up else MOVE_COL_NAME, Gtk.SortType.ASCENDING)
+        return store, tree_view
+
+    def _fill_moves(self, method_id, selected_generation):
+        store = self.move_stores[method_id]
+        # Sorting is switched off while filling so rows are not re-sorted on every append
+        sort_column, sort_order = store.get_sort_column_id()
+        store.set_sort_column_id(Gtk.TREE_SORTABLE_UNSORTED_SORT_COLUMN_ID, Gtk.SortType.ASCENDING)
+        store.clear()
+        moves = self.pokemon_data.moves.get(selected_generation, {}).get(method_id, [])
+        for level, name, type_name, damage_class, power, accuracy, pp in moves:
+            type_color = TYPE_COLORS.get(type_name.lower(), "#444")
+            store.append([
+                level or 0,
+                name.replace('-', ' ').capitalize(),
+                f"<span background='{type_color}' foreground='white'> {type_name.capitalize()} </span>",
+                type_name,
+                _get_category_pixbuf(damage_class),
+                power if power is not None else -1,
+                accuracy if accuracy is not None else -1,
+                pp if pp is not None else -1,
+            ])
+        if sort_column is not None:
+            store.set_sort_column_id(sort_column, sort_order)
+
+    def _show_abilities(self, gen_num):
+        for child in self.abilities_column.get_children():
+            self.abilities_column.remove(child)
 
+        if gen_num < 3:
+            self.abilities_column.pack_start(Gtk.Label(label="Abilities were introduced in Gen 3."), False, False, 10)
+        else:
+            for name, is_hidden, description in self.pokemon_data.abilities:
+                # Hidden abilities were introduced in Gen 5
+                if is_hidden and gen_num < 5:
+                    continue
+                    
+                ability_name = name.replace('-', ' ').capitalize()
+                hidden_tag = " (Hidden)" if is_hidden else ""
+                
+                frame = Gtk.Frame()
+                frame.set_label(f"{ability_name}{hidden_tag}")
+                self.abilities_column.pack_start(frame, False, False, 2)
+
+                a_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
+                a_box.set_border_width(4)
+                frame.add(a_box)
+                
+                desc_lbl = Gtk.Label(label=description)
+                desc_lbl.set_line_wrap(True)
+                desc_lbl.set_xalign(0)
+                desc_lbl.set_max_width_chars(35) # Reduced to fit side-by-side
+                a_box.pack_start(desc_lbl, False, False, 0)
+        self.abilities_column.show_all()
 
     def _on_generation_changed(self, combo_box):
         selected_generation = combo_box.get_active_text()
-        if not self.pokemon_data:
+        if not self.pokemon_data or not selected_generation:
             return
-        self._render_details(self.pokemon_data, selected_generation)
+        self._update_generation_sections(selected_generation)
 
-    def _load_weaknesses(self, selected_generation, current_types=None):
+    def _load_weaknesses(self, token, selected_generation, current_types=None):
         if not self.pokemon_data: return
         
         # Use types passed from attached object, or try to access self.pokemon_data.types
@@ -605,6 +645,16 @@ class DetailView(Gtk.ScrolledWindow):
         
         if not current_types: return
 
+        # All of the Pokémon's types are fetched concurrently on the asyncio loop
+        future = run_async(
+            client.get_types_details(list(current_types)),
+            token.guard(lambda types_data: self._show_weaknesses(selected_generation, current_types, types_data)),
+        )
+        token.add_cancel_callback(future.cancel)
+
+    def _show_weaknesses(self, selected_generation, current_types, types_data):
+        if not self.pokemon_data: return
+
         # Determine available types for this generation
         available_types = list(TYPE_COLORS.keys())
         gen_num = int(selected_generation.split(" ")[1])
@@ -615,12 +665,11 @@ class DetailView(Gtk.ScrolledWindow):
 
         effectiveness = {t: 1.0 for t in available_types}
         
-        for pt in current_types:
+        for type_name, type_data in zip(current_types, types_data):
             # If the Pokémon's type didn't exist in the selected generation, skip it?
             # Or handle type changes (e.g. Clefairy was Normal before Gen 6)
             # For now, let's just filter the attacking types.
             
-            type_data = _fetch_data(f"https://pokeapi.co/api/v2/type/{pt.type.name}")
             if type_data:
                 damage_rel = type_data["damage_relations"]
                 
@@ -642,12 +691,12 @@ class DetailView(Gtk.ScrolledWindow):
                     # Before Gen 6, Steel resisted Dark and Ghost
                     if "steel" in effectiveness:
                         # If the Pokemon is Steel, it should resist Dark and Ghost
-                        # This logic is slightly wrong because pt.type.name is the Pokemon's type.
+                        # This logic is slightly wrong because type_name is the Pokemon's type.
                         # We want to know how attacking types affect the Pokemon.
                         pass
                     
                     # If the Pokemon is being attacked by Dark/Ghost and it is Steel
-                    if pt.type.name == "steel":
+                    if type_name == "steel":
                         if "dark" in effectiveness: effectiveness["dark"] *= 0.5
                         if "ghost" in effectiveness: effectiveness["ghost"] *= 0.5
 
@@ -714,64 +763,18 @@ class DetailView(Gtk.ScrolledWindow):
             
             self.effectiveness_box.show_all()
         
-        GLib.idle_add(update_ui)
+        update_ui()
 
-    def _render_moves_section(self, parent_box, moves_list, method_id, method_label, gen_name, is_level_up):
-        method_title = Gtk.Label()
-        method_title.set_markup(f"<b>{method_label}</b>")
-        method_title.set_xalign(0)
-        parent_box.pack_start(method_title, False, False, 5)
-
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(2)
-        parent_box.pack_start(grid, False, False, 0)
-
-        headers = ["Lvl", "Move", "Type", "Cat", "Pwr", "Acc"] if is_level_up else ["Move", "Type", "Cat", "Pwr", "Acc"]
-        for i, h in enumerate(headers):
-            lbl = Gtk.Label(); lbl.set_markup(f"<i>{h}</i>"); lbl.set_xalign(0)
-            grid.attach(lbl, i, 0, 1, 1)
-
-        # Sort level-up moves by level
-        if is_level_up:
-            moves_list.sort(key=lambda x: x.level_learned_at)
-
-        for row_idx, pm in enumerate(moves_list):
-            move = pm.move
-            r = row_idx + 1
-            col = 0
-            if is_level_up:
-                grid.attach(Gtk.Label(label=str(pm.level_learned_at), xalign=0), col, r, 1, 1); col += 1
-            
-            grid.attach(Gtk.Label(label=move.name.replace('-',' ').capitalize(), xalign=0), col, r, 1, 1); col += 1
-            
-            type_color = TYPE_COLORS.get(move.type.name.lower(), "#444")
-            type_lbl = Gtk.Label()
-            type_lbl.set_markup(f"<span background='{type_color}' foreground='white'> {move.type.name.capitalize()} </span>")
-            grid.attach(type_lbl, col, r, 1, 1); col += 1
-            
-            # Move Category Icon
-            cat_icon = Gtk.Image()
-            cat_path = CATEGORY_ICONS.get(move.damage_class.lower())
-            if cat_path and os.path.exists(cat_path):
-                try:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(cat_path, 32, 14, True)
-                    cat_icon.set_from_pixbuf(pixbuf)
-                except Exception as e:
-                    print(f"Error loading local icon {cat_path}: {e}")
-                    cat_icon.set_from_icon_name("image-missing", Gtk.IconSize.MENU)
-            else:
-                cat_icon.set_from_icon_name("image-missing", Gtk.IconSize.MENU)
-            
-            cat_icon.set_tooltip_text(move.damage_class.capitalize())
-            grid.attach(cat_icon, col, r, 1, 1); col += 1
-            grid.attach(Gtk.Label(label=str(move.power) if move.power else "-", xalign=0), col, r, 1, 1); col += 1
-            grid.attach(Gtk.Label(label=str(move.accuracy) if move.accuracy else "-", xalign=0), col, r, 1, 1); col += 1
-        
-    def _load_evolutions(self, selected_generation):
+    def _load_evolutions(self, token, selected_generation):
         if not self.pokemon_data or not self.pokemon_data.evolution_chain_url: return
-        evo_data = _fetch_data(self.pokemon_data.evolution_chain_url)
-        if not evo_data: return
+        future = run_async(
+            client.get_evolution_chain(self.pokemon_data.evolution_chain_url),
+            token.guard(lambda evo_data: self._show_evolutions(token, selected_generation, evo_data)),
+        )
+        token.add_cancel_callback(future.cancel)
+
+    def _show_evolutions(self, token, selected_generation, evo_data):
+        if not self.pokemon_data or not evo_data: return
         
         max_id = GEN_MAX_ID.get(selected_generation, 2000)
 
@@ -849,8 +852,10 @@ class DetailView(Gtk.ScrolledWindow):
                 return None
 
             node = {
+                "id": species_id,
                 "name": chain["species"]["name"],
-                "sprite_url": f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{species_id}.png",
+                "species_url": chain["species"]["url"],
+                "sprite_url": get_sprite_url(species_id),
                 "details": parse_evolution_details(chain.get("evolution_details", []), selected_gen_num),
                 "evolves_to": []
             }
@@ -879,15 +884,18 @@ class DetailView(Gtk.ScrolledWindow):
             evo_img = Gtk.Image()
             inner_vbox.pack_start(evo_img, False, False, 0)
             
-            img_thread = threading.Thread(target=_load_image_in_thread, args=(evo_img, node["sprite_url"], img_size, img_size))
-            img_thread.daemon = True
-            img_thread.start()
+            load_image(evo_img, node["sprite_url"], img_size, img_size, group=token)
             
             name_lbl = Gtk.Label()
             name_lbl.set_markup(f"<span size='{font_size}'><b>{node['name'].capitalize()}</b></span>")
             inner_vbox.pack_start(name_lbl, False, False, 0)
             
-            vbox.pack_start(frame, False, False, 0)
+            # Following an evolution renders from the detail cache filled by the prefetcher
+            card_button = Gtk.Button()
+            card_button.set_relief(Gtk.ReliefStyle.NONE)
+            card_button.add(frame)
+            card_button.connect("clicked", lambda button: self.load_pokemon(node["id"], node["species_url"]))
+            vbox.pack_start(card_button, False, False, 0)
             return vbox
 
         def render_circular(node, parent_container):
@@ -980,37 +988,54 @@ class DetailView(Gtk.ScrolledWindow):
                     render_tree(evo, evo_row)
 
         def update_ui():
-            if not self.pokemon_data or not evo_tree: return
+            if not self.pokemon_data: return
             
             for child in self.evo_box.get_children():
                 self.evo_box.remove(child)
+            if not evo_tree: return
                 
             render_tree(evo_tree, self.evo_box)
             
             self.evo_box.show_all()
-            self.main_box.thaw_child_notify()
 
-        GLib.idle_add(update_ui)
+        update_ui()
+
+    def _load_varieties(self, token, species_url):
+        def query_varieties():
+            from ..data.database import get_session, get_stored_varieties
+            session = get_session()
+            try:
+                return get_stored_varieties(session, species_url)
+            except Exception as e:
+                print(f"Error loading varieties: {e}")
+                return []
+            finally:
+                session.close()
+
+        scheduler.submit(query_varieties, priority=PRIORITY_INTERACTIVE, token=token,
+                         callback=lambda varieties: self._show_varieties(token, species_url, varieties))
+
+    def _prefetch_evolution_members(self, token, evolution_chain_url):
+        # The chain response is cached too, so the Evolutions tab renders without a fetch later
+        future = run_async(
+            client.get_evolution_chain(evolution_chain_url),
+            token.guard(lambda evo_data: prefetch_details(evolution_species_ids(evo_data), token=token)),
+        )
+        token.add_cancel_callback(future.cancel)
 
-    def _load_varieties(self, species_url):
-        varieties = get_species_varieties(species_url)
+    def _show_varieties(self, token, species_url, varieties):
+        prefetch_details([p_id for p_id, _ in varieties or []], token=token)
         if not varieties or len(varieties) <= 1:
-            GLib.idle_add(lambda: self.forms_scroll.hide())
-            GLib.idle_add(lambda: self.forms_tab_label.hide())
+            self.forms_scroll.hide()
+            self.forms_tab_label.hide()
             return
         else:
-            GLib.idle_add(lambda: self.forms_scroll.show())
-            GLib.idle_add(lambda: self.forms_tab_label.show())
+            self.forms_scroll.show()
+            self.forms_tab_label.show()
 
         def on_variety_clicked(button, pokemon_id):
-            from ..data.database import get_session, update_pokemon_data
-            session = get_session()
-            pokemon = session.query(Pokemon).filter_by(id=pokemon_id).first()
-            if not pokemon:
-                pokemon = update_pokemon_data(session, pokemon_id)
-            session.close()
-            if pokemon:
-                GLib.idle_add(self.update_data, pokemon)
+            # The form's stub already exists locally; loading and any deep fetch happen off the main loop
+            self.load_pokemon(pokemon_id, species_url)
 
         def update_ui():
             for child in self.varieties_box.get_children():
@@ -1021,25 +1046,15 @@ class DetailView(Gtk.ScrolledWindow):
             flow.set_max_children_per_line(5)
             self.varieties_box.pack_start(flow, True, True, 0)
 
-            for variety in varieties:
-                p_url = variety["pokemon"]["url"]
-                p_id = int(p_url.split("/")[-2])
-                p_name = variety["pokemon"]["name"]
-                
-                # Derive form display name
-                species_name = self.pokemon_data.species_url.split("/")[-2]
-                # Sometimes species_url is a full name, sometimes ID. PokeAPI results vary.
-                # Let's use a simpler heuristic: variety name vs base name
-                # Actually we can just use the variety name and capitalize it
-                
+            for p_id, p_name in varieties:
                 btn = Gtk.Button()
                 btn_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
                 btn.add(btn_box)
                 
                 v_img = Gtk.Image()
                 btn_box.pack_start(v_img, False, False, 0)
-                sprite_url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{p_id}.png"
-                threading.Thread(target=_load_image_in_thread, args=(v_img, sprite_url, 48, 48)).start()
+                sprite_url = get_sprite_url(p_id)
+                load_image(v_img, sprite_url, 48, 48, group=token)
                 
                 # Try to make label short
                 display_name = p_name.capitalize()
@@ -1063,4 +1078,6 @@ class DetailView(Gtk.ScrolledWindow):
                 flow.add(btn)
             self.varieties_box.show_all()
 
-        GLib.idle_add(update_ui)
+        # The buttons and their sprites are only built once the Forms tab is opened
+        self._tab_renderers[self.forms_scroll] = update_ui
+        self._render_current_tabs()
@@ -1,12 +1,9 @@
 import gi
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GdkPixbuf, GLib, Pango
+from gi.repository import Gtk, GdkPixbuf, Pango
 import random
 from datetime import datetime
-import threading
-from ..data.database import get_session
-from ..data.models import Pokemon
-from ..utils import _load_image_in_thread
+from ..scheduler import scheduler, PRIORITY_INTERACTIVE
 
 class HomePage(Gtk.Box):
     def __init__(self, app_instance, *args, **kwargs):
@@ -61,31 +58,47 @@ class HomePage(Gtk.Box):
         sync_button.connect("clicked", self.on_sync_button_clicked)
         button_box.pack_start(sync_button, False, False, 0)
 
-        # Load Pokémon of the Day
-        threading.Thread(target=self.load_pokemon_of_the_day, daemon=True).start()
-
     def load_pokemon_of_the_day(self):
+        """Called by the app once the database is ready."""
+        scheduler.submit(self._query_pokemon_of_the_day, priority=PRIORITY_INTERACTIVE, callback=self._show_pokemon_of_the_day)
+
+    def _query_pokemon_of_the_day(self):
+        # Imported here so the home page can be shown before SQLAlchemy is loaded
+        from ..data.database import get_session
+        from ..data.models import Pokemon
+        from ..data.query_cache import query_cache
+
         # Use current date as seed for daily randomness
         seed = datetime.now().strftime("%Y%m%d")
-        random.seed(seed)
 
-        session = get_session()
+        def query():
+            session = get_session()
+            try:
+                count = session.query(Pokemon.id).count()
+                if count > 0:
+                    random_index = random.Random(seed).randint(0, count - 1)
+                    pokemon = session.query(Pokemon.name, Pokemon.artwork_url, Pokemon.sprite_url).order_by(Pokemon.id).offset(random_index).first()
+                    if pokemon:
+                        return pokemon.name.capitalize(), pokemon.artwork_url or pokemon.sprite_url
+            finally:
+                session.close()
+            return None
+
         try:
-            count = session.query(Pokemon).count()
-            if count > 0:
-                random_index = random.randint(0, count - 1)
-                pokemon = session.query(Pokemon).offset(random_index).first()
-                if pokemon:
-                    GLib.idle_add(self.update_potd_ui, pokemon.name.capitalize(), pokemon.artwork_url or pokemon.sprite_url)
+            return query_cache.get_or_compute(("pokemon-of-the-day", seed), query)
         except Exception as e:
             print(f"Error loading Pokémon of the Day: {e}")
-        finally:
-            session.close()
+            return None
+
+    def _show_pokemon_of_the_day(self, result):
+        if result:
+            self.update_potd_ui(*result)
 
     def update_potd_ui(self, name, image_url):
         self.potd_name_label.set_markup(f"<span size='x-large' weight='semibold'>{name}</span>")
         if image_url:
-            _load_image_in_thread(self.potd_image, image_url, 256, 256)
+            from ..utils import load_image
+            load_image(self.potd_image, image_url, 256, 256)
 
     def on_start_button_clicked(self, button):
         self.app_instance.show_main_window()
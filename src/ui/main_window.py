@@ -1,28 +1,60 @@
 import gi
-import threading
 from typing import List, Optional, Any
-from sqlalchemy.orm import joinedload
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GdkPixbuf, GLib, Gio
+from gi.repository import Gtk, GdkPixbuf, GLib, Gio, GObject
 
 # Import the image loading function from utils.py
-from ..utils import _load_image_in_thread, image_executor
+from ..utils import image_queue, set_cached_image, get_atlas_pixbuf, PRIORITY_VISIBLE, PRIORITY_OFFSCREEN
 
 from .detail_view import DetailView
-from ..data.database import is_pokemon_data_complete, update_pokemon_data, get_session
-from ..data.models import Pokemon, PokemonType, PokemonAbility, PokemonMove, Move
+from ..data.models import Pokemon
 
 from ..config import (
     ITEMS_PER_PAGE,
+    DETAIL_PREFETCH_NEIGHBOURS,
+    POKEMON_LIST_MAX_WINDOWS,
+    POKEMON_LIST_LOAD_THRESHOLD_PX,
+    POKEMON_LIST_FILTER_MAX_VALUE,
     POKEMON_LIST_ICON_WIDTH,
     POKEMON_LIST_ICON_HEIGHT,
+    POKEMON_LIST_ROW_HEIGHT,
     SIDEBAR_WIDTH_REQUEST
 )
 
+# Image queue group shared by all list rows and next-page prefetches
+LIST_IMAGE_GROUP = "pokemon-list"
+
+# List orders offered in the sidebar; every key but "id" lists the highest values first
+SORT_OPTIONS = [
+    ("id", "Number"),
+    ("base_stat_total", "Base Stat Total"),
+    ("hp", "HP"),
+    ("attack", "Attack"),
+    ("defense", "Defense"),
+    ("special_attack", "Sp. Atk"),
+    ("special_defense", "Sp. Def"),
+    ("speed", "Speed"),
+    ("height", "Height"),
+    ("weight", "Weight"),
+]
+
+class PokemonListEntry(GObject.Object):
+    """Item of the list model: the few fields a row shows, detached from the DB session."""
+
+    def __init__(self, pokemon: Pokemon, index: int) -> None:
+        super().__init__()
+        self.id = pokemon.id
+        self.name = pokemon.name
+        self.sprite_url = pokemon.sprite_url
+        self.species_url = pokemon.species_url
+        self.index = index  # Position in the full search result
+
+
 class PokemonListItem(Gtk.ListBoxRow):
-    def __init__(self, pokemon_data: Pokemon) -> None:
+    def __init__(self, pokemon_data: PokemonListEntry, priority: int = PRIORITY_VISIBLE) -> None:
         super().__init__()
         self.pokemon_data = pokemon_data
+        self.connect("destroy", self._on_destroy)
 
         hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         hbox.set_border_width(5)
@@ -32,13 +64,25 @@ class PokemonListItem(Gtk.ListBoxRow):
         self.image = Gtk.Image()
         hbox.pack_start(self.image, False, False, 0)
         
-        # Load image in a background thread
-        image_executor.submit(_load_image_in_thread, self.image, pokemon_data.sprite_url, POKEMON_LIST_ICON_WIDTH, POKEMON_LIST_ICON_HEIGHT)
+        # Sprites packed in the atlas or shown before are set right away; others are queued
+        # and re-prioritized as the row scrolls in and out of view
+        self.image_job = None
+        atlas_pixbuf = get_atlas_pixbuf(pokemon_data.id)
+        if atlas_pixbuf:
+            self.image.set_from_pixbuf(atlas_pixbuf)
+        elif not set_cached_image(self.image, pokemon_data.sprite_url, POKEMON_LIST_ICON_WIDTH, POKEMON_LIST_ICON_HEIGHT):
+            self.image_job = image_queue.submit(self.image, pokemon_data.sprite_url, POKEMON_LIST_ICON_WIDTH, POKEMON_LIST_ICON_HEIGHT,
+                                                priority=priority, group=LIST_IMAGE_GROUP)
 
         label = Gtk.Label(label=pokemon_data.name.capitalize())
         label.set_xalign(0)
         hbox.pack_start(label, True, True, 0)
 
+    def _on_destroy(self, widget: Gtk.Widget) -> None:
+        # Rows scrolled out of the model window must not keep their sprite in the queue
+        if self.image_job:
+            self.image_job.cancel()
+
 
 class MainWindow(Gtk.Box):
     def __init__(self, app_instance: Any, *args: Any, **kwargs: Any) -> None:
@@ -64,13 +108,58 @@ class MainWindow(Gtk.Box):
         self.search_entry.connect("search-changed", self.app_instance.on_search_changed)
         self.sidebar.pack_start(self.search_entry, False, False, 0)
 
+        self.sort_combo = Gtk.ComboBoxText()
+        for sort_key, label in SORT_OPTIONS:
+            self.sort_combo.append(sort_key, f"Sort by {label}")
+        self.sort_combo.set_active_id("id")
+        self.sort_combo.set_margin_start(10)
+        self.sort_combo.set_margin_end(10)
+        self.sort_combo.connect("changed", lambda combo: self.app_instance.set_sort_key(combo.get_active_id()))
+        self.sidebar.pack_start(self.sort_combo, False, False, 0)
+
+        # Range filter over one sortable column; 0 and the spin buttons' maximum leave that end open
+        self.filter_combo = Gtk.ComboBoxText()
+        self.filter_combo.append("", "No filter")
+        for sort_key, label in SORT_OPTIONS[1:]:
+            self.filter_combo.append(sort_key, f"Filter by {label}")
+        self.filter_combo.set_active_id("")
+        self.filter_combo.set_margin_start(10)
+        self.filter_combo.set_margin_end(10)
+        self.sidebar.pack_start(self.filter_combo, False, False, 0)
+
+        filter_range_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        filter_range_box.set_margin_start(10)
+        filter_range_box.set_margin_end(10)
+        self.filter_min = Gtk.SpinButton.new_with_range(0, POKEMON_LIST_FILTER_MAX_VALUE, 1)
+        self.filter_max = Gtk.SpinButton.new_with_range(0, POKEMON_LIST_FILTER_MAX_VALUE, 1)
+        self.filter_max.set_value(POKEMON_LIST_FILTER_MAX_VALUE)
+        filter_range_box.pack_start(self.filter_min, True, True, 0)
+        filter_range_box.pack_start(Gtk.Label(label="to"), False, False, 0)
+        filter_range_box.pack_start(self.filter_max, True, True, 0)
+        self.sidebar.pack_start(filter_range_box, False, False, 0)
+        self._filter_column: Optional[str] = None
+        self.filter_combo.connect("changed", self._on_filter_changed)
+        for spin_button in (self.filter_min, self.filter_max):
+            spin_button.set_sensitive(False)
+            spin_button.connect("value-changed", self._on_filter_changed)
+
         # ListBox for Pokemon results in a scrolled window
         scrolled_window = Gtk.ScrolledWindow()
         scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         self.sidebar.pack_start(scrolled_window, True, True, 0)
+        self.list_adjustment = scrolled_window.get_vadjustment()
+        self.list_adjustment.connect("value-changed", self._on_list_scrolled)
+
+        # The model only ever holds a few windows of the result, so the number of row
+        # widgets stays the same however large the dex is or wherever the list is scrolled
+        self.pokemon_store = Gio.ListStore.new(PokemonListEntry)
+        self.list_offset: int = 0  # Result index of the first item in the model
+        self.total_pokemon_count: int = 0
+        self._window_loading: bool = False
 
         self.pokemon_list_box = Gtk.ListBox()
         self.pokemon_list_box.set_selection_mode(Gtk.SelectionMode.SINGLE)
+        self.pokemon_list_box.bind_model(self.pokemon_store, self._create_pokemon_row)
         self.pokemon_list_box.connect("row-activated", self.on_pokemon_selected)
         scrolled_window.add(self.pokemon_list_box)
 
@@ -86,110 +175,127 @@ class MainWindow(Gtk.Box):
         self.detail_view = DetailView()
         self.pack_start(self.detail_view, True, True, 0)
 
-        # Pagination attributes
-        self.current_page: int = 1
-        self.items_per_page: int = ITEMS_PER_PAGE  # Increased for better use of space
-        self.total_pokemon_count: int = 0
-
-        # Pagination controls
-        self.pagination_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
-        self.pagination_box.set_halign(Gtk.Align.CENTER)
-        self.sidebar.pack_end(self.pagination_box, False, False, 10)
-
-        self.first_button = Gtk.Button.new_from_icon_name("go-first-symbolic", Gtk.IconSize.BUTTON)
-        self.first_button.connect("clicked", self.on_first_page)
-        self.pagination_box.pack_start(self.first_button, False, False, 0)
-
-        self.prev_button = Gtk.Button.new_from_icon_name("go-previous-symbolic", Gtk.IconSize.BUTTON)
-        self.prev_button.connect("clicked", self.on_prev_page)
-        self.pagination_box.pack_start(self.prev_button, False, False, 0)
-
-        self.page_label = Gtk.Label(label="1/1")
-        self.page_label.set_margin_start(5)
-        self.page_label.set_margin_end(5)
-        self.pagination_box.pack_start(self.page_label, False, False, 0)
-
-        self.next_button = Gtk.Button.new_from_icon_name("go-next-symbolic", Gtk.IconSize.BUTTON)
-        self.next_button.connect("clicked", self.on_next_page)
-        self.pagination_box.pack_start(self.next_button, False, False, 0)
-
-        self.last_button = Gtk.Button.new_from_icon_name("go-last-symbolic", Gtk.IconSize.BUTTON)
-        self.last_button.connect("clicked", self.on_last_page)
-        self.pagination_box.pack_start(self.last_button, False, False, 0)
-
     def toggle_sidebar(self) -> None:
         is_revealed = self.sidebar_revealer.get_reveal_child()
         self.sidebar_revealer.set_reveal_child(not is_revealed)
 
+    def _on_filter_changed(self, widget: Gtk.Widget) -> None:
+        column = self.filter_combo.get_active_id() or None
+        previous_column, self._filter_column = self._filter_column, column
+        self.filter_min.set_sensitive(column is not None)
+        self.filter_max.set_sensitive(column is not None)
+        minimum = maximum = None
+        if column:
+            minimum = self.filter_min.get_value_as_int() or None
+            maximum = self.filter_max.get_value_as_int()
+            maximum = maximum if maximum < POKEMON_LIST_FILTER_MAX_VALUE else None
+        if previous_column or column:
+            # One call, so switching columns never shows the unfiltered list in between
+            self.app_instance.replace_filter(previous_column, column, minimum, maximum)
+
     def on_pokemon_selected(self, listbox: Gtk.ListBox, row: Gtk.ListBoxRow) -> None:
         if isinstance(row, PokemonListItem):
             pokemon_data = row.pokemon_data
-            
-            # Use a thread to check and update/show pokemon
-            def check_and_show() -> None:
-                session = get_session()
-                try:
-                    # Re-fetch pokemon with relations
-                    pokemon = session.query(Pokemon).options(
-                        joinedload(Pokemon.region),
-                        joinedload(Pokemon.types).joinedload(PokemonType.type),
-                        joinedload(Pokemon.abilities).joinedload(PokemonAbility.ability),
-                        joinedload(Pokemon.moves).joinedload(PokemonMove.move).joinedload(Move.type)
-                    ).filter(Pokemon.id == pokemon_data.id).first()
-
-                    if not is_pokemon_data_complete(pokemon):
-                        pokemon = update_pokemon_data(session, pokemon.id)
-                    
-                    if pokemon:
-                        GLib.idle_add(self.detail_view.update_data, pokemon)
-                except Exception as e:
-                    print(f"Error loading pokemon details: {e}")
-                finally:
-                    session.close()
-
-            threading.Thread(target=check_and_show, daemon=True).start()
-
-    def update_pokemon_list(self, pokemon_data_list: List[Pokemon], total_count: int) -> None:
-        # Clear existing list
-        self.pokemon_list_box.foreach(lambda row: self.pokemon_list_box.remove(row))
+            self.detail_view.load_pokemon(pokemon_data.id, pokemon_data.species_url)
+
+            # Moving up or down the list then renders from the detail cache
+            index = row.get_index()
+            n_items = self.pokemon_store.get_n_items()
+            neighbours = []
+            for distance in range(1, DETAIL_PREFETCH_NEIGHBOURS + 1):
+                for neighbour_index in (index - distance, index + distance):
+                    if 0 <= neighbour_index < n_items:
+                        neighbours.append(self.pokemon_store.get_item(neighbour_index).id)
+            self.detail_view.prefetch(neighbours)
+
+    def _create_pokemon_row(self, entry: PokemonListEntry) -> PokemonListItem:
+        # Rows inside the viewport get their sprites first, the rest of the window after them
+        first_visible = self.list_offset + int(self.list_adjustment.get_value() // self._row_height())
+        in_view = first_visible <= entry.index < first_visible + self._estimate_visible_rows()
+        row = PokemonListItem(entry, PRIORITY_VISIBLE if in_view else PRIORITY_OFFSCREEN)
+        row.show_all()
+        return row
+
+    def reset_pokemon_list(self) -> None:
+        # Drop pending sprite loads of the previous search before queueing the new one
+        image_queue.cancel_group(LIST_IMAGE_GROUP)
+        self.pokemon_store.remove_all()
+        self.list_offset = 0
+        self.total_pokemon_count = 0
+        self._window_loading = True
+        self.list_adjustment.set_value(0)
+
+    def add_pokemon_window(self, offset: int, prepend: bool, pokemon_data_list: List[Pokemon], total_count: int, next_window_urls: Optional[List[str]] = None) -> None:
         self.total_pokemon_count = total_count
+        entries = [PokemonListEntry(pokemon, offset + i) for i, pokemon in enumerate(pokemon_data_list)]
+        max_items = ITEMS_PER_PAGE * POKEMON_LIST_MAX_WINDOWS
+        row_height = self._row_height()
+        scroll_value = self.list_adjustment.get_value()
+
+        if prepend:
+            self.pokemon_store.splice(0, 0, entries)
+            self.list_offset = offset
+            excess = self.pokemon_store.get_n_items() - max_items
+            if excess > 0:
+                self.pokemon_store.splice(max_items, excess, [])
+            scroll_value += len(entries) * row_height
+        else:
+            self.pokemon_store.splice(self.pokemon_store.get_n_items(), 0, entries)
+            excess = self.pokemon_store.get_n_items() - max_items
+            if excess > 0:
+                self.pokemon_store.splice(0, excess, [])
+                self.list_offset += excess
+                scroll_value -= excess * row_height
+            # Warm the disk cache for the next window behind everything in this one
+            for url in next_window_urls or []:
+                image_queue.prefetch(url, group=LIST_IMAGE_GROUP)
+
+        if scroll_value != self.list_adjustment.get_value():
+            # Keep the rows under the pointer in place; runs after the list is re-laid out
+            GLib.idle_add(self._restore_scroll, scroll_value)
+        else:
+            self._window_loading = False
 
-        # Add new items
-        for pokemon_data in pokemon_data_list:
-            item = PokemonListItem(pokemon_data)
-            self.pokemon_list_box.add(item)
-        
         self.spinner.stop()
         self.spinner.hide()
-        self.pokemon_list_box.show_all()
-        self._update_pagination_ui()
-
-    def _update_pagination_ui(self) -> None:
-        total_pages = (self.total_pokemon_count + self.items_per_page - 1) // self.items_per_page
-        self.page_label.set_text(f"{self.current_page} / {max(1, total_pages)}")
-        self.first_button.set_sensitive(self.current_page > 1)
-        self.prev_button.set_sensitive(self.current_page > 1)
-        self.next_button.set_sensitive(self.current_page < total_pages)
-        self.last_button.set_sensitive(self.current_page < total_pages)
-
-    def on_first_page(self, button: Gtk.Button) -> None:
-        if self.current_page != 1:
-            self.current_page = 1
-            self.app_instance.on_search_changed(self.search_entry)
-
-    def on_prev_page(self, button: Gtk.Button) -> None:
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.app_instance.on_search_changed(self.search_entry)
-
-    def on_next_page(self, button: Gtk.Button) -> None:
-        total_pages = (self.total_pokemon_count + self.items_per_page - 1) // self.items_per_page
-        if self.current_page < total_pages:
-            self.current_page += 1
-            self.app_instance.on_search_changed(self.search_entry)
-
-    def on_last_page(self, button: Gtk.Button) -> None:
-        total_pages = (self.total_pokemon_count + self.items_per_page - 1) // self.items_per_page
-        if self.current_page != total_pages:
-            self.current_page = total_pages
-            self.app_instance.on_search_changed(self.search_entry)
+
+    def _restore_scroll(self, value: float) -> bool:
+        self.list_adjustment.set_value(value)
+        self._window_loading = False
+        return False
+
+    def _row_height(self) -> int:
+        row = self.pokemon_list_box.get_row_at_index(0)
+        height = row.get_allocated_height() if row else 0
+        return height if height > 1 else POKEMON_LIST_ROW_HEIGHT
+
+    def _estimate_visible_rows(self) -> int:
+        page_size = self.list_adjustment.get_page_size()
+        if page_size <= 0:
+            page_size = self.get_allocated_height()
+        return max(1, int(page_size // self._row_height()) + 1)
+
+    def _on_list_scrolled(self, adjustment: Gtk.Adjustment) -> None:
+        top = adjustment.get_value()
+        bottom = top + adjustment.get_page_size()
+        changes = []
+        for row in self.pokemon_list_box.get_children():
+            if not isinstance(row, PokemonListItem) or not row.image_job or row.image_job.done:
+                continue
+            allocation = row.get_allocation()
+            in_view = allocation.y + allocation.height >= top and allocation.y <= bottom
+            changes.append((row.image_job, PRIORITY_VISIBLE if in_view else PRIORITY_OFFSCREEN))
+        # One heap rebuild per scroll event rather than one per row
+        image_queue.reprioritize_many(changes)
+
+        # Infinite scroll: load the next window near the bottom, the previous one near the top
+        if self._window_loading:
+            return
+        loaded_end = self.list_offset + self.pokemon_store.get_n_items()
+        if bottom >= adjustment.get_upper() - POKEMON_LIST_LOAD_THRESHOLD_PX and loaded_end < self.total_pokemon_count:
+            self._window_loading = True
+            self.app_instance.load_pokemon_window(loaded_end, ITEMS_PER_PAGE)
+        elif top <= POKEMON_LIST_LOAD_THRESHOLD_PX and self.list_offset > 0:
+            start = max(0, self.list_offset - ITEMS_PER_PAGE)
+            self._window_loading = True
+            self.app_instance.load_pokemon_window(start, self.list_offset - start, prepend=True)
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import deque
+
+from .config import UI_DISPATCH_MAX_PER_FRAME, UI_DISPATCH_FRAME_BUDGET_MS
+
+
+class UIDispatcher:
+    """Applies widget updates posted from any thread in batches, at most one per frame.
+
+    Updates run in the frame clock's update phase, before layout, so a page full of
+    finished image loads causes one relayout instead of one per image. Each frame runs
+    at most UI_DISPATCH_MAX_PER_FRAME updates or UI_DISPATCH_FRAME_BUDGET_MS of work;
+    the rest wait for the next frame. Until a window is attached and realized,
+    updates are applied from an idle callback instead.
+    """
+
+    def __init__(self, max_per_frame=UI_DISPATCH_MAX_PER_FRAME, budget_ms=UI_DISPATCH_FRAME_BUDGET_MS, schedule=None):
+        self.max_per_frame = max_per_frame
+        self.budget = budget_ms / 1000
+        self._schedule = schedule or self._schedule_frame
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._widget = None
+        self._frame_clock = None
+
+    def attach(self, widget):
+        """Uses the frame clock of `widget` (normally the application window)."""
+        self._widget = widget
+
+    def post(self, func, *args):
+        """Queues `func(*args)` to run on the GTK main thread with the next batch."""
+        with self._lock:
+            self._pending.append((func, args))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule()
+
+    def flush(self):
+        """Runs one frame's worth of updates. Returns True while more are pending."""
+        deadline = time.perf_counter() + self.budget
+        for _ in range(self.max_per_frame):
+            with self._lock:
+                if not self._pending:
+                    self._scheduled = False
+                    return False
+                func, args = self._pending.popleft()
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Error in UI update {getattr(func, '__name__', func)}: {e}")
+            if time.perf_counter() > deadline:
+                break
+        with self._lock:
+            if not self._pending:
+                self._scheduled = False
+                return False
+        return True
+
+    def _schedule_frame(self):
+        # Safe from any thread; the frame clock itself is only touched on the main thread
+        from gi.repository import GLib
+        GLib.idle_add(self._request_frame)
+
+    def _request_frame(self):
+        from gi.repository import Gdk
+        frame_clock = self._widget.get_frame_clock() if self._widget else None
+        if frame_clock is None:
+            # Nothing on screen to sync with yet: keep going from idle
+            return self.flush()
+        if frame_clock is not self._frame_clock:
+            self._frame_clock = frame_clock
+            frame_clock.connect("update", self._on_update)
+        frame_clock.request_phase(Gdk.FrameClockPhase.UPDATE)
+        return False
+
+    def _on_update(self, frame_clock):
+        from gi.repository import Gdk
+        if self.flush():
+            frame_clock.request_phase(Gdk.FrameClockPhase.UPDATE)
+
+
+ui_dispatcher = UIDispatcher()
@@ -1,50 +1,332 @@
 import gi
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GdkPixbuf, GLib, Gio
+from gi.repository import Gtk, GdkPixbuf, GLib
 import requests
-from io import BytesIO
 import threading
 import os
-import hashlib
-from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
 
-CACHE_DIR = os.path.expanduser("~/.cache/archdex/images")
-image_executor = ThreadPoolExecutor(max_workers=4)
+from .cache import LRUCache
+from .ui_dispatcher import ui_dispatcher
+from .data.http import transport
+from .image_cache import image_cache, thumbnail_cache
+from .sprite_atlas import SpriteAtlas, write_atlas
+from .config import (
+    CACHE_DIR as APP_CACHE_DIR,
+    IMAGE_LOADER_WORKERS,
+    POKEMON_LIST_ICON_WIDTH,
+    POKEMON_LIST_ICON_HEIGHT,
+    PIXBUF_CACHE_MAX_BYTES,
+    THUMBNAIL_SIZES
+)
 
-def get_cache_path(url):
-    if not url:
+# Packed RGBA list sprites, built during sync and memory-mapped on first use
+SPRITE_ATLAS_PATH = os.path.join(APP_CACHE_DIR, f"sprites-{POKEMON_LIST_ICON_WIDTH}x{POKEMON_LIST_ICON_HEIGHT}.atlas")
+_sprite_atlas = None
+_sprite_atlas_checked = False
+_sprite_atlas_lock = threading.Lock()
+
+# Decoded, scaled pixbufs keyed by (url, width, height), shared by every widget
+pixbuf_cache = LRUCache(max_bytes=PIXBUF_CACHE_MAX_BYTES, sizeof=lambda pixbuf: pixbuf.get_byte_length())
+
+# Image job priorities, lower is served first
+PRIORITY_VISIBLE = 0     # Rows currently inside the viewport
+PRIORITY_OFFSCREEN = 1   # Rows of the current page that are scrolled out of view
+PRIORITY_PREFETCH = 2    # Downloads for the next page, no widget attached
+
+def get_thumbnail_key(url, width, height):
+    """Returns the thumbnail cache key of `url` at a size, or None for sizes without a thumbnail tier."""
+    if not url or width != height or width not in THUMBNAIL_SIZES:
+        return None
+    return f"{width}x{height}:{url}"
+
+def _decode_at_size(image_data, width, height):
+    """Decodes image bytes straight at the target size instead of decoding in full and scaling."""
+    loader = GdkPixbuf.PixbufLoader()
+    loader.connect("size-prepared", lambda pixbuf_loader, w, h: pixbuf_loader.set_size(width, height))
+    try:
+        loader.write(image_data)
+    finally:
+        loader.close()
+    return loader.get_pixbuf()
+
+def _load_scaled_pixbuf(url, width, height, job=None):
+    """Returns the pixbuf for `url` at the given size from the thumbnail tier or the original.
+
+    Returns None if `job` was cancelled while the original was being fetched.
+    """
+    thumbnail_key = get_thumbnail_key(url, width, height)
+    thumbnail_path = thumbnail_cache.get_path(thumbnail_key) if thumbnail_key else None
+    if thumbnail_path:
+        try:
+            return GdkPixbuf.Pixbuf.new_from_file(thumbnail_path)
+        except GLib.Error as e:
+            print(f"Discarding unreadable thumbnail {thumbnail_path}: {e}")
+            thumbnail_cache.discard(thumbnail_key)
+
+    image_data = _read_image_data(url)
+    # The row may have been removed while we were downloading
+    if job and job.cancelled:
+        return None
+
+    pixbuf = _decode_at_size(image_data, width, height)
+    if thumbnail_key:
+        _, thumbnail_data = pixbuf.save_to_bufferv("png", [], [])
+        thumbnail_cache.put(thumbnail_key, thumbnail_data)
+    return pixbuf
+
+def _read_image_data(url):
+    """Returns the raw bytes for an image URL, downloading it into the disk cache if needed."""
+    image_data = image_cache.get(url)
+    if image_data is not None:
+        return image_data
+
+    response = transport.get(url, timeout=10)
+    response.raise_for_status()
+    image_data = response.content
+    image_cache.put(url, image_data)
+    return image_data
+
+def _get_sprite_atlas():
+    global _sprite_atlas, _sprite_atlas_checked
+    with _sprite_atlas_lock:
+        if not _sprite_atlas_checked:
+            _sprite_atlas_checked = True
+            if os.path.exists(SPRITE_ATLAS_PATH):
+                try:
+                    _sprite_atlas = SpriteAtlas(SPRITE_ATLAS_PATH)
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring unusable sprite atlas {SPRITE_ATLAS_PATH}: {e}")
+        return _sprite_atlas
+
+def get_atlas_pixbuf(pokemon_id):
+    """Returns the list sprite of a Pokemon from the sprite atlas, or None if it isn't packed.
+
+    No file is opened and nothing is decoded: the RGBA data is read from the mapping.
+    """
+    atlas = _get_sprite_atlas()
+    if atlas is None:
         return None
-    hashed_url = hashlib.md5(url.encode()).hexdigest()
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    return os.path.join(CACHE_DIR, hashed_url)
+    with _sprite_atlas_lock:
+        # A rebuild may have closed this mapping in the meantime
+        if atlas is not _sprite_atlas:
+            return None
+        view = atlas.get(pokemon_id)
+        if view is None:
+            return None
+        with view:
+            pixel_bytes = GLib.Bytes.new(view.tobytes())
+    return GdkPixbuf.Pixbuf.new_from_bytes(pixel_bytes, GdkPixbuf.Colorspace.RGB, True, 8,
+                                           atlas.width, atlas.height, atlas.rowstride)
+
+def _pixbuf_rgba(pixbuf):
+    """Returns tightly packed RGBA bytes for a pixbuf, adding an alpha channel if needed."""
+    if not pixbuf.get_has_alpha():
+        pixbuf = pixbuf.add_alpha(False, 0, 0, 0)
+    width, height, rowstride = pixbuf.get_width(), pixbuf.get_height(), pixbuf.get_rowstride()
+    pixels = pixbuf.get_pixels()
+    row_bytes = width * 4
+    if rowstride == row_bytes:
+        return bytes(pixels[:row_bytes * height])
+    return b"".join(pixels[y * rowstride:y * rowstride + row_bytes] for y in range(height))
+
+def rebuild_sprite_atlas(sprites, progress_callback=None):
+    """Packs the list sprites of `(pokemon_id, sprite_url)` pairs into the sprite atlas.
+
+    Sprites missing from the image cache are first downloaded in parallel by
+    prefetch_images (nothing, after a sync with the images stage). Packing then only
+    reads the thumbnail tier and the image cache; sprites that couldn't be fetched
+    are left out and load through the image queue as before.
+    """
+    global _sprite_atlas, _sprite_atlas_checked
+    from .data.prefetch import prefetch_images
+    width, height = POKEMON_LIST_ICON_WIDTH, POKEMON_LIST_ICON_HEIGHT
+    total = len(sprites)
+    prefetch_images([sprite_url for _, sprite_url in sprites], progress_callback=progress_callback)
+
+    def rgba_sprites():
+        for i, (pokemon_id, sprite_url) in enumerate(sprites):
+            if progress_callback and i % 100 == 0:
+                progress_callback(i, total)
+            thumbnail_key = get_thumbnail_key(sprite_url, width, height)
+            if sprite_url not in image_cache and (thumbnail_key is None or thumbnail_key not in thumbnail_cache):
+                continue
+            try:
+                pixbuf = _load_scaled_pixbuf(sprite_url, width, height)
+                yield pokemon_id, _pixbuf_rgba(pixbuf)
+            except Exception as e:
+                print(f"Skipping sprite {pokemon_id} for atlas: {e}")
+
+    count = write_atlas(SPRITE_ATLAS_PATH, width, height, rgba_sprites())
+    with _sprite_atlas_lock:
+        # Pixbufs handed out earlier own copies of their pixels, so the old mapping can go
+        if _sprite_atlas is not None:
+            _sprite_atlas.close()
+        _sprite_atlas = None
+        _sprite_atlas_checked = False
+    print(f"Sprite atlas rebuilt with {count} sprites at {SPRITE_ATLAS_PATH}")
+    return count
 
-def _load_image_in_thread(image_widget, url, width, height):
+def start_cache_maintenance():
+    """Repairs both image cache tiers in a background thread (stale temp files, corrupt entries)."""
+    def repair():
+        for cache in (image_cache, thumbnail_cache):
+            try:
+                removed = cache.repair()
+                if removed:
+                    print(f"Image cache repair removed {removed} entries from {cache.root}")
+            except Exception as e:
+                print(f"Error repairing image cache {cache.root}: {e}")
+    threading.Thread(target=repair, daemon=True).start()
+
+def _post_image_update(job, setter, *args):
+    # Checked again on the main thread: the job's view may have moved on while this waited
+    def apply():
+        if job is None or not job.cancelled:
+            setter(*args)
+    ui_dispatcher.post(apply)
+
+def _load_image_in_thread(image_widget, url, width, height, job=None):
     if not url:
         print("Warning: No URL provided for image loading.")
-        GLib.idle_add(image_widget.set_from_icon_name, "image-missing", Gtk.IconSize.DIALOG)
+        _post_image_update(job, image_widget.set_from_icon_name, "image-missing", Gtk.IconSize.DIALOG)
         return
     try:
-        cache_path = get_cache_path(url)
-        if cache_path and os.path.exists(cache_path):
-            with open(cache_path, "rb") as f:
-                image_data = f.read()
-        else:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            image_data = response.content
-            if cache_path:
-                with open(cache_path, "wb") as f:
-                    f.write(image_data)
-
-        bytes_io = BytesIO(image_data)
-        input_stream = Gio.MemoryInputStream.new_from_bytes(GLib.Bytes.new(bytes_io.read()))
-        pixbuf = GdkPixbuf.Pixbuf.new_from_stream(input_stream, None)
-        scaled_pixbuf = pixbuf.scale_simple(width, height, GdkPixbuf.InterpType.BILINEAR)
-        GLib.idle_add(image_widget.set_from_pixbuf, scaled_pixbuf)
+        cache_key = (url, width, height)
+        # Jobs are only queued after a miss in set_cached_image, which already counted it
+        scaled_pixbuf = pixbuf_cache.peek(cache_key)
+        if scaled_pixbuf is None:
+            scaled_pixbuf = _load_scaled_pixbuf(url, width, height, job)
+            if scaled_pixbuf is None:
+                return
+            pixbuf_cache.put(cache_key, scaled_pixbuf)
+        _post_image_update(job, image_widget.set_from_pixbuf, scaled_pixbuf)
     except (requests.exceptions.RequestException, IOError) as e:
         print(f"Error loading image from {url}: {e}")
-        GLib.idle_add(image_widget.set_from_icon_name, "image-missing", Gtk.IconSize.MENU)
+        _post_image_update(job, image_widget.set_from_icon_name, "image-missing", Gtk.IconSize.MENU)
     except Exception as e:
         print(f"Error processing image: {e}")
-        GLib.idle_add(image_widget.set_from_icon_name, "image-missing", Gtk.IconSize.MENU)
+        _post_image_update(job, image_widget.set_from_icon_name, "image-missing", Gtk.IconSize.MENU)
+
+def set_cached_image(image_widget, url, width, height):
+    """Sets an already decoded pixbuf on `image_widget`. Returns False on a cache miss."""
+    pixbuf = pixbuf_cache.get((url, width, height)) if url else None
+    if pixbuf is None:
+        return False
+    image_widget.set_from_pixbuf(pixbuf)
+    return True
+
+def load_image(image_widget, url, width, height, group=None):
+    """Shows an image from the pixbuf cache right away, or queues it on the image loaders.
+
+    Pass a `group` (e.g. a view's CancelToken) to be able to drop the load with `cancel_group`.
+    """
+    if set_cached_image(image_widget, url, width, height):
+        return None
+    return image_queue.submit(image_widget, url, width, height, PRIORITY_VISIBLE, group)
+
+
+class ImageJob:
+    """A queued image load. Cancelled jobs are skipped, or dropped after their download."""
+
+    def __init__(self, image_widget, url, width, height, priority, group, seq):
+        self.image_widget = image_widget
+        self.url = url
+        self.width = width
+        self.height = height
+        self.priority = priority
+        self.group = group
+        self.seq = seq
+        self.cancelled = False
+        self.done = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class ImageLoadQueue:
+    """Serves image loads from a priority heap with a fixed number of worker threads.
+
+    Jobs can be cancelled individually or per group (e.g. all rows of the Pokemon
+    list) and re-prioritized while pending, so that rows inside the viewport are
+    always loaded before off-screen rows and next-page prefetches. Cancelling a group
+    also cancels its jobs already being loaded, so their results are never shown.
+    """
+
+    def __init__(self, max_workers=IMAGE_LOADER_WORKERS):
+        self._heap = []
+        self._condition = threading.Condition()
+        self._counter = itertools.count()
+        self._max_workers = max_workers
+        self._workers = []
+        self._running = set()
+
+    def submit(self, image_widget, url, width=0, height=0, priority=PRIORITY_VISIBLE, group=None):
+        job = ImageJob(image_widget, url, width, height, priority, group, next(self._counter))
+        with self._condition:
+            heapq.heappush(self._heap, job)
+            self._ensure_workers()
+            self._condition.notify()
+        return job
+
+    def prefetch(self, url, group=None):
+        """Queues a download of `url` into the disk cache without decoding it."""
+        return self.submit(None, url, priority=PRIORITY_PREFETCH, group=group)
+
+    def reprioritize(self, job, priority):
+        self.reprioritize_many([(job, priority)])
+
+    def reprioritize_many(self, changes):
+        """Applies (job, priority) pairs with one heap rebuild, however many jobs changed."""
+        with self._condition:
+            changed = False
+            for job, priority in changes:
+                if job.done or job.cancelled or job.priority == priority:
+                    continue
+                job.priority = priority
+                changed = True
+            if changed:
+                heapq.heapify(self._heap)
+
+    def cancel_group(self, group):
+        with self._condition:
+            for job in (*self._heap, *self._running):
+                if job.group == group:
+                    job.cancel()
+            self._heap = [job for job in self._heap if not job.cancelled]
+            heapq.heapify(self._heap)
+
+    def _ensure_workers(self):
+        # Called with the condition held
+        if len(self._workers) < self._max_workers and len(self._heap) > 0:
+            worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                job = heapq.heappop(self._heap)
+                if job.cancelled:
+                    continue
+                self._running.add(job)
+            try:
+                if job.image_widget is None:
+                    if job.url:
+                        _read_image_data(job.url)
+                else:
+                    _load_image_in_thread(job.image_widget, job.url, job.width, job.height, job)
+            except Exception as e:
+                print(f"Error prefetching image {job.url}: {e}")
+            finally:
+                job.done = True
+                with self._condition:
+                    self._running.discard(job)
 
+image_queue = ImageLoadQueue()
@@ -0,0 +1,150 @@
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+
+from .config import WATCHDOG_FRAME_BUDGET_MS, WATCHDOG_HISTOGRAM_BUCKETS_MS, WATCHDOG_STACK_DEPTH
+
+
+def _describe(callback):
+    name = getattr(callback, "__qualname__", None) or repr(callback)
+    code = getattr(callback, "__code__", None)
+    if code is not None:
+        name += f" ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name
+
+
+class MainLoopWatchdog:
+    """Times main-loop callbacks and reports those that run past the frame budget.
+
+    While a callback is over budget a sampler thread grabs the GTK thread's stack, so
+    a report shows where the callback was blocked, not just which one it was. Stalls
+    are also counted in a histogram and per callback, printed at exit.
+    """
+
+    def __init__(self, budget_ms=WATCHDOG_FRAME_BUDGET_MS, buckets_ms=WATCHDOG_HISTOGRAM_BUCKETS_MS):
+        self.budget = budget_ms / 1000
+        self.buckets_ms = buckets_ms
+        # One count per bucket (stalls up to that many ms), plus one for longer stalls
+        self.histogram = [0] * (len(buckets_ms) + 1)
+        self.stalls_by_label = {}
+        self.calls = 0
+        self._thread_id = threading.main_thread().ident
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._current = None
+        self._sample = None
+        self._sampler = None
+
+    def wrap(self, callback, label):
+        """Returns `callback` timed under `label`. Only the outermost callback is timed."""
+        @functools.wraps(callback)
+        def timed(*args, **kwargs):
+            # Signals emitted from inside another callback are part of its time
+            if self._depth or threading.get_ident() != self._thread_id:
+                return callback(*args, **kwargs)
+            self._depth += 1
+            start = time.perf_counter()
+            with self._lock:
+                self._current = (label, start)
+                self._sample = None
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self._current = None
+                    sample = self._sample
+                self._depth -= 1
+                self.record(label, elapsed, sample)
+        return timed
+
+    def record(self, label, elapsed, sample=None):
+        self.calls += 1
+        if elapsed < self.budget:
+            return
+        ms = elapsed * 1000
+        self.histogram[bisect_left(self.buckets_ms, ms)] += 1
+        count, worst = self.stalls_by_label.get(label, (0, 0.0))
+        self.stalls_by_label[label] = (count + 1, max(worst, ms))
+        print(f"Main loop stall: {label} took {ms:.1f} ms (budget {self.budget * 1000:.0f} ms)")
+        if sample:
+            print("".join(sample).rstrip())
+
+    def start(self):
+        if self._sampler is None:
+            self._sampler = threading.Thread(target=self._sample_loop, name="archdex-watchdog", daemon=True)
+            self._sampler.start()
+
+    def _sample_loop(self):
+        while True:
+            time.sleep(self.budget / 2)
+            with self._lock:
+                current = self._current
+                if current is None or self._sample is not None:
+                    continue
+                if time.perf_counter() - current[1] < self.budget:
+                    continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame)[-WATCHDOG_STACK_DEPTH:]
+            with self._lock:
+                # The callback may have returned while the stack was being formatted
+                if self._current is current:
+                    self._sample = stack
+
+    def report(self):
+        stalls = sum(self.histogram)
+        print(f"Main loop watchdog: {self.calls} callbacks, {stalls} over {self.budget * 1000:.0f} ms")
+        if not stalls:
+            return
+        lower = 0
+        for upper, count in zip(list(self.buckets_ms) + [None], self.histogram):
+            label = f"{lower}-{upper} ms" if upper is not None else f">{lower} ms"
+            print(f"  {label:>12}: {count}")
+            lower = upper
+        worst = sorted(self.stalls_by_label.items(), key=lambda item: item[1][1], reverse=True)[:10]
+        for label, (count, worst_ms) in worst:
+            print(f"  {worst_ms:7.1f} ms worst, {count:4d}x  {label}")
+
+    def install(self):
+        """Wraps GLib idle/timeout sources and GObject signal handlers created from now on."""
+        from gi.repository import GLib, GObject
+
+        idle_add = GLib.idle_add
+        timeout_add = GLib.timeout_add
+        timeout_add_seconds = GLib.timeout_add_seconds
+        connect = GObject.Object.connect
+        connect_after = GObject.Object.connect_after
+
+        GLib.idle_add = lambda function, *args, **kwargs: idle_add(
+            self.wrap(function, f"idle {_describe(function)}"), *args, **kwargs)
+        GLib.timeout_add = lambda interval, function, *args, **kwargs: timeout_add(
+            interval, self.wrap(function, f"timeout {_describe(function)}"), *args, **kwargs)
+        GLib.timeout_add_seconds = lambda interval, function, *args, **kwargs: timeout_add_seconds(
+            interval, self.wrap(function, f"timeout {_describe(function)}"), *args, **kwargs)
+        GObject.Object.connect = lambda obj, signal, handler, *args: connect(
+            obj, signal, self.wrap(handler, f"{type(obj).__name__}::{signal} {_describe(handler)}"), *args)
+        GObject.Object.connect_after = lambda obj, signal, handler, *args: connect_after(
+            obj, signal, self.wrap(handler, f"{type(obj).__name__}::{signal} {_describe(handler)}"), *args)
+
+        atexit.register(self.report)
+        self.start()
+        print(f"Main loop watchdog enabled, frame budget {self.budget * 1000:.0f} ms")
+
+
+watchdog = None
+
+
+def install_watchdog(budget_ms=WATCHDOG_FRAME_BUDGET_MS):
+    """Enables the watchdog for the rest of the process. Call before any widget exists."""
+    global watchdog
+    if watchdog is None:
+        watchdog = MainLoopWatchdog(budget_ms)
+        watchdog.install()
+    return watchdog
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.data.async_api import AsyncPokeAPIClient
+
+
+class _TypeHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.requests_seen.append(self.path)
+        body = b'{"name": "fire"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server():
+    _TypeHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _TypeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_requests_for_one_url_are_coalesced(api_server):
+    url = f"{api_server}/api/v2/type/fire/"
+
+    async def fetch_all():
+        api_client = AsyncPokeAPIClient(max_concurrency=2)
+        try:
+            first = await asyncio.gather(*(api_client.fetch_json(url) for _ in range(5)))
+            # Served from the shared response cache
+            second = await api_client.fetch_json(url)
+        finally:
+            await api_client.close()
+        return first, second
+
+    first, second = asyncio.run(fetch_all())
+    assert first == [{"name": "fire"}] * 5
+    assert second == {"name": "fire"}
+    assert _TypeHandler.requests_seen == ["/api/v2/type/fire/"]
+
+
+def test_failed_requests_return_none(api_server):
+    async def fetch():
+        api_client = AsyncPokeAPIClient()
+        try:
+            return await api_client.fetch_json("http://127.0.0.1:1/unreachable")
+        finally:
+            await api_client.close()
+
+    assert asyncio.run(fetch()) is None
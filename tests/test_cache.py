@@ -0,0 +1,36 @@
+from src.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used_by_bytes():
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # "b" is now the least recently used
+
+    cache.put("c", b"cccc")
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.total_bytes == 8
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["evictions"] == 1
+
+
+def test_lru_cache_skips_values_over_budget_and_counts_misses():
+    cache = LRUCache(max_bytes=4, sizeof=len)
+    cache.put("big", b"too large")
+    assert cache.get("big") is None
+    assert cache.stats()["misses"] == 1
+    assert len(cache) == 0
+
+    assert cache.peek("big") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_entry_limit():
+    cache = LRUCache(max_entries=2)
+    for key in "abc":
+        cache.put(key, key)
+    assert "a" not in cache
+    assert len(cache) == 2
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from src import cli
+
+
+def test_sync_runs_selected_stages_in_order_with_json_progress(monkeypatch, capsys):
+    calls = []
+
+    def fake_sync(progress_callback, stages, workers):
+        calls.append((stages, workers))
+        print("library logging")
+        progress_callback(1, 2)
+        return True
+
+    monkeypatch.setattr(cli, "init_db", lambda: None)
+    monkeypatch.setattr(cli, "sync_database", fake_sync)
+
+    assert cli.main(["--json", "sync", "--stages", "images,catalog", "--workers", "3"]) == 0
+
+    assert calls == [(["catalog"], 3), (["images"], 3)]
+    out, err = capsys.readouterr()
+    events = [json.loads(line) for line in out.splitlines()]
+    assert [(e["event"], e["stage"]) for e in events[:3]] == [("stage-started", "catalog"), ("progress", "catalog"), ("stage-finished", "catalog")]
+    assert events[-1]["event"] == "finished" and events[-1]["ok"] is True
+    assert "library logging" in err
+
+
+def test_failed_stage_stops_the_sync(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cli, "init_db", lambda: None)
+    monkeypatch.setattr(cli, "sync_database", lambda progress_callback, stages, workers: calls.append(stages) and False)
+
+    assert cli.main(["sync", "--stages", "catalog,deep"]) == 1
+    assert calls == [["catalog"]]
+
+
+def test_default_sync_stores_forms_before_the_deep_stage(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cli, "init_db", lambda: None)
+    monkeypatch.setattr(cli, "sync_database", lambda progress_callback, stages, workers: calls.extend(stages) or True)
+
+    assert cli.main(["sync"]) == 0
+    assert calls == ["catalog", "species", "deep"]
+
+
+def test_unknown_stage_is_rejected():
+    with pytest.raises(SystemExit):
+        cli.main(["sync", "--stages", "everything"])
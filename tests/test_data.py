@@ -0,0 +1,341 @@
+import pytest
+import requests
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from datetime import datetime, timedelta
+
+from src.data import database, prefetch
+from src.data.database import (
+    store_species_varieties, get_stored_varieties, needs_startup_sync, SyncInfo, query_pokemon_page, migrate_schema,
+    query_pokemon_detail,
+)
+from src.data import details
+from src.data.details import evolution_species_ids
+from src.data.models import Base, Pokemon, PokemonVariety, Type, Move, Region, Ability, PokemonType, PokemonAbility, PokemonMove
+from src.data.query_cache import data_epoch
+from src.data.snapshots import PokemonDetail, store_pokemon_snapshot, get_pokemon_snapshot
+
+SPECIES_URL = "https://pokeapi.co/api/v2/pokemon-species/6/"
+VARIETIES = [
+    {"is_default": True, "pokemon": {"name": "charizard", "url": "https://pokeapi.co/api/v2/pokemon/6/"}},
+    {"is_default": False, "pokemon": {"name": "charizard-mega-x", "url": "https://pokeapi.co/api/v2/pokemon/10034/"}},
+    {"is_default": False, "pokemon": {"name": "charizard-mega-y", "url": "https://pokeapi.co/api/v2/pokemon/10035/"}},
+]
+
+
+def _memory_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def test_store_species_varieties_creates_stubs():
+    session = _memory_session()
+    try:
+        session.add(Pokemon(id=6, name="charizard", species_url=SPECIES_URL))
+        session.commit()
+
+        store_species_varieties(session, SPECIES_URL, VARIETIES)
+
+        assert session.query(PokemonVariety).filter_by(species_id=6).count() == 3
+        stub = session.query(Pokemon).filter_by(id=10034).first()
+        assert stub.name == "charizard-mega-x"
+        assert stub.species_url == SPECIES_URL
+        assert stub.sprite_url.endswith("/10034.png")
+
+        # Re-storing must not duplicate rows or stubs
+        store_species_varieties(session, SPECIES_URL, VARIETIES)
+        assert session.query(PokemonVariety).filter_by(species_id=6).count() == 3
+        assert session.query(Pokemon).count() == 3
+    finally:
+        session.close()
+
+
+def test_get_stored_varieties_is_local():
+    session = _memory_session()
+    try:
+        store_species_varieties(session, SPECIES_URL, VARIETIES)
+        assert get_stored_varieties(session, SPECIES_URL) == [
+            (6, "charizard"),
+            (10034, "charizard-mega-x"),
+            (10035, "charizard-mega-y"),
+        ]
+    finally:
+        session.close()
+
+
+def test_evolution_species_ids_walks_every_branch():
+    chain = {"chain": {
+        "species": {"name": "eevee", "url": "https://pokeapi.co/api/v2/pokemon-species/133/"},
+        "evolves_to": [
+            {"species": {"name": "vaporeon", "url": "https://pokeapi.co/api/v2/pokemon-species/134/"}, "evolves_to": []},
+            {"species": {"name": "jolteon", "url": "https://pokeapi.co/api/v2/pokemon-species/135/"}, "evolves_to": []},
+        ],
+    }}
+    assert evolution_species_ids(chain) == [133, 134, 135]
+    assert evolution_species_ids(None) == []
+
+
+def test_load_pokemon_detail_is_served_from_cache(monkeypatch):
+    loads = []
+
+    def fake_query(session, pokemon_id, on_fetch=None):
+        loads.append(pokemon_id)
+        return PokemonDetail.from_pokemon(Pokemon(id=pokemon_id, name="bulbasaur"))
+
+    monkeypatch.setattr(details, "query_pokemon_detail", fake_query)
+    monkeypatch.setattr(details, "get_session", _memory_session)
+    details.detail_cache.clear()
+
+    first = details.load_pokemon_detail(1)
+    assert details.load_pokemon_detail(1) is first
+    assert loads == [1]
+    details.detail_cache.clear()
+
+
+def test_snapshot_round_trip_groups_moves_by_generation():
+    session = _memory_session()
+    try:
+        fire = Type(name="fire")
+        ember = Move(id=52, name="ember", power=40, pp=25, accuracy=100, damage_class="special", type=fire)
+        charmander = Pokemon(id=4, name="charmander", height=6, weight=85, region=Region(name="kanto"))
+        session.add_all([
+            PokemonType(pokemon=charmander, type=fire),
+            PokemonAbility(pokemon=charmander, ability=Ability(name="blaze", short_description="Boosts fire"), is_hidden=False),
+            PokemonMove(pokemon=charmander, move=ember, learn_method="level-up", level_learned_at=9, version_group="red-blue"),
+            # Same move in another version of the same generation is listed once
+            PokemonMove(pokemon=charmander, move=ember, learn_method="level-up", level_learned_at=9, version_group="yellow"),
+            PokemonMove(pokemon=charmander, move=ember, learn_method="level-up", level_learned_at=7, version_group="x-y"),
+        ])
+        session.commit()
+
+        store_pokemon_snapshot(session, charmander)
+        detail = get_pokemon_snapshot(session, 4)
+
+        assert detail.name == "charmander"
+        assert detail.region_name == "kanto"
+        assert detail.types == ["fire"]
+        assert detail.abilities == [["blaze", False, "Boosts fire"]]
+        assert detail.first_generation == 1
+        assert detail.moves["Gen 1"]["level-up"] == [[9, "ember", "fire", "special", 40, 100, 25]]
+        assert detail.moves["Gen 6"]["level-up"][0][0] == 7
+        assert get_pokemon_snapshot(session, 5) is None
+    finally:
+        session.close()
+
+
+def test_startup_sync_policy():
+    session = _memory_session()
+    now = datetime(2024, 6, 1)
+    offline = lambda: None
+
+    def count(n):
+        calls = []
+        def fetch():
+            calls.append(n)
+            return n
+        return fetch, calls
+
+    try:
+        fetch, calls = count(1)
+        assert needs_startup_sync(session, now, fetch) is True
+        assert needs_startup_sync(session, now, offline) is False
+
+        session.add(Pokemon(id=6, name="charizard", species_url=SPECIES_URL))
+        session.add(Pokemon(id=10034, name="charizard-mega-x", species_url=SPECIES_URL))
+        session.add(SyncInfo(last_sync=now - timedelta(hours=1)))
+        session.commit()
+
+        # Fresh: no network at all
+        fetch, calls = count(2)
+        assert needs_startup_sync(session, now, fetch) is False
+        assert calls == []
+
+        # Stale: decided by the species count (forms share their species)
+        later = now + timedelta(days=2)
+        assert needs_startup_sync(session, later, count(1)[0]) is False
+        assert needs_startup_sync(session, later, count(2)[0]) is True
+        assert needs_startup_sync(session, now + timedelta(days=60), count(1)[0]) is True
+    finally:
+        session.close()
+
+
+def test_query_pokemon_page_returns_list_rows():
+    session = _memory_session()
+    try:
+        for i, name in enumerate(["bulbasaur", "ivysaur", "venusaur", "charmander"], 1):
+            session.add(Pokemon(id=i, name=name, sprite_url=f"{i}.png", description="long text"))
+        session.commit()
+
+        rows, total, next_urls = query_pokemon_page("saur", 0, 2, bind=session.get_bind())
+
+        assert total == 3
+        assert [(row.id, row.name, row.sprite_url) for row in rows] == [(1, "bulbasaur", "1.png"), (2, "ivysaur", "2.png")]
+        assert not hasattr(rows[0], "description")
+        assert next_urls == ["3.png"]
+    finally:
+        session.close()
+
+
+def test_query_pokemon_page_filters_by_ranges():
+    session = _memory_session()
+    try:
+        session.add_all([
+            Pokemon(id=1, name="bulbasaur", height=7, weight=69, speed=45),
+            Pokemon(id=4, name="charmander", height=6, weight=85, speed=65),
+            Pokemon(id=6, name="charizard", height=17, weight=905, speed=100),
+            # Not deep-synced yet: no value to compare
+            Pokemon(id=7, name="squirtle"),
+        ])
+        session.commit()
+        bind = session.get_bind()
+
+        rows, total, _ = query_pokemon_page("", 0, 10, sort="speed", filters=(("speed", 50, None),), bind=bind)
+        assert total == 2 and [row.name for row in rows] == ["charizard", "charmander"]
+
+        rows, total, _ = query_pokemon_page("char", 0, 10, filters=(("height", None, 10), ("weight", 80, 100)), bind=bind)
+        assert total == 1 and rows[0].name == "charmander"
+
+        with pytest.raises(ValueError):
+            query_pokemon_page("", 0, 10, filters=(("name", "a", "z"),), bind=bind)
+    finally:
+        session.close()
+
+
+def test_migration_adds_base_stat_total_and_sort_uses_covering_index():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        # A pokemon table from before the column existed
+        connection.exec_driver_sql(
+            "CREATE TABLE pokemon (id INTEGER PRIMARY KEY, name VARCHAR, sprite_url VARCHAR, species_url VARCHAR, "
+            "height FLOAT, weight FLOAT, hp INTEGER, attack INTEGER, defense INTEGER, special_attack INTEGER, "
+            "special_defense INTEGER, speed INTEGER)"
+        )
+        connection.exec_driver_sql("INSERT INTO pokemon VALUES (1, 'bulbasaur', '1.png', NULL, 7, 69, 45, 49, 49, 65, 65, 45)")
+        connection.exec_driver_sql("INSERT INTO pokemon VALUES (6, 'charizard', '6.png', NULL, 17, 905, 78, 84, 78, 109, 85, 100)")
+        connection.exec_driver_sql("INSERT INTO pokemon (id, name) VALUES (7, 'squirtle')")
+    Base.metadata.create_all(bind=engine)
+
+    migrate_schema(bind=engine)
+    migrate_schema(bind=engine)
+
+    rows, total, _ = query_pokemon_page("", 0, 10, sort="base_stat_total", bind=engine)
+    assert total == 3
+    # Not yet deep-synced Pokemon come last
+    assert [row.name for row in rows] == ["charizard", "bulbasaur", "squirtle"]
+    with engine.connect() as connection:
+        plan = " ".join(row[-1] for row in connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT id, name, sprite_url, species_url FROM pokemon "
+            "ORDER BY base_stat_total DESC, id LIMIT 50 OFFSET 100"
+        ))
+    assert "COVERING INDEX ix_pokemon_base_stat_total_desc" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_failed_fetch_does_not_store_a_snapshot(monkeypatch):
+    session = _memory_session()
+    fetches = []
+    # Offline: the fetch leaves the stub as it was
+    monkeypatch.setattr(database, "update_pokemon_data", lambda session, pokemon_id: fetches.append(pokemon_id))
+    try:
+        session.add(Pokemon(id=25, name="pikachu", species_url=SPECIES_URL))
+        session.commit()
+
+        detail = query_pokemon_detail(session, 25)
+        assert detail.name == "pikachu" and detail.complete is False
+        assert get_pokemon_snapshot(session, 25) is None
+
+        query_pokemon_detail(session, 25)
+        assert fetches == [25, 25]
+    finally:
+        session.close()
+
+
+def _fake_pokemon_details(name_or_id=None, pokemon_url=None):
+    return {
+        "name": f"pokemon-{name_or_id}", "description": "A test Pokemon.", "height": 7, "weight": 69,
+        "sprites": {"front_default": "front.png", "other": {"official-artwork": {"front_default": "art.png"}}},
+        "hp": 45, "attack": 49, "defense": 49, "sp_attack": 65, "sp_defense": 65, "speed": 45,
+        "region_name": "kanto",
+        "types": [{"type": {"name": "grass"}}, {"type": {"name": "poison"}}],
+        "abilities": [{"ability": {"name": "overgrow"}, "slot": 1}],
+        "detailed_moves": [{"name": name, "learn_method": "level-up", "level_learned_at": 1, "version_group": "red-blue"}
+                           for name in ("tackle", "growl", "vine-whip")],
+    }
+
+
+def _fake_move_details(name):
+    return {"id": ["tackle", "growl", "vine-whip"].index(name) + 1, "name": name, "power": 40, "pp": 35, "accuracy": 100,
+            "type": {"name": "normal"}, "damage_class": {"name": "physical"}, "effect_entries": []}
+
+
+def _stub_sync(monkeypatch, tmp_path, get_pokemon_details=_fake_pokemon_details):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pokedex.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(database, "get_session", Session)
+    monkeypatch.setattr(database, "get_pokemon_details", get_pokemon_details)
+    monkeypatch.setattr(database, "get_ability_details", lambda name: None)
+    monkeypatch.setattr(database, "get_move_details", _fake_move_details)
+    return Session
+
+
+def test_parallel_deep_sync_writes_shared_rows_once(monkeypatch, tmp_path):
+    Session = _stub_sync(monkeypatch, tmp_path)
+    session = Session()
+    try:
+        session.add_all(Pokemon(id=i, name=f"pokemon-{i}") for i in range(1, 41))
+        session.commit()
+
+        epoch = data_epoch()
+        assert database.sync_database(stages=["deep"], workers=8)
+        # One invalidation for the whole stage, not one per Pokemon
+        assert data_epoch() == epoch + 1
+
+        assert session.query(Type).count() == 3
+        assert session.query(Ability).count() == 1
+        assert session.query(Move).count() == 3
+        assert session.query(PokemonMove).count() == 40 * 3
+        assert all(get_pokemon_snapshot(session, i) is not None for i in range(1, 41))
+    finally:
+        session.close()
+
+
+def test_failed_items_fail_the_sync_and_only_the_catalog_moves_last_sync(monkeypatch, tmp_path):
+    def flaky_details(name_or_id=None, pokemon_url=None):
+        return None if name_or_id == 3 else _fake_pokemon_details(name_or_id)
+
+    Session = _stub_sync(monkeypatch, tmp_path, flaky_details)
+    session = Session()
+    try:
+        session.add_all(Pokemon(id=i, name=f"pokemon-{i}") for i in range(1, 6))
+        session.commit()
+
+        assert database.sync_database(stages=["deep"], workers=2) is False
+        sync_info = session.query(SyncInfo).one()
+        assert sync_info.status == "failed: 1 item(s) could not be synced"
+        assert sync_info.last_sync == datetime.min
+        assert get_pokemon_snapshot(session, 3) is None
+        assert get_pokemon_snapshot(session, 4) is not None
+    finally:
+        session.close()
+
+
+class _OfflineTransport:
+    def get(self, url, **kwargs):
+        raise requests.exceptions.ConnectionError(f"offline: {url}")
+
+
+def test_failed_image_downloads_fail_the_images_stage(monkeypatch, tmp_path):
+    Session = _stub_sync(monkeypatch, tmp_path)
+    monkeypatch.setattr(prefetch, "transport", _OfflineTransport())
+    session = Session()
+    try:
+        session.add_all(Pokemon(id=i, name=f"pokemon-{i}", sprite_url=f"https://sprites.invalid/{i}.png") for i in range(1, 4))
+        session.commit()
+
+        assert database.sync_database(stages=["images"], workers=2) is False
+        assert session.query(SyncInfo).one().status == "failed: 3 item(s) could not be synced"
+    finally:
+        session.close()
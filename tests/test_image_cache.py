@@ -0,0 +1,103 @@
+import os
+
+from src.image_cache import ACCESS_FLUSH_ENTRIES, ACCESS_FLUSH_SECONDS, DiskCache, is_complete_image
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32 + b"IEND\xaeB`\x82"
+
+
+def test_put_is_sharded_and_readable(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    path = cache.put("https://example.com/1.png", PNG)
+
+    digest = DiskCache.digest("https://example.com/1.png")
+    assert path == os.path.join(str(tmp_path), digest[:2], digest)
+    assert cache.get("https://example.com/1.png") == PNG
+    assert cache.total_bytes == len(PNG)
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")]
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=int(len(PNG) * 2.5))
+    cache.put("a", PNG)
+    cache.put("b", PNG)
+    cache.get("a")
+    cache.put("c", PNG)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == PNG
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_hits_update_the_index_in_batches(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=4096)
+    cache.put("a", PNG)
+
+    def indexed_access():
+        return cache._index.execute("SELECT last_access FROM entries").fetchone()[0]
+
+    written = indexed_access()
+    cache.get("a")
+    assert indexed_access() == written
+    for _ in range(ACCESS_FLUSH_ENTRIES):
+        cache.get("a")
+    # Still one pending entry, so only the time limit would flush it
+    assert indexed_access() == written
+    cache._last_access_flush -= ACCESS_FLUSH_SECONDS + 1
+    cache.get("a")
+    assert indexed_access() > written
+
+
+def test_pinned_entries_are_never_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=int(len(PNG) * 1.5))
+    cache.put("prefetched", PNG, pinned=True)
+    cache.put("cached", PNG)
+    assert cache.pin(["cached", "missing"]) == 1
+    cache.put("on-demand-1", PNG)
+    cache.put("on-demand-2", PNG)
+
+    assert cache.get("prefetched") == PNG and cache.get("cached") == PNG
+    assert cache.get("on-demand-1") is None and cache.get("on-demand-2") == PNG
+    assert cache.pinned_bytes == 2 * len(PNG)
+    assert DiskCache(str(tmp_path), max_bytes=1024).pinned_bytes == 2 * len(PNG)
+
+
+def test_index_survives_reopen(tmp_path):
+    DiskCache(str(tmp_path), max_bytes=1024).put("a", PNG)
+    assert DiskCache(str(tmp_path), max_bytes=1024).total_bytes == len(PNG)
+
+
+def test_repair_removes_truncated_and_adopts_flat_layout(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=4096)
+    truncated_path = cache.put("truncated", PNG[:20])
+
+    legacy_digest = DiskCache.digest("legacy")
+    with open(os.path.join(str(tmp_path), legacy_digest), "wb") as f:
+        f.write(PNG)
+
+    assert cache.repair() == 1
+    assert not os.path.exists(truncated_path)
+    assert cache.get("truncated") is None
+    assert cache.get("legacy") == PNG
+    assert cache.total_bytes == len(PNG)
+
+
+def test_is_complete_image():
+    assert is_complete_image(PNG)
+    assert not is_complete_image(PNG[:-4])
+
+
+def test_sprite_atlas_round_trip(tmp_path):
+    from src.sprite_atlas import SpriteAtlas, write_atlas
+
+    path = str(tmp_path / "sprites.atlas")
+    sprites = [(1, b"\x01" * 16), (4, b"\x04" * 16), (7, b"\x07" * 3)]
+    assert write_atlas(path, 2, 2, sprites) == 2  # The short sprite is skipped
+
+    atlas = SpriteAtlas(path)
+    try:
+        assert len(atlas) == 2
+        assert bytes(atlas.get(4)) == b"\x04" * 16
+        assert atlas.get(7) is None
+        assert atlas.rowstride == 8
+    finally:
+        atlas.close()
@@ -0,0 +1,28 @@
+from src.data.name_index import NameIndex, NameIndexEntry
+
+
+def _index(*names):
+    return NameIndex(NameIndexEntry(i, name, f"{i}.png", None) for i, name in reversed(list(enumerate(names, 1))))
+
+
+def test_search_matches_substrings_in_id_order():
+    index = _index("bulbasaur", "ivysaur", "venusaur", "charmander", "saurus")
+
+    assert [e.name for e in index.search("saur")] == ["bulbasaur", "ivysaur", "venusaur", "saurus"]
+    assert [e.id for e in index.search("SAUR")] == [1, 2, 3, 5]
+    assert index.search("zz") == []
+    assert len(index.search("")) == 5
+
+
+def test_repeated_substring_matches_entry_once():
+    index = _index("mr-mime", "mime-jr", "mimikyu")
+
+    assert [e.name for e in index.search("mi")] == ["mr-mime", "mime-jr", "mimikyu"]
+
+
+def test_prefix():
+    index = _index("pikachu", "pichu", "raichu", "pidgey")
+
+    assert [e.name for e in index.prefix("pi")] == ["pikachu", "pichu", "pidgey"]
+    assert [e.name for e in index.prefix("pich")] == ["pichu"]
+    assert index.prefix("x") == []
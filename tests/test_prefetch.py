@@ -0,0 +1,51 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.data.prefetch import prefetch_images
+from src.image_cache import DiskCache
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32 + b"IEND\xaeB`\x82"
+
+
+class _SpriteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requested = []
+
+    def do_GET(self):
+        self.requested.append(self.path)
+        status = 404 if self.path.startswith("/missing") else 200
+        body = PNG if status == 200 else b""
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_prefetch_skips_cached_and_resumes(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SpriteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/{i}.png" for i in range(5)] + [f"{base}/missing.png"]
+        cache = DiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        cache.put(urls[0], PNG)
+
+        progress = []
+        fetched, failed = prefetch_images(urls, workers=3, cache=cache, progress_callback=lambda c, t: progress.append((c, t)))
+        assert (fetched, failed) == (4, 1)
+        assert "/0.png" not in _SpriteHandler.requested
+        assert progress[-1] == (5, 5)
+        assert all(url in cache for url in urls[:5])
+        # Pinned, the already cached one included
+        assert cache.pinned_bytes == 5 * len(PNG)
+
+        # A second run only retries what is still missing
+        _SpriteHandler.requested.clear()
+        assert prefetch_images(urls, workers=3, cache=cache) == (0, 1)
+        assert _SpriteHandler.requested == ["/missing.png"]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,47 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.data import database
+from src.data.database import get_stored_varieties
+from src.data.models import Base, Pokemon
+from src.data.query_cache import EpochCache, bump_data_epoch, data_epoch
+from src.data.snapshots import store_pokemon_snapshot
+
+
+def test_entries_expire_with_the_epoch():
+    cache = EpochCache(max_entries=8)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute("count", compute) == 1
+    assert cache.get_or_compute("count", compute) == 1
+    assert "count" in cache
+
+    bump_data_epoch()
+    assert "count" not in cache
+    assert cache.get_or_compute("count", compute) == 2
+
+
+def test_stored_varieties_bump_the_epoch_once_but_snapshots_do_not(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, bind=engine)
+    session = Session()
+    monkeypatch.setattr(database, "get_species_varieties", lambda species_url: [
+        {"pokemon": {"name": "venusaur", "url": "https://pokeapi.co/api/v2/pokemon/3/"}, "is_default": True},
+        {"pokemon": {"name": "venusaur-mega", "url": "https://pokeapi.co/api/v2/pokemon/10033/"}},
+    ])
+    try:
+        epoch = data_epoch()
+        assert len(get_stored_varieties(session, "https://pokeapi.co/api/v2/pokemon-species/3/")) == 2
+        assert data_epoch() == epoch + 1
+
+        # Served locally now: nothing written, nothing invalidated
+        get_stored_varieties(session, "https://pokeapi.co/api/v2/pokemon-species/3/")
+        store_pokemon_snapshot(session, session.get(Pokemon, 3))
+        assert data_epoch() == epoch + 1
+    finally:
+        session.close()
@@ -1,10 +1,10 @@
 
-from src.data.database import get_session, is_pokemon_data_complete, update_pokemon_data, init_db, engine
-from src.data.models import Pokemon, Base
+from src.data.database import get_session, is_pokemon_data_complete, update_pokemon_data, init_db
+from src.data.models import Pokemon
 
 def test_robust_update():
     # Initialize DB (create tables)
-    Base.metadata.create_all(bind=engine)
+    init_db()
     
     session = get_session()
     try:
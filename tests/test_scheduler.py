@@ -0,0 +1,63 @@
+import threading
+
+from src.scheduler import (
+    TaskScheduler, Generation, PRIORITY_INTERACTIVE, PRIORITY_PREFETCH, PRIORITY_SYNC,
+)
+
+
+def _inline(func, *args):
+    func(*args)
+
+
+def _scheduler(interactive=1, prefetch=1, sync=1):
+    return TaskScheduler(
+        pool_sizes={PRIORITY_INTERACTIVE: interactive, PRIORITY_PREFETCH: prefetch, PRIORITY_SYNC: sync},
+        dispatch=_inline,
+    )
+
+
+def test_results_of_a_superseded_generation_are_dropped():
+    scheduler = _scheduler()
+    generation = Generation()
+    release = threading.Event()
+    finished = threading.Event()
+    delivered = []
+
+    old_token = generation.advance()
+    scheduler.submit(release.wait, priority=PRIORITY_INTERACTIVE, token=old_token, callback=delivered.append)
+    # Queued behind the blocked task, so it is skipped without running
+    skipped = scheduler.submit(delivered.append, "skipped", token=old_token)
+    new_token = generation.advance()
+    release.set()
+    scheduler.submit(lambda: "current", token=new_token, callback=lambda r: (delivered.append(r), finished.set()))
+
+    assert finished.wait(5)
+    assert delivered == ["current"]
+    assert not skipped.done
+
+
+def test_interactive_work_is_not_stuck_behind_sync():
+    scheduler = _scheduler(interactive=1, prefetch=0, sync=1)
+    sync_running = threading.Event()
+    release_sync = threading.Event()
+    done = threading.Event()
+
+    scheduler.submit(lambda: (sync_running.set(), release_sync.wait(5)), priority=PRIORITY_SYNC)
+    assert sync_running.wait(5)
+    scheduler.submit(lambda: None, priority=PRIORITY_SYNC)
+    scheduler.submit(lambda: "ok", priority=PRIORITY_INTERACTIVE, callback=lambda r: done.set())
+
+    assert done.wait(5)
+    assert scheduler.pending(PRIORITY_SYNC) == 1
+    release_sync.set()
+
+
+def test_cancel_callbacks_run_once():
+    generation = Generation()
+    token = generation.advance()
+    calls = []
+    token.add_cancel_callback(lambda: calls.append("cancelled"))
+    generation.advance()
+    token.cancel()
+    token.add_cancel_callback(lambda: calls.append("late"))
+    assert calls == ["cancelled", "late"]
@@ -0,0 +1,53 @@
+import threading
+
+from src.search import SearchPipeline
+
+
+def _inline(func, *args):
+    func(*args)
+
+
+def test_superseded_search_results_are_discarded():
+    release = threading.Event()
+    delivered = []
+    done = threading.Event()
+
+    def query(term, sort, filters, offset, limit):
+        if term == "slow":
+            release.wait(2)
+        return term, offset
+
+    pipeline = SearchPipeline(query, dispatch=_inline)
+    pipeline.start()
+    pipeline.request("slow", "id", (), 0, 10, delivered.append)
+    pipeline.start()
+    pipeline.request("fast", "id", (), 0, 10, lambda result: (delivered.append(result), done.set()))
+    release.set()
+
+    assert done.wait(2)
+    assert delivered == [("fast", 0)]
+
+
+def test_pages_are_cached_and_next_page_prefetched():
+    calls = []
+    queried = threading.Semaphore(0)
+
+    def query(term, sort, filters, offset, limit):
+        calls.append((term, offset))
+        queried.release()
+        return term, offset
+
+    pipeline = SearchPipeline(query, dispatch=_inline)
+    pipeline.start()
+    first = []
+    pipeline.request("pi", "id", (), 0, 10, first.append)
+    # The requested page, then the one after it
+    assert queried.acquire(timeout=2) and queried.acquire(timeout=2)
+    assert calls == [("pi", 0), ("pi", 10)]
+    assert first == [("pi", 0)]
+
+    second = []
+    pipeline.request("pi", "id", (), 10, 10, second.append)
+    assert second == [("pi", 10)]
+    assert queried.acquire(timeout=2)
+    assert calls[-1] == ("pi", 20)
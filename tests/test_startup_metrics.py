@@ -0,0 +1,28 @@
+import json
+
+from src import startup_metrics
+
+
+def test_record_written_once_both_interactive_marks_are_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(startup_metrics, "_marks", {})
+    path = tmp_path / "startup.jsonl"
+
+    startup_metrics.mark("first-frame", path)
+    assert not path.exists()
+    startup_metrics.mark("database-ready", path)
+    startup_metrics.mark("database-ready", path)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 1
+    assert records[0]["interactive_ms"] >= records[0]["first_frame_ms"]
+    assert set(records[0]["marks"]) == {"first-frame", "database-ready"}
+
+
+def test_old_records_are_trimmed(tmp_path, monkeypatch):
+    monkeypatch.setattr(startup_metrics, "MAX_RECORDS", 3)
+    path = tmp_path / "startup.jsonl"
+    path.write_text("".join(json.dumps({"run": i}) + "\n" for i in range(5)))
+
+    startup_metrics._append_record(path, {"run": 5})
+
+    assert [json.loads(line)["run"] for line in path.read_text().splitlines()] == [3, 4, 5]
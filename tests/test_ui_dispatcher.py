@@ -0,0 +1,31 @@
+from src.ui_dispatcher import UIDispatcher
+
+
+def test_posts_are_batched_into_one_scheduled_flush():
+    scheduled = []
+    dispatcher = UIDispatcher(max_per_frame=10, budget_ms=1000, schedule=lambda: scheduled.append(1))
+    applied = []
+
+    for i in range(25):
+        dispatcher.post(applied.append, i)
+    assert scheduled == [1]
+
+    # Capped per frame; the last frame reports nothing left
+    assert dispatcher.flush() is True
+    assert applied == list(range(10))
+    assert dispatcher.flush() is True
+    assert dispatcher.flush() is False
+    assert applied == list(range(25))
+
+    dispatcher.post(applied.append, 25)
+    assert scheduled == [1, 1]
+
+
+def test_failing_update_does_not_stop_the_batch():
+    dispatcher = UIDispatcher(schedule=lambda: None)
+    applied = []
+    dispatcher.post(lambda: 1 / 0)
+    dispatcher.post(applied.append, "next")
+
+    assert dispatcher.flush() is False
+    assert applied == ["next"]
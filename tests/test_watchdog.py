@@ -0,0 +1,39 @@
+import time
+
+from src.watchdog import MainLoopWatchdog
+
+
+def test_only_callbacks_over_budget_are_counted():
+    watchdog = MainLoopWatchdog(budget_ms=5, buckets_ms=(10, 100))
+    fast = watchdog.wrap(lambda: "fast", "fast")
+    slow = watchdog.wrap(lambda: time.sleep(0.02) or "slow", "slow")
+
+    assert fast() == "fast"
+    assert slow() == "slow"
+
+    assert watchdog.calls == 2
+    assert watchdog.histogram == [0, 1, 0]
+    assert list(watchdog.stalls_by_label) == ["slow"]
+
+
+def test_nested_callbacks_are_timed_once():
+    watchdog = MainLoopWatchdog(budget_ms=5)
+    inner = watchdog.wrap(lambda: time.sleep(0.01), "inner")
+    outer = watchdog.wrap(lambda: inner(), "outer")
+
+    outer()
+
+    assert watchdog.calls == 1
+    assert list(watchdog.stalls_by_label) == ["outer"]
+
+
+def test_stall_stack_is_sampled_while_blocked(capsys):
+    watchdog = MainLoopWatchdog(budget_ms=5)
+    watchdog.start()
+
+    def blocking_handler():
+        time.sleep(0.05)
+
+    watchdog.wrap(blocking_handler, "blocking")()
+
+    assert "blocking_handler" in capsys.readouterr().out